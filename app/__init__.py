@@ -2,27 +2,86 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
+from werkzeug.middleware.proxy_fix import ProxyFix
 
-# Initialize SQLAlchemy, Migrate, and JWTManager instances
-db = SQLAlchemy()  # SQLAlchemy object for database interaction
+from .cache import ReadThroughCache
+from .compression import ResponseCompressor
+from .engine import engine_options, apply_sqlite_pragmas
+from .hashing import PasswordHasher
+from .json_provider import CompactJSONProvider
+from .metrics import RequestMetrics
+from .previews import PreviewService
+from .ratelimit import admission
+from .replicas import RoutingSession, replica_binds
+from .storage import ContentStore, StreamingUploadRequest
+
+# Initialize SQLAlchemy, Migrate, JWTManager, PasswordHasher, cache, storage, preview, metrics and compression instances
+db = SQLAlchemy(session_options={'class_': RoutingSession})  # SQLAlchemy object, routing read-only requests to replicas
 migrate = Migrate()  # Migrate object for handling database migrations
 jwt = JWTManager()  # JWTManager object for handling JWT authentication
+hasher = PasswordHasher()  # PasswordHasher object running password hashing in a process pool
+cache = ReadThroughCache()  # ReadThroughCache object for single-record lookups
+storage = ContentStore()  # ContentStore object for uploaded documents
+previews = PreviewService()  # PreviewService object rendering document thumbnails in a process pool
+metrics = RequestMetrics()  # RequestMetrics object recording per-endpoint latency, SQL and payload sizes
+compression = ResponseCompressor()  # ResponseCompressor object negotiating gzip/brotli/zstd response encoding
 
-def create_app():
+def create_app(config=None):
     """
     Factory function to create and configure the Flask application.
     This allows the application to be modular and reusable in different contexts.
+    `config` is an optional mapping of settings overriding app.config.Config
+    (used by scripts and benchmarks, e.g. to point at a scratch database).
     """
     app = Flask(__name__)  # Create the Flask app instance
+    app.request_class = StreamingUploadRequest  # Stream uploads straight into document storage
     app.config.from_object('app.config.Config')  # Load configuration settings from config file
+    if config:
+        app.config.update(config)  # Apply the caller's overrides
+    if app.config['TRUSTED_PROXY_HOPS']:
+        # Take the client address from the X-Forwarded-For entries added by the trusted proxies
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXY_HOPS'])
 
-    # Initialize the app with SQLAlchemy, Flask-Migrate, and Flask-JWT-Extended
+    # Initialize the app with SQLAlchemy, Flask-Migrate, Flask-JWT-Extended and the application services
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)  # Apply the engine profile
+    app.config['SQLALCHEMY_BINDS'] = replica_binds(app.config)  # Register the read replicas
     db.init_app(app)  # Set up the database with the application
-    migrate.init_app(app, db)  # Set up database migration utilities with the application and db
+    metrics.init_app(app)  # Set up request instrumentation with the application
+    app.json = CompactJSONProvider(app)  # Compact JSON with ISO 8601 dates, still timed as serialization
+    compression.init_app(app)  # Registered after metrics, whose hook then runs last and records bytes on the wire
+    with app.app_context():
+        apply_sqlite_pragmas(app, db.engines.values())  # Tune SQLite connections as they open
+        metrics.instrument(db.engines.values())  # Time every SQL statement
+    from .search import include_name  # Imported here: the search module needs the models, which need db
+    migrate.init_app(app, db, include_name=include_name)  # Set up database migrations, ignoring the search index tables
     jwt.init_app(app)  # Set up JWT handling with the application
+    hasher.init_app(app)  # Set up the password hashing pool with the application
+    cache.init_app(app)  # Set up the read-through cache with the application
+    storage.init_app(app)  # Set up content-addressed document storage with the application
+    previews.init_app(app)  # Set up the preview renderer and its disk cache with the application
+    admission.init_app(app)  # Set up rate limiting and concurrency caps of the expensive routes
+    from .idempotency import idempotency  # Imported here: the idempotency store needs the models, which need db
+    idempotency.init_app(app)  # Set up the Idempotency-Key response store with the application
+    from .auth import authenticator  # Imported here: the authenticator needs the models, which need db
+    authenticator.init_app(app)  # Set up bearer token authentication and its token cache with the application
 
     # Import and register the main blueprint for handling routes
     from .routes import main  # Import the blueprint from the routes module
     app.register_blueprint(main)  # Register the 'main' blueprint to handle routes
 
+    # Register the background job handlers
+    from . import tasks  # noqa: F401
+
+    # Register the maintenance commands with the Flask CLI
+    from .auth import auth_cli
+    from .commands import check_indexes_command
+    from .counters import stats_cli
+    from .idempotency import idempotency_cli
+    from .jobs import jobs_cli
+    app.cli.add_command(auth_cli)
+    app.cli.add_command(check_indexes_command)
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(idempotency_cli)
+    app.cli.add_command(jobs_cli)
+
     return app  # Return the configured Flask application instance
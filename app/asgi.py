@@ -0,0 +1,435 @@
+import asyncio  # Import asyncio to run blocking file operations off the event loop
+import hashlib  # Import hashlib to fingerprint the form fields of idempotent uploads
+import mimetypes  # Import mimetypes to label downloads
+import os  # Import os to inspect stored files
+import re  # Import re to match the async routes
+import time  # Import time to measure request durations
+from urllib.parse import parse_qsl  # Import parse_qsl to read the query string
+
+from flask import current_app  # Import current_app for the JSON responses
+from sqlalchemy import select  # Import select for the document lookup
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # Async SQLAlchemy engine and sessions
+from werkzeug.datastructures import FileStorage, Headers, MultiDict  # Request data containers
+from werkzeug.exceptions import RequestEntityTooLarge  # Raised when an upload exceeds the size limit
+from werkzeug.http import http_date, parse_etags, parse_options_header, parse_range_header  # HTTP header parsing
+from werkzeug.sansio.multipart import NEED_DATA, Data, Epilogue, Field, File, MultipartDecoder  # Incremental multipart parser
+
+from . import create_app, db, cache, storage, metrics, compression  # Application factory, database and services
+from .auth import AuthError, authenticator, check_owner, unauthorized  # Bearer token authentication shared with the Flask routes
+from .engine import apply_sqlite_pragmas, engine_options  # Engine profile shared with the sync engine
+from .idempotency import KEY_HEADER, IdempotencyConflict, idempotency, check_key, fingerprint, replay, scoped_key  # Idempotency-Key store
+from .models import Document  # Importing database models
+from .pagination import InvalidCursor  # Raised for malformed cursors
+from .ratelimit import Throttled, admission, client_keys  # Rate limits and concurrency caps of the expensive routes
+from .routes import students_page_query, add_document, allowed_file, document_download_name  # Helpers shared with the Flask routes
+from .serializers import STUDENT_FIELDS  # Column-projection serializer of the listing
+
+# Async drivers replacing the sync driver of each backend
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'mysql': 'mysql+aiomysql',
+}
+
+# Bytes read from disk per chunk of a download
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Maximum bytes buffered for the non-file fields of an upload
+FORM_MEMORY_LIMIT = 500 * 1024
+
+
+def async_database_url(config, url):
+    """
+    Return ASYNC_DATABASE_URI, or the sync engine's URL with its backend's async driver.
+    """
+    if config['ASYNC_DATABASE_URI']:
+        return config['ASYNC_DATABASE_URI']
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for '{backend}'; set ASYNC_DATABASE_URL.")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def create_asgi_app(config=None):
+    """
+    Create the application as an ASGI app, e.g. for `uvicorn asgi:app`.
+
+    Document uploads, downloads and the students listing run as async handlers on
+    an async SQLAlchemy engine; every other route is the unchanged Flask app,
+    run in a thread pool. Requires the optional `a2wsgi` package and the async
+    driver of the database (aiosqlite, asyncpg, ...).
+    """
+    try:
+        from a2wsgi import WSGIMiddleware  # Optional dependency, only needed for ASGI serving
+    except ImportError:
+        raise RuntimeError("ASGI mode requires the 'a2wsgi' package (pip install a2wsgi).")
+
+    app = create_app(config)
+    with app.app_context():
+        url = async_database_url(app.config, db.engine.url)
+    try:
+        engine = create_async_engine(url, **engine_options(app.config))
+    except ImportError as e:
+        raise RuntimeError(f"ASGI mode requires the async database driver: {e}")
+    apply_sqlite_pragmas(app, [engine.sync_engine])
+    return AsyncApp(app, engine, WSGIMiddleware(app, workers=app.config['ASGI_WSGI_THREADS']))
+
+
+class AsyncRequest:
+    """
+    Method, path, client address, headers, query string and authenticated caller of an ASGI HTTP request.
+    """
+
+    def __init__(self, scope, proxy_hops=0):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.principal = None  # Set once the request is authenticated
+        self.headers = Headers([(name.decode('latin-1'), value.decode('latin-1')) for name, value in scope['headers']])
+        self.client = (scope.get('client') or ('',))[0]
+        if proxy_hops:
+            # Same rule as ProxyFix on the Flask app: the entry added by the outermost trusted proxy
+            forwarded = [value.strip() for value in self.headers.get('X-Forwarded-For', '').split(',')]
+            if forwarded != [''] and len(forwarded) >= proxy_hops:
+                self.client = forwarded[-proxy_hops]
+        self.args = MultiDict(parse_qsl(scope['query_string'].decode('latin-1'), keep_blank_values=True))
+
+
+class AsyncApp:
+    """
+    ASGI application serving the I/O-bound routes without holding a thread.
+
+    A slow client uploading or downloading a document only costs a coroutine
+    and its buffers: request bodies are parsed incrementally as they arrive,
+    downloads are read from disk in chunks by short-lived thread pool calls,
+    and queries run on the async engine. The responses match the Flask routes,
+    and all other requests are passed to the Flask app.
+    """
+
+    def __init__(self, app, engine, fallback):
+        self.app = app
+        self.engine = engine
+        self.sessions = async_sessionmaker(engine, expire_on_commit=False)
+        self.fallback = fallback
+        # (method, path pattern, endpoint name shared with the Flask route for metrics, access, handler);
+        # access is 'admin' (@admin_required) or 'owner' (@owner_or_admin, the first parameter is the student)
+        self.routes = [
+            ('GET', re.compile(r'/get_students'), 'main.get_students', 'admin', self.list_students),
+            ('POST', re.compile(r'/students/(\d+)/documents'), 'main.upload_documents', 'owner', self.upload_document),
+            ('GET', re.compile(r'/students/(\d+)/documents/(\d+)/download'), 'main.download_document', 'owner',
+             self.download_document),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] == 'http':
+            for method, pattern, endpoint, access, handler in self.routes:
+                match = pattern.fullmatch(scope['path'])
+                if match and scope['method'] == method:
+                    with self.app.app_context():
+                        await self._instrumented(endpoint, access, handler, scope, receive, send, match.groups())
+                    return
+        await self.fallback(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _instrumented(self, endpoint, access, handler, scope, receive, send, params):
+        # Same request metrics as the Flask routes record
+        started = time.perf_counter()
+        sent = {'status': 500, 'size': 0}
+
+        async def counting_send(message):
+            if message['type'] == 'http.response.start':
+                sent['status'] = message['status']
+            else:
+                sent['size'] += len(message.get('body', b''))
+            await send(message)
+
+        try:
+            request = AsyncRequest(scope, self.app.config['TRUSTED_PROXY_HOPS'])
+            params = [int(param) for param in params]
+            if authenticator.required:
+                # Same authentication and access rules as the Flask routes (none of the native routes is public)
+                try:
+                    request.principal = await self._authenticate(request.headers.get('Authorization'))
+                    if access == 'admin' and request.principal.kind != 'admin':
+                        raise AuthError("Admin access required.", 403)
+                    if access == 'owner':
+                        check_owner(request.principal, params[0])
+                except AuthError as e:
+                    await self._respond(counting_send, unauthorized(e))
+                    return
+            await handler(request, receive, counting_send, *params)
+        finally:
+            metrics.request_seconds.observe((endpoint, scope['method'], str(sent['status'])), time.perf_counter() - started)
+            metrics.response_bytes.observe((endpoint,), sent['size'])
+
+    async def _authenticate(self, authorization):
+        # Cached tokens are checked in place; token verification and the identity and blocklist
+        # queries run in a worker thread, so they never block the event loop
+        principal = authenticator.peek(authorization)
+        if principal is not None:
+            return principal
+        return await asyncio.to_thread(self._authenticate_in_thread, authorization)
+
+    def _authenticate_in_thread(self, authorization):
+        # Runs with a copy of the request's app context; the session it opens is closed in this thread
+        try:
+            return authenticator.authenticate(authorization)
+        finally:
+            db.session.remove()
+
+    async def _respond(self, send, response):
+        # Send a complete Flask response object
+        body = response.get_data()
+        response.headers['Content-Length'] = str(len(body))
+        await send({'type': 'http.response.start', 'status': response.status_code,
+                    'headers': _encode_headers(response.headers)})
+        await send({'type': 'http.response.body', 'body': body})
+
+    def _json_response(self, data, status):
+        response = current_app.json.response(data)
+        response.status_code = status
+        return response
+
+    async def _json(self, send, data, status):
+        await self._respond(send, self._json_response(data, status))
+
+    async def list_students(self, request, receive, send):
+        try:
+            paginator, statement, sort, limit, keys = students_page_query(request.args)
+            async with self.sessions() as session:
+                rows, next_cursor = await session.run_sync(
+                    paginator.page, statement, sort, limit, request.args.get('cursor')
+                )
+        except (InvalidCursor, ValueError) as e:
+            await self._json(send, {"error": str(e)}, 400)
+            return
+        except Exception as e:
+            await self._json(send, {"error": str(e)}, 500)
+            return
+
+        to_json = STUDENT_FIELDS.mapper(keys)
+        response = self._json_response({"data": [to_json(row) for row in rows], "nextCursor": next_cursor, "limit": limit}, 200)
+        await self._respond(send, compression.compress(response, request.headers.get('Accept-Encoding')))
+
+    async def upload_document(self, request, receive, send, student_id):
+        # Same admission control as the @admission_controlled('upload') Flask route
+        try:
+            release = admission.admit('upload', client_keys(request.client, request.principal))
+        except Throttled as e:
+            response = self._json_response({"error": str(e)}, e.status_code)
+            response.headers['Retry-After'] = str(e.retry_after)
+            await self._respond(send, response)
+            return
+        try:
+            await self._upload_document(request, receive, send, student_id)
+        finally:
+            release()
+
+    async def _upload_document(self, request, receive, send, student_id):
+        try:
+            try:
+                fields, upload, filename = await self._read_form(request, receive)
+            except RequestEntityTooLarge as e:
+                await self._json(send, {"error": e.description}, 413)
+                return
+            except ValueError:
+                await self._json(send, {"error": "Malformed multipart body."}, 400)
+                return
+
+            key = request.headers.get(KEY_HEADER)
+            if key is None:
+                await self._respond(send, await self._upload(student_id, fields, upload, filename))
+                return
+
+            # Same Idempotency-Key handling as the @idempotent Flask routes, once the body is spooled and hashed
+            mimetype, _ = parse_options_header(request.headers.get('Content-Type'))
+            parts = [(name, None, hashlib.sha256(value.encode()).hexdigest()) for name, value in fields.items()]
+            if upload is not None:
+                parts.append(('document', filename, upload.digest))
+            try:
+                key = scoped_key(check_key(key), request.principal, request.client)
+                async with self.sessions() as session:
+                    record = await session.run_sync(
+                        idempotency.begin, key, fingerprint('POST', request.path, mimetype.lower(), parts=parts)
+                    )
+            except ValueError as e:
+                await self._json(send, {"error": str(e)}, 400)
+                return
+            except IdempotencyConflict as e:
+                response = self._json_response({"error": str(e)}, e.status_code)
+                if e.status_code == 409:
+                    response.headers['Retry-After'] = '1'
+                await self._respond(send, response)
+                return
+            if record is not None:
+                await self._respond(send, replay(record))
+                return
+
+            try:
+                response = await self._upload(student_id, fields, upload, filename)
+            except BaseException:
+                async with self.sessions() as session:
+                    await session.run_sync(idempotency.release, key)
+                raise
+            async with self.sessions() as session:
+                await session.run_sync(
+                    idempotency.finish, key, response.status_code, response.content_type, response.get_data()
+                )
+            await self._respond(send, response)
+        finally:
+            storage.discard_uncommitted()
+
+    async def _upload(self, student_id, fields, upload, filename):
+        # Validate the parsed upload like the Flask route, store it and add its document; returns the response
+        if upload is None:
+            return self._json_response({"error": "No file part in the request."}, 400)
+        if filename == '':
+            return self._json_response({"error": "No selected file."}, 400)
+        if not allowed_file(filename):
+            return self._json_response({"error": "File type not allowed."}, 400)
+        document_type = fields.get('document_type')
+        if not document_type:
+            return self._json_response({"error": "Document type is required."}, 400)
+
+        try:
+            # fsync off the event loop, then insert the document, its blob reference and its jobs in one transaction
+            file_path = await asyncio.to_thread(
+                storage.store, FileStorage(stream=upload, filename=filename), filename.rsplit('.', 1)[1]
+            )
+            async with self.sessions() as session:
+                document, job = await session.run_sync(add_document, student_id, document_type, file_path)
+                await session.commit()
+        except Exception as e:
+            return self._json_response({"error": str(e)}, 500)
+        cache.invalidate_student(student_id)
+        return self._json_response({
+            "message": "Document uploaded successfully!",
+            "documentId": document.document_id,
+            "jobId": job.job_id
+        }, 201)
+
+    async def _read_form(self, request, receive):
+        # Parse the multipart body as it arrives: the 'document' file goes straight into a spooled upload
+        mimetype, options = parse_options_header(request.headers.get('Content-Type'))
+        if mimetype != 'multipart/form-data' or not options.get('boundary'):
+            return {}, None, None
+        decoder = MultipartDecoder(options['boundary'].encode('latin-1'), FORM_MEMORY_LIMIT)
+        fields = {}
+        upload = filename = None
+        write = None
+
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                raise ValueError("Client disconnected.")
+            more_body = message.get('more_body', False)
+            decoder.receive_data(message.get('body', b''))
+            if not more_body:
+                decoder.receive_data(None)
+
+            event = decoder.next_event()
+            while event is not NEED_DATA and not isinstance(event, Epilogue):
+                if isinstance(event, File):
+                    write = None
+                    if event.name == 'document' and upload is None:
+                        upload, filename = storage.spool(), event.filename
+                        write = upload.write
+                elif isinstance(event, Field):
+                    buffer = fields[event.name] = bytearray()
+                    write = buffer.extend
+                elif isinstance(event, Data) and write is not None:
+                    write(event.data)
+                event = decoder.next_event()
+
+        return {name: bytes(value).decode('utf-8', 'replace') for name, value in fields.items()}, upload, filename
+
+    async def download_document(self, request, receive, send, student_id, document_id):
+        try:
+            async with self.sessions() as session:
+                document = (await session.execute(
+                    select(Document.document_id, Document.document_type, Document.file_path)
+                    .where(Document.student_id == student_id, Document.document_id == document_id)
+                )).first()
+        except Exception as e:
+            await self._json(send, {"error": str(e)}, 500)
+            return
+        if document is None:
+            await self._json(send, {"error": "Document not found."}, 404)
+            return
+
+        # Same conditional, offloading and caching rules as ContentStore.send
+        download_name = document_download_name(document)
+        digest = storage.digest_of(document.file_path)
+        response = current_app.response_class(mimetype=mimetypes.guess_type(download_name)[0] or 'application/octet-stream')
+        response.headers.set('Content-Disposition', 'attachment', filename=download_name)
+        if digest is not None:
+            storage.cacheable(response, digest)
+            if parse_etags(request.headers.get('If-None-Match')).contains(digest):
+                response.status_code = 304
+                response.set_data(b'')
+                del response.headers['Content-Type']
+                await self._respond(send, response)
+                return
+            if storage.offload == 'x-accel':
+                response.headers['X-Accel-Redirect'] = f"{storage.accel_prefix}{digest[:2]}/{digest[2:4]}/{digest}"
+                await self._respond(send, response)
+                return
+
+        path = storage.path_for(document.file_path)
+        try:
+            stat = await asyncio.to_thread(os.stat, path)
+        except FileNotFoundError:
+            await self._json(send, {"error": "File does not exist."}, 404)
+            return
+        if storage.offload == 'x-sendfile':
+            response.headers['X-Sendfile'] = os.path.abspath(path)
+            await self._respond(send, response)
+            return
+
+        # Full body, or a single byte range
+        start, length = 0, stat.st_size
+        response.headers['Accept-Ranges'] = 'bytes'
+        response.headers['Last-Modified'] = http_date(stat.st_mtime)
+        byte_range = parse_range_header(request.headers.get('Range'))
+        if_range = request.headers.get('If-Range')
+        if byte_range is not None and (if_range is None or if_range.strip('"') == digest):
+            bounds = byte_range.range_for_length(stat.st_size)
+            if bounds is None:
+                response.status_code = 416
+                response.headers['Content-Range'] = f"bytes */{stat.st_size}"
+                await self._respond(send, response)
+                return
+            start, length = bounds[0], bounds[1] - bounds[0]
+            response.status_code = 206
+            response.headers['Content-Range'] = f"bytes {bounds[0]}-{bounds[1] - 1}/{stat.st_size}"
+        response.headers['Content-Length'] = str(length)
+
+        await send({'type': 'http.response.start', 'status': response.status_code,
+                    'headers': _encode_headers(response.headers)})
+        file = await asyncio.to_thread(open, path, 'rb')
+        try:
+            await asyncio.to_thread(file.seek, start)
+            more_body = True
+            while more_body:
+                chunk = await asyncio.to_thread(file.read, min(DOWNLOAD_CHUNK_SIZE, length)) if length else b''
+                length -= len(chunk)
+                more_body = bool(chunk) and length > 0
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': more_body})
+        finally:
+            await asyncio.to_thread(file.close)
+
+
+def _encode_headers(headers):
+    return [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers.to_wsgi_list()]
@@ -0,0 +1,315 @@
+import threading  # Import threading to guard the token cache and the blocklist sync
+import time  # Import time to expire cached tokens and pace the blocklist sync
+from collections import OrderedDict, namedtuple  # Import OrderedDict for the LRU cache, namedtuple for principals
+from datetime import datetime  # Import datetime to store revocation and expiry times
+from functools import wraps  # Import wraps to build the route decorators
+
+import click  # Import click to define the maintenance commands
+from flask import current_app, g, jsonify, request  # Import Flask request/response helpers
+from flask.cli import AppGroup  # Group the commands under `flask auth`
+from flask_jwt_extended import decode_token  # Verify token signatures and expiry on cache misses
+from sqlalchemy import delete, select  # Core constructs for the blocklist and identity lookups
+from sqlalchemy.exc import IntegrityError  # Raised when a token is revoked twice
+
+from . import jwt, hasher  # JWT manager and password hasher
+from .models import db, Admin, Student, RevokedToken  # Importing database models
+
+# Authenticated caller: 'admin' or 'student', its primary key and role
+Principal = namedtuple('Principal', ['kind', 'id', 'role'])
+
+# Token identity ('<kind>:<id>') kinds -> (primary key column, role column)
+IDENTITY_COLUMNS = {
+    'admin': (Admin.admin_id, Admin.role),
+    'student': (Student.student_id, None),
+}
+
+
+class AuthError(Exception):
+    """
+    Raised when a request has no usable access token (401) or its identity may not use the route (403).
+    """
+
+    def __init__(self, message, status_code=401):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class TokenCache:
+    """
+    Verified access tokens, at most `max_entries`, each kept until its token expires.
+    The least recently used entry is evicted when the cache is full.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # token -> (expires_at, jti, principal)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token, now):
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry
+
+    def set(self, token, entry):
+        with self._lock:
+            self._entries[token] = entry
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, predicate):
+        """
+        Drop every entry for which `predicate(entry)` is true.
+        """
+        with self._lock:
+            for token in [token for token, entry in self._entries.items() if predicate(entry)]:
+                del self._entries[token]
+
+    def size(self):
+        return len(self._entries)
+
+
+class Authenticator:
+    """
+    Bearer token authentication with a cache of verified tokens.
+
+    The first request with a token verifies its signature and expiry and loads
+    its Admin or Student identity; both are then cached (AUTH_CACHE_SIZE tokens,
+    least recently used evicted) until the token expires, so later requests with
+    the same token cost a dict lookup. Revoked tokens are recorded in the
+    revoked_tokens blocklist; every worker reloads the unexpired part of it at
+    most once per AUTH_BLOCKLIST_SYNC_INTERVAL seconds, which bounds how long a
+    token revoked by another worker stays usable.
+    """
+
+    def __init__(self, app=None):
+        self.required = False
+        self._revoked = frozenset()
+        self._last_sync = None
+        self._sync_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.required = app.config['AUTH_REQUIRED']
+        self.cache = TokenCache(app.config['AUTH_CACHE_SIZE'])
+        self.sync_interval = app.config['AUTH_BLOCKLIST_SYNC_INTERVAL']
+        jwt.token_in_blocklist_loader(lambda header, payload: self.is_revoked(payload['jti']))
+        app.extensions['authenticator'] = self
+
+    def authenticate(self, authorization):
+        """
+        Return the Principal of an 'Authorization: Bearer' header value; raises AuthError.
+        """
+        return self._verify(authorization)[2]
+
+    def peek(self, authorization):
+        """
+        Return the Principal of a cached token when that needs no database query, otherwise
+        None (call authenticate()). Used by the ASGI routes to stay off the event loop's thread
+        only when a query is due.
+        """
+        if not authorization or not authorization.startswith('Bearer ') or self._sync_due():
+            return None
+        entry = self.cache.get(authorization[len('Bearer '):], time.time())
+        if entry is None or entry[1] in self._revoked:
+            return None
+        return entry[2]
+
+    def _verify(self, authorization):
+        # (expires_at, jti, principal) of the header's token, from the cache or verified and cached
+        if not authorization or not authorization.startswith('Bearer '):
+            raise AuthError("Missing bearer token.")
+        token = authorization[len('Bearer '):]
+        entry = self.cache.get(token, time.time())
+        if entry is not None:
+            if self.is_revoked(entry[1]):
+                raise AuthError("Token has been revoked.")
+            return entry
+
+        try:
+            claims = decode_token(token)  # Signature and expiry
+        except Exception as e:
+            raise AuthError(f"Invalid token: {e}")
+        if claims.get('type') != 'access':
+            raise AuthError("Invalid token: an access token is required.")
+        if self.is_revoked(claims['jti']):
+            raise AuthError("Token has been revoked.")
+        entry = (claims.get('exp'), claims['jti'], self.load_principal(claims[current_app.config['JWT_IDENTITY_CLAIM']]))
+        if entry[0] is not None:
+            self.cache.set(token, entry)  # Tokens without an expiry are verified every time
+        return entry
+
+    def load_principal(self, subject):
+        """
+        Resolve a token identity ('admin:<id>' or 'student:<id>') to a Principal.
+        """
+        kind, _, raw_id = str(subject).partition(':')
+        if kind not in IDENTITY_COLUMNS or not raw_id.isdigit():
+            raise AuthError("Invalid token: unknown identity.")
+        id_column, role_column = IDENTITY_COLUMNS[kind]
+        columns = [id_column] if role_column is None else [id_column, role_column]
+        row = db.session.execute(select(*columns).where(id_column == int(raw_id))).first()
+        if row is None:
+            raise AuthError("Invalid token: the account no longer exists.")
+        return Principal(kind, row[0], row[1] if role_column is not None else 'Student')
+
+    def is_revoked(self, jti):
+        self._maybe_sync()
+        return jti in self._revoked
+
+    def revoke(self, session, authorization):
+        """
+        Add the header's token to the blocklist and drop it from the cache.
+        """
+        expires_at, jti, _ = self._verify(authorization)
+        try:
+            session.add(RevokedToken(
+                jti=jti, revoked_at=datetime.now(),
+                expires_at=datetime.fromtimestamp(expires_at) if expires_at else datetime.max
+            ))
+            session.commit()
+        except IntegrityError:
+            session.rollback()  # Already revoked
+        self._revoked = self._revoked | {jti}
+        self.cache.discard(lambda entry: entry[1] == jti)
+
+    def forget_identity(self, kind, identity_id):
+        """
+        Drop the cached tokens of a deleted account, so they are verified (and rejected) again.
+        """
+        self.cache.discard(lambda entry: entry[2].kind == kind and entry[2].id == identity_id)
+
+    def sweep(self, session):
+        """
+        Delete expired blocklist entries and return how many were deleted.
+        """
+        deleted = session.execute(delete(RevokedToken).where(RevokedToken.expires_at < datetime.now())).rowcount
+        session.commit()
+        return deleted
+
+    def stats(self):
+        return {
+            "cachedTokens": self.cache.size(),
+            "hits": self.cache.hits,
+            "misses": self.cache.misses,
+            "evictions": self.cache.evictions,
+            "revokedTokens": len(self._revoked),
+        }
+
+    def _sync_due(self):
+        return self._last_sync is None or time.monotonic() - self._last_sync >= self.sync_interval
+
+    def _maybe_sync(self):
+        # Reload the unexpired blocklist (it only holds tokens revoked within their lifetime, so it stays small)
+        with self._sync_lock:
+            if not self._sync_due():
+                return
+            self._last_sync = time.monotonic()
+        rows = db.session.execute(select(RevokedToken.jti).where(RevokedToken.expires_at > datetime.now())).scalars()
+        self._revoked = frozenset(rows)
+
+
+authenticator = Authenticator()
+
+
+def unauthorized(error):
+    # 401/403 response; 401 tells the client which scheme to use
+    response = jsonify({"error": str(error)})
+    response.status_code = error.status_code
+    if error.status_code == 401:
+        response.headers['WWW-Authenticate'] = 'Bearer'
+    return response
+
+
+def public(view):
+    """
+    Route decorator exempting a route from authentication.
+    """
+    view.public = True
+    return view
+
+
+def authenticate_request():
+    """
+    Blueprint before_request hook: every route that is not @public needs a valid
+    access token; its Principal is kept on flask.g.principal.
+    """
+    if not authenticator.required:
+        return None
+    view = current_app.view_functions.get(request.endpoint)
+    if view is None or getattr(view, 'public', False):
+        return None
+    try:
+        g.principal = authenticator.authenticate(request.headers.get('Authorization'))
+    except AuthError as e:
+        return unauthorized(e)
+    return None
+
+
+def admin_required(view):
+    """
+    Route decorator restricting a route to admin tokens.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if authenticator.required and g.principal.kind != 'admin':
+            return unauthorized(AuthError("Admin access required.", 403))
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def check_owner(principal, student_id):
+    """
+    Raise AuthError (403) unless `principal` is an admin or the student `student_id`.
+    """
+    if principal.kind != 'admin' and (principal.kind != 'student' or principal.id != student_id):
+        raise AuthError("You may only access your own records.", 403)
+
+
+def owner_or_admin(view):
+    """
+    Route decorator restricting a /students/<student_id> route to that student and to admins.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if authenticator.required:
+            try:
+                check_owner(g.principal, kwargs['student_id'])
+            except AuthError as e:
+                return unauthorized(e)
+        return view(*args, **kwargs)
+    return wrapper
+
+
+auth_cli = AppGroup('auth', help='Manage admin accounts and the token blocklist.')
+
+
+@auth_cli.command('create-admin')
+@click.argument('email')
+@click.option('--first-name', required=True)
+@click.option('--last-name', required=True)
+@click.password_option()
+def create_admin_command(email, first_name, last_name, password):
+    """Create an admin account."""
+    admin = Admin(first_name=first_name, last_name=last_name, email=email, password=hasher.hash(password))
+    db.session.add(admin)
+    db.session.commit()
+    click.echo(f"Created admin {admin.admin_id} ({email}).")
+
+
+@auth_cli.command('sweep')
+def sweep_command():
+    """Delete expired entries from the token blocklist."""
+    click.echo(f"Deleted {authenticator.sweep(db.session)} expired blocklist entries.")
@@ -0,0 +1,75 @@
+import os  # Import os to remove released blobs
+from contextlib import contextmanager  # Import contextmanager to wrap the commit deleting a document
+
+from sqlalchemy import delete, insert, select, update  # Core constructs for the reference counts
+
+from . import storage  # Content-addressed document storage
+from .models import StoredBlob  # Importing database models
+
+
+def add_reference(session, file_path):
+    """
+    Count a new document referencing `file_path` and put its blob in place. Call it in the
+    transaction adding the document: the count row stays locked until the commit, so a
+    concurrent release of the same content either waits for it or finishes first, in which
+    case the blob is stored again from this request's upload.
+    """
+    digest = storage.digest_of(file_path)
+    if digest is None:
+        return  # Legacy paths are not content-addressed
+    _adjust(session, digest, 1)
+    storage.place(digest)
+
+
+@contextmanager
+def releasing(session, file_path):
+    """
+    Drop a deleted document's reference to its blob around the block committing the deletion.
+    The last reference moves the blob aside while its count row is locked; the blob is removed
+    once the block completes, or put back if the block raises.
+    """
+    digest = storage.digest_of(file_path)
+    if digest is None:
+        yield
+        path = storage.path_for(file_path)  # Legacy files belong to a single document
+        if os.path.exists(path):
+            os.remove(path)
+        return
+
+    released = storage.set_aside(digest) if _adjust(session, digest, -1) == 0 else None
+    try:
+        yield
+    except BaseException:
+        storage.restore(digest, released)
+        raise
+    if released is not None:
+        os.remove(released)
+
+
+def _adjust(session, digest, delta):
+    # Add `delta` to the blob's count and return the new count, deleting the row at zero;
+    # None when releasing a blob that was never counted (it is kept)
+    table = StoredBlob.__table__
+    dialect = session.get_bind(mapper=StoredBlob).dialect.name
+    if delta > 0 and dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        statement = upsert(table).values(digest=digest, ref_count=delta)
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.digest], set_={'ref_count': table.c.ref_count + statement.excluded.ref_count}
+        ))
+    else:
+        updated = session.execute(
+            update(table).where(table.c.digest == digest).values(ref_count=table.c.ref_count + delta)
+        ).rowcount
+        if not updated:
+            if delta < 0:
+                return None
+            session.execute(insert(table).values(digest=digest, ref_count=delta))
+
+    count = session.execute(select(table.c.ref_count).where(table.c.digest == digest)).scalar_one()
+    if count <= 0:
+        session.execute(delete(table).where(table.c.digest == digest))
+    return count
@@ -0,0 +1,220 @@
+import json  # Import json to store values in the shared backend
+import logging  # Import logging to report lost invalidation subscriptions
+import threading  # Import threading to guard the in-process cache
+import time  # Import time to expire entries
+from collections import OrderedDict  # Import OrderedDict to keep entries in LRU order
+
+
+class LRUBackend:
+    """
+    In-process cache holding at most `max_entries` values, each for at most `ttl` seconds.
+    The least recently used entry is evicted when the cache is full.
+    """
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def size(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Cache shared by every worker process, stored in Redis with a per-key TTL.
+    Requires the optional `redis` package.
+    """
+
+    def __init__(self, url, ttl, prefix='ors:'):
+        try:
+            import redis  # Optional dependency, only needed for the shared backend
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package (pip install redis).")
+        self._client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self.evictions = 0  # Redis evicts on its own; expiry is not counted here
+
+    def get(self, key):
+        raw = self._client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value):
+        self._client.set(self.prefix + key, json.dumps(value, separators=(',', ':')), ex=self.ttl)
+
+    def delete(self, *keys):
+        if keys:
+            self._client.delete(*[self.prefix + key for key in keys])
+
+    def size(self):
+        return None
+
+
+class InvalidationChannel:
+    """
+    Redis pub/sub channel carrying cache deletions between processes, so that every process
+    drops the keys deleted by any of them from its in-process cache.
+    Requires the optional `redis` package.
+    """
+
+    def __init__(self, url, on_delete, channel='ors:cache-invalidations'):
+        try:
+            import redis  # Optional dependency, only needed to share invalidations
+        except ImportError:
+            raise RuntimeError("CACHE_INVALIDATION_URL requires the 'redis' package.")
+        self._client = redis.Redis.from_url(url)
+        self.channel = channel
+        self._on_delete = on_delete
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{channel: self._receive})
+        # Started per process: create the app after forking workers, not before
+        self._thread = pubsub.run_in_thread(sleep_time=1, daemon=True, exception_handler=self._lost)
+
+    def _receive(self, message):
+        self._on_delete(*json.loads(message['data']))
+
+    def _lost(self, error, pubsub, thread):
+        # Deletions published from now on are missed, so stop serving entries that may be stale
+        logging.getLogger(__name__).error("Cache invalidation subscription lost: %s", error)
+        thread.stop()
+        self._on_delete(None)
+
+    def publish(self, keys):
+        self._client.publish(self.channel, json.dumps(list(keys)))
+
+
+class ReadThroughCache:
+    """
+    Read-through cache for JSON-ready payloads, keyed by record type and student ID.
+
+    Values must be plain JSON types so the in-process and shared backends
+    behave the same. Write routes call invalidate_student() after committing.
+
+    With the in-process backend, deletions only reach other processes (other web workers,
+    the job worker) through CACHE_INVALIDATION_URL; without it the app must run as one process.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.invalidations = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        # Pick the backend named in the configuration
+        backend = app.config['CACHE_BACKEND']
+        self.invalidations = None
+        if backend == 'lru':
+            self.backend = LRUBackend(app.config['CACHE_MAX_ENTRIES'], app.config['CACHE_TTL'])
+            if app.config['CACHE_INVALIDATION_URL']:
+                self.invalidations = InvalidationChannel(app.config['CACHE_INVALIDATION_URL'], self._drop)
+            elif app.config['CACHE_PROCESSES'] > 1:
+                raise ValueError(
+                    "CACHE_BACKEND 'lru' cannot be invalidated across processes: "
+                    "set CACHE_INVALIDATION_URL or use CACHE_BACKEND 'redis'."
+                )
+        elif backend == 'redis':
+            self.backend = RedisBackend(app.config['CACHE_REDIS_URL'], app.config['CACHE_TTL'])
+        elif backend == 'none':
+            self.backend = None
+        else:
+            raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+        app.extensions['cache'] = self
+
+    def get(self, key):
+        """
+        Return the cached value for `key` without loading it, or None.
+        """
+        if self.backend is None:
+            return None
+        value = self.backend.get(key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+        return value
+
+    def load(self, key, loader):
+        """
+        Handle a miss: call `loader()` and cache its result unless it is None.
+        """
+        if self.backend is None:
+            return loader()
+        with self._lock:
+            self.misses += 1
+        value = loader()
+        if value is not None:
+            self.backend.set(key, value)
+        return value
+
+    def delete(self, *keys):
+        if self.backend is not None:
+            self.backend.delete(*keys)
+        if self.invalidations is not None and keys:
+            self.invalidations.publish(keys)
+
+    def _drop(self, *keys):
+        # Deletions published by any process; None means some may have been missed
+        backend = self.backend
+        if keys == (None,):
+            self.backend = None
+        elif backend is not None:
+            backend.delete(*keys)
+
+    @property
+    def reaches_all_processes(self):
+        """
+        Whether deletions made in this process are seen by every other process.
+        """
+        return not isinstance(self.backend, LRUBackend) or self.invalidations is not None
+
+    def invalidate_student(self, student_id):
+        """
+        Drop every cached entry derived from the student's records.
+        """
+        self.delete(f"student:{student_id}", f"admission:{student_id}")
+
+    def stats(self):
+        """
+        Return hit/miss/eviction counters.
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "hits": hits,
+            "misses": misses,
+            "hitRatio": hits / (hits + misses) if hits + misses else None,
+            "evictions": self.backend.evictions if self.backend else 0,
+            "size": self.backend.size() if self.backend else 0,
+        }
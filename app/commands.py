@@ -0,0 +1,83 @@
+from datetime import datetime  # Import datetime for sample keyset values
+
+import click  # Import click to define Flask CLI commands
+from flask.cli import with_appcontext  # Run commands inside an application context
+from sqlalchemy import select, text  # Import Core constructs to build the checked statements
+
+from .models import db, Student, Admission, Document  # Importing database models
+
+
+def route_access_paths():
+    """
+    The WHERE/ORDER BY shapes issued by the routes, paired with the route that issues them.
+    """
+    from .routes import STUDENT_SORTS  # Imported here to reuse the exact keyset conditions of the listing
+    from .search import search_students  # Imported here: the search module registers DDL on the models
+
+    dialect = db.engine.dialect.name
+    return [
+        ("get_students ?program=", select(Student).where(
+            Student.program == 'x', STUDENT_SORTS['student_id'].after([1])
+        ).order_by(Student.student_id).limit(50)),
+        ("get_students ?admission_status=", select(Student).where(
+            Student.admission_status == 'x', STUDENT_SORTS['student_id'].after([1])
+        ).order_by(Student.student_id).limit(50)),
+        ("get_students ?program=&admission_status=", select(Student).where(
+            Student.program == 'x', Student.admission_status == 'x'
+        ).order_by(Student.student_id).limit(50)),
+        ("get_students ?sort=created_at", select(Student).where(
+            STUDENT_SORTS['created_at'].after([datetime(2024, 1, 1), 1])
+        ).order_by(Student.created_at, Student.student_id).limit(50)),
+        ("get_student", select(Student).where(Student.student_id == 1)),
+        ("get_admission", select(Admission).where(Admission.student_id == 1).limit(1)),
+        ("get/download/update/delete_document", select(Document).where(
+            Document.student_id == 1, Document.document_id == 1
+        ).limit(1)),
+        ("documents verified by an admin", select(Document).where(Document.verified_by == 1)),
+        ("students/search ?q=<long terms>", search_students(select(Student.student_id), ['student'], dialect)[0]),
+        ("students/search ?q=<short terms>", search_students(select(Student.student_id), ['st', 'l'], dialect)[0]),
+        ("students/search ?q=<long and short terms>", search_students(
+            select(Student.student_id), ['student', 'l'], dialect
+        )[0]),
+    ]
+
+
+def explain(connection, statement):
+    """
+    Return the query plan lines for a statement and whether the plan avoids full table scans.
+    """
+    compiled = statement.compile(dialect=connection.dialect)
+    parameters = tuple(compiled.params[name] for name in compiled.positiontup) if compiled.positional else compiled.params
+
+    if connection.dialect.name == 'sqlite':
+        rows = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + str(compiled), parameters).all()
+        lines = [row[-1] for row in rows]
+        # "SCAN <table>" without an index means every row is read
+        return lines, not any(line.startswith('SCAN') and 'INDEX' not in line for line in lines)
+
+    if connection.dialect.name == 'postgresql':
+        # Tiny development tables make sequential scans look cheapest, so rule them out
+        with connection.begin():
+            connection.execute(text('SET LOCAL enable_seqscan = off'))
+            rows = connection.exec_driver_sql('EXPLAIN ' + str(compiled), parameters).all()
+        lines = [row[0] for row in rows]
+        return lines, not any('Seq Scan' in line for line in lines)
+
+    raise click.ClickException(f"Query plan checks are not supported for {connection.dialect.name}.")
+
+
+@click.command('check-indexes')
+@with_appcontext
+def check_indexes_command():
+    """Check that every route's lookup is served by an index."""
+    failures = 0
+    with db.engine.connect() as connection:
+        for route, statement in route_access_paths():
+            lines, uses_index = explain(connection, statement)
+            failures += not uses_index
+            click.echo(f"[{'ok' if uses_index else 'FULL SCAN'}] {route}")
+            for line in lines:
+                click.echo(f"    {line}")
+
+    if failures:
+        raise click.ClickException(f"{failures} access path(s) fall back to a full table scan.")
@@ -0,0 +1,165 @@
+import zlib  # Import zlib for gzip compression
+
+from flask import request  # Import request to read Accept-Encoding
+from werkzeug.http import parse_accept_header  # Import parse_accept_header to negotiate the encoding
+
+from .metrics import phase  # Attribute compression time to the current request
+
+# Response types worth compressing (text/* types are always included)
+COMPRESSIBLE_TYPES = {'application/json', 'application/x-ndjson', 'application/problem+json', 'application/javascript'}
+
+# Status codes whose bodies are never compressed: no body, or a byte range of the identity encoding
+UNCOMPRESSED_STATUSES = {204, 206, 304}
+
+
+class GzipCodec:
+    name = 'gzip'
+
+    def __init__(self, level):
+        self.level = level
+
+    def compressor(self):
+        # (compress(chunk) -> bytes, finish() -> bytes) for streamed bodies
+        stream = zlib.compressobj(self.level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+        return stream.compress, stream.flush
+
+    def compress(self, data):
+        compress, finish = self.compressor()
+        return compress(data) + finish()
+
+
+class BrotliCodec:
+    name = 'br'
+
+    def __init__(self, quality):
+        import brotli  # Optional dependency, only needed for the 'br' encoding
+        self._brotli = brotli
+        self.quality = quality
+
+    def compressor(self):
+        stream = self._brotli.Compressor(quality=self.quality)
+        return stream.process, stream.finish
+
+    def compress(self, data):
+        return self._brotli.compress(data, quality=self.quality)
+
+
+class ZstdCodec:
+    name = 'zstd'
+
+    def __init__(self, level):
+        import zstandard  # Optional dependency, only needed for the 'zstd' encoding
+        self._zstandard = zstandard
+        self.level = level
+
+    def compressor(self):
+        # Compressor objects are not thread-safe: one per response
+        stream = self._zstandard.ZstdCompressor(level=self.level).compressobj()
+        return stream.compress, stream.flush
+
+    def compress(self, data):
+        return self._zstandard.ZstdCompressor(level=self.level).compress(data)
+
+
+class ResponseCompressor:
+    """
+    Negotiated response compression.
+
+    Text and JSON responses of at least COMPRESS_MIN_SIZE bytes are encoded with
+    the accepted encoding of highest quality, ties going to the first in
+    COMPRESS_ALGORITHMS (server preference order). 'br' and 'zstd' need the
+    optional brotli and zstandard packages and are skipped when those are missing. Streamed responses (exports) are
+    compressed on the fly when COMPRESS_STREAMS is set. File downloads, ranges
+    and already-encoded responses are sent as they are.
+    """
+
+    def __init__(self, app=None):
+        self.codecs = []
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.min_size = app.config['COMPRESS_MIN_SIZE']
+        self.streams = app.config['COMPRESS_STREAMS']
+        factories = {
+            'gzip': lambda: GzipCodec(app.config['COMPRESS_GZIP_LEVEL']),
+            'br': lambda: BrotliCodec(app.config['COMPRESS_BROTLI_QUALITY']),
+            'zstd': lambda: ZstdCodec(app.config['COMPRESS_ZSTD_LEVEL']),
+        }
+        self.codecs = []
+        for name in app.config['COMPRESS_ALGORITHMS']:
+            if name not in factories:
+                raise ValueError(f"Unknown compression algorithm: {name}")
+            try:
+                self.codecs.append(factories[name]())
+            except ImportError:
+                app.logger.info("Compression '%s' disabled: its package is not installed.", name)
+        app.after_request(self._after_request)
+        app.extensions['compression'] = self
+
+    def negotiate(self, accept_encoding):
+        """
+        Return the codec to use for an Accept-Encoding header value, or None.
+        """
+        if not accept_encoding:
+            return None
+        accepted = parse_accept_header(accept_encoding)
+        # Highest client quality wins; ties go to the first in server preference order
+        best, best_quality = None, 0
+        for codec in self.codecs:
+            quality = accepted.quality(codec.name)
+            if quality > best_quality:
+                best, best_quality = codec, quality
+        return best
+
+    def compress(self, response, accept_encoding):
+        """
+        Compress `response` in place when it is eligible and the client accepts a configured encoding.
+        """
+        if (response.status_code < 200 or response.status_code in UNCOMPRESSED_STATUSES
+                or response.direct_passthrough or 'Content-Encoding' in response.headers
+                or not (response.mimetype in COMPRESSIBLE_TYPES or response.mimetype.startswith('text/'))):
+            return response
+        if response.is_streamed and not self.streams:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        codec = self.negotiate(accept_encoding)
+        if codec is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self._compress_stream(codec, response.response)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            with phase('compression'):
+                compressed = codec.compress(data)
+            if len(compressed) >= len(data):
+                return response
+            response.set_data(compressed)
+
+        response.headers['Content-Encoding'] = codec.name
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            # The encoded body is no longer byte-identical to the strong validator's representation
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _compress_stream(self, codec, chunks):
+        # Emit compressed data as the compressor produces it, not after every chunk
+        compress, finish = codec.compressor()
+        try:
+            for chunk in chunks:
+                data = compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+                if data:
+                    yield data
+            yield finish()
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+
+    def _after_request(self, response):
+        return self.compress(response, request.headers.get('Accept-Encoding'))
@@ -0,0 +1,43 @@
+import hashlib  # Import hashlib to derive compact ETags from record versions
+from datetime import timezone  # Import timezone to express Last-Modified in UTC
+
+from flask import request, make_response  # Import request headers and response helpers
+
+
+def record_validators(kind, key, updated_at, variant=''):
+    """
+    Build the (ETag, Last-Modified) pair for one version of a record.
+    `updated_at` is a naive local timestamp as stored by the models; `variant`
+    distinguishes representations of the same version (e.g. a field selection).
+    """
+    version = f"{kind}:{key}:{updated_at.isoformat()}:{variant}"
+    etag = hashlib.sha1(version.encode('utf-8')).hexdigest()[:20]
+    return etag, updated_at.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def is_not_modified(etag, last_modified):
+    """
+    Evaluate If-None-Match (which takes precedence) or If-Modified-Since against the record version.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def add_validators(response, etag, last_modified):
+    """
+    Attach the validators to a response so clients can revalidate it later.
+    """
+    response.set_etag(etag, weak=True)
+    response.last_modified = last_modified
+    response.headers['Cache-Control'] = 'no-cache'  # Clients may store it but must revalidate every time
+    return response
+
+
+def not_modified(etag, last_modified):
+    """
+    Build an empty 304 response carrying the current validators.
+    """
+    return add_validators(make_response('', 304), etag, last_modified)
@@ -12,5 +12,133 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///school.db')  # Use SQLite for local development
     # Disables the SQLALCHEMY feature that tracks changes to objects, as it's not necessary and consumes extra memory.
     SQLALCHEMY_TRACK_MODIFICATIONS = False  
+    # Database engine profile: 'tuned' (WAL and pragmas for SQLite, a sized and pre-pinged pool for
+    # server databases) or 'default' (SQLAlchemy's defaults)
+    DB_ENGINE_PROFILE = os.getenv('DB_ENGINE_PROFILE', 'tuned')
+    # Connection pool of server databases with the 'tuned' profile
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    # SQLite pragmas with the 'tuned' profile: milliseconds a writer waits for the lock, memory-mapped
+    # I/O size in bytes, page cache size (negative values are KiB) and the synchronous level
+    SQLITE_BUSY_TIMEOUT = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', -64000))
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    # Comma-separated read replica URIs; GET and HEAD requests read from them round-robin
+    # (e.g. DATABASE_REPLICA_URLS=sqlite:///replica.db to try it locally with a copy of school.db)
+    SQLALCHEMY_REPLICA_URIS = [uri for uri in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if uri]
+    # Async database URL used by the ASGI app; derived from the main database URL when unset
+    ASYNC_DATABASE_URI = os.getenv('ASYNC_DATABASE_URL')
+    # Threads running the synchronous Flask routes under the ASGI app
+    ASGI_WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', 10))
+    # Response compression: encodings in server preference order ('br' and 'zstd' need the brotli and
+    # zstandard packages), smallest body worth compressing in bytes, whether streamed exports are compressed,
+    # and the level of each encoder
+    COMPRESS_ALGORITHMS = [name.strip() for name in os.getenv('COMPRESS_ALGORITHMS', 'zstd,br,gzip').split(',') if name.strip()]
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_STREAMS = os.getenv('COMPRESS_STREAMS', 'true').lower() in ('1', 'true', 'yes')
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))
+    COMPRESS_ZSTD_LEVEL = int(os.getenv('COMPRESS_ZSTD_LEVEL', 3))
     # Secret key specifically for JWT authentication, fetched from environment variable JWT_SECRET_KEY or uses a default value.
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your_jwt_secret_key')
+    # Whether every route that is not public needs a bearer access token, how many verified tokens are
+    # cached (each until it expires), and how often (seconds) each worker reloads the revoked-token blocklist
+    AUTH_REQUIRED = os.getenv('AUTH_REQUIRED', 'true').lower() in ('1', 'true', 'yes')
+    AUTH_CACHE_SIZE = int(os.getenv('AUTH_CACHE_SIZE', 10000))
+    AUTH_BLOCKLIST_SYNC_INTERVAL = float(os.getenv('AUTH_BLOCKLIST_SYNC_INTERVAL', 5))
+    # Default and maximum number of students returned per page by the listing route
+    STUDENTS_PAGE_SIZE = int(os.getenv('STUDENTS_PAGE_SIZE', 50))
+    STUDENTS_MAX_PAGE_SIZE = int(os.getenv('STUDENTS_MAX_PAGE_SIZE', 500))
+    # Number of rows fetched from the database per batch while streaming an export
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+    # Password hashing method and work factor, e.g. 'scrypt' or 'scrypt:65536:8:1' (N:r:p)
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt')
+    # Number of hashing processes (0 hashes inline on the request worker)
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    # Maximum number of passwords queued or running before new hashing calls are rejected
+    PASSWORD_HASH_QUEUE_DEPTH = int(os.getenv('PASSWORD_HASH_QUEUE_DEPTH', 64))
+    # Seconds to wait for a hashing call before giving up
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+    # Retry-After value (seconds) sent when hashing is at capacity
+    PASSWORD_HASH_RETRY_AFTER = int(os.getenv('PASSWORD_HASH_RETRY_AFTER', 1))
+    # Maximum number of students accepted by one bulk registration request
+    BULK_REGISTRATION_MAX_ROWS = int(os.getenv('BULK_REGISTRATION_MAX_ROWS', 10000))
+    # Number of rows written per executemany batch (and per transaction) during bulk registration
+    BULK_INSERT_BATCH_SIZE = int(os.getenv('BULK_INSERT_BATCH_SIZE', 500))
+    # Admission control of the expensive routes: per-client token buckets (keyed by IP and JWT identity)
+    # refilled at RATE_LIMIT_RATE tokens per second up to RATE_LIMIT_BURST, the token cost of each route class,
+    # the cap on requests in progress per route class (0 for no cap), and the Retry-After (seconds) sent
+    # when a class is at its cap. Buckets are spread over RATE_LIMIT_SHARDS locks and at most
+    # RATE_LIMIT_MAX_CLIENTS clients are tracked.
+    ADMISSION_CONTROL_ENABLED = os.getenv('ADMISSION_CONTROL_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    RATE_LIMIT_RATE = float(os.getenv('RATE_LIMIT_RATE', 5))
+    RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST', 100))
+    RATE_LIMIT_COSTS = {name: int(cost) for name, cost in (
+        item.split('=') for item in os.getenv('RATE_LIMIT_COSTS', 'default=1,upload=5,export=10,hashing=10,bulk=50').split(',')
+    )}
+    ROUTE_CONCURRENCY_LIMITS = {name: int(limit) for name, limit in (
+        item.split('=') for item in os.getenv('ROUTE_CONCURRENCY_LIMITS', 'upload=32,export=4,hashing=16,bulk=2').split(',')
+    )}
+    ROUTE_CONCURRENCY_RETRY_AFTER = int(os.getenv('ROUTE_CONCURRENCY_RETRY_AFTER', 1))
+    RATE_LIMIT_SHARDS = int(os.getenv('RATE_LIMIT_SHARDS', 64))
+    RATE_LIMIT_MAX_CLIENTS = int(os.getenv('RATE_LIMIT_MAX_CLIENTS', 100000))
+    # Number of reverse proxies in front of the app whose X-Forwarded-For entries are trusted. Behind a proxy
+    # every request comes from the proxy's address, so without this all clients share one rate-limit bucket;
+    # 0 (no proxy) ignores the header, which clients could otherwise forge to get fresh buckets
+    TRUSTED_PROXY_HOPS = int(os.getenv('TRUSTED_PROXY_HOPS', 0))
+    # Read-through cache backend: 'lru' (in-process), 'redis' (shared between workers) or 'none'
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'lru')
+    # Maximum number of entries held by the in-process cache
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 10000))
+    # Seconds a cached entry stays valid
+    CACHE_TTL = int(os.getenv('CACHE_TTL', 300))
+    # Redis URL used when CACHE_BACKEND is 'redis'
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    # Redis URL whose pub/sub carries 'lru' cache deletions to every process; empty keeps them process-local
+    CACHE_INVALIDATION_URL = os.getenv('CACHE_INVALIDATION_URL', '')
+    # Number of web worker processes; the 'lru' backend refuses more than one without CACHE_INVALIDATION_URL
+    CACHE_PROCESSES = int(os.getenv('CACHE_PROCESSES', os.getenv('WEB_CONCURRENCY', 1)))
+    # Maximum number of decisions accepted by one batch admission review request
+    ADMISSION_REVIEW_MAX_BATCH = int(os.getenv('ADMISSION_REVIEW_MAX_BATCH', 1000))
+    # Seconds a stored Idempotency-Key response is replayed before the key expires
+    IDEMPOTENCY_TTL = int(os.getenv('IDEMPOTENCY_TTL', 24 * 3600))
+    # Seconds after which the claim of a request that never finished can be taken over by a retry
+    IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv('IDEMPOTENCY_LOCK_TIMEOUT', 60))
+    # Minimum seconds between two sweeps of expired keys in one process
+    IDEMPOTENCY_SWEEP_INTERVAL = int(os.getenv('IDEMPOTENCY_SWEEP_INTERVAL', 300))
+    # Maximum number of students loaded by one batch dossier request
+    DOSSIER_MAX_IDS = int(os.getenv('DOSSIER_MAX_IDS', 100))
+    # Directory holding uploaded documents (content-addressed, sharded by SHA-256)
+    UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'uploads')
+    # Maximum size in bytes of one uploaded document, enforced while the upload streams in
+    MAX_UPLOAD_SIZE = int(os.getenv('MAX_UPLOAD_SIZE', 20 * 1024 * 1024))
+    # How document downloads are served: '' (by the app), 'x-accel' (nginx X-Accel-Redirect) or 'x-sendfile'
+    DOCUMENT_OFFLOAD = os.getenv('DOCUMENT_OFFLOAD', '')
+    # nginx `internal` location mapped onto UPLOAD_FOLDER, used by the 'x-accel' mode
+    DOCUMENT_ACCEL_PREFIX = os.getenv('DOCUMENT_ACCEL_PREFIX', '/protected-documents/')
+    # Seconds clients may cache a downloaded document (its content never changes)
+    DOCUMENT_CACHE_MAX_AGE = int(os.getenv('DOCUMENT_CACHE_MAX_AGE', 86400))
+    # Background job queue: attempts per job, seconds a claimed job stays invisible to other workers,
+    # base retry delay in seconds (doubled after every failed attempt) and idle polling interval
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 5))
+    JOB_VISIBILITY_TIMEOUT = int(os.getenv('JOB_VISIBILITY_TIMEOUT', 300))
+    JOB_RETRY_DELAY = float(os.getenv('JOB_RETRY_DELAY', 5))
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 1))
+    # Document previews: cache directory, disk budget in bytes (least recently used previews are evicted
+    # beyond it, checked at most once per PREVIEW_EVICT_INTERVAL seconds), allowed sizes in pixels, render
+    # processes, seconds to wait for a render, and whether previews are generated in the background right
+    # after an upload
+    PREVIEW_CACHE_FOLDER = os.getenv('PREVIEW_CACHE_FOLDER', 'previews')
+    PREVIEW_CACHE_BUDGET = int(os.getenv('PREVIEW_CACHE_BUDGET', 256 * 1024 * 1024))
+    PREVIEW_SIZES = [int(size) for size in os.getenv('PREVIEW_SIZES', '128,512,1024').split(',')]
+    PREVIEW_WORKERS = int(os.getenv('PREVIEW_WORKERS', 2))
+    PREVIEW_TIMEOUT = int(os.getenv('PREVIEW_TIMEOUT', 30))
+    PREVIEW_PREWARM = os.getenv('PREVIEW_PREWARM', '').lower() in ('1', 'true', 'yes')
+    PREVIEW_EVICT_INTERVAL = float(os.getenv('PREVIEW_EVICT_INTERVAL', 60))
+    # Requests slower than this many seconds are logged with their slowest SQL statements (0 disables the log)
+    SLOW_REQUEST_THRESHOLD = float(os.getenv('SLOW_REQUEST_THRESHOLD', 0))
+    # Number of SQL statements included in a slow-request log entry
+    SLOW_REQUEST_MAX_STATEMENTS = int(os.getenv('SLOW_REQUEST_MAX_STATEMENTS', 10))
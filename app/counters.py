@@ -0,0 +1,213 @@
+import json  # Import json to build composite counter keys
+import sys  # Import sys to report drift through the exit status
+from collections import Counter  # Import Counter to accumulate counter deltas
+
+import click  # Import click to define the stats CLI commands
+from flask.cli import AppGroup  # Group the stats commands under `flask stats`
+from sqlalchemy import delete, event, func, inspect, insert, select, update  # Core constructs for counter upkeep
+from sqlalchemy.orm import Session  # Listen to every session's flushes
+
+from .models import db, Student, Document, StatCounter  # Importing database models
+
+# Counted columns of each tracked model
+TRACKED_COLUMNS = {
+    Student: ('program', 'admission_status', 'created_at'),
+    Document: ('verification_status',),
+}
+
+
+def student_groups(program, admission_status, created_at):
+    """
+    Return the (metric, key) counters a student contributes to.
+    """
+    groups = [('students_by_program_status', json.dumps([program, admission_status]))]
+    if created_at is not None:
+        groups.append(('registrations_by_day', created_at.date().isoformat()))
+    return groups
+
+
+def document_groups(verification_status):
+    """
+    Return the (metric, key) counters a document contributes to.
+    """
+    return [('documents_by_status', verification_status or '')]
+
+
+def _groups(instance, values):
+    if isinstance(instance, Student):
+        return student_groups(*values)
+    return document_groups(*values)
+
+
+def _previous_values(instance):
+    # Values as of the last load or flush, before this flush's changes
+    state = inspect(instance)
+    values = []
+    for name in TRACKED_COLUMNS[type(instance)]:
+        history = state.attrs[name].history
+        if history.deleted:
+            values.append(history.deleted[0])
+        elif history.unchanged:
+            values.append(history.unchanged[0])
+        else:
+            values.append(getattr(instance, name))  # Expired: loads the stored value
+    return values
+
+
+def _current_values(instance):
+    return [getattr(instance, name) for name in TRACKED_COLUMNS[type(instance)]]
+
+
+def _changed(instance):
+    state = inspect(instance)
+    return any(state.attrs[name].history.has_changes() for name in TRACKED_COLUMNS[type(instance)])
+
+
+@event.listens_for(Session, 'before_flush')
+def _count_removals(session, flush_context, instances):
+    # Subtract deleted rows and the old values of updated rows while they can still be read
+    deltas = session.info.setdefault('stat_deltas', Counter())
+    updated = session.info.setdefault('stat_updated', [])
+    for instance in session.deleted:
+        if type(instance) in TRACKED_COLUMNS:
+            for group in _groups(instance, _previous_values(instance)):
+                deltas[group] -= 1
+    for instance in session.dirty:
+        if type(instance) in TRACKED_COLUMNS and _changed(instance):
+            for group in _groups(instance, _previous_values(instance)):
+                deltas[group] -= 1
+            updated.append(instance)
+
+
+@event.listens_for(Session, 'after_flush')
+def _count_additions(session, flush_context):
+    # Add inserted rows and the new values of updated rows (column defaults are set by now),
+    # then write all deltas in the flush's transaction
+    deltas = session.info.pop('stat_deltas', Counter())
+    for instance in list(session.new) + session.info.pop('stat_updated', []):
+        if type(instance) in TRACKED_COLUMNS:
+            for group in _groups(instance, _current_values(instance)):
+                deltas[group] += 1
+    apply_deltas(session, deltas)
+
+
+def record_students(session, rows):
+    """
+    Count students inserted with Core statements (which bypass the flush hooks),
+    from rows carrying program, admission_status and created_at.
+    """
+    deltas = Counter()
+    for row in rows:
+        for group in student_groups(row.program, row.admission_status, row.created_at):
+            deltas[group] += 1
+    apply_deltas(session, deltas)
+
+
+def record_status_changes(session, changes):
+    """
+    Count admission status changes made with set-based UPDATEs,
+    from (program, old admission_status, new admission_status) tuples.
+    """
+    deltas = Counter()
+    for program, old_status, new_status in changes:
+        deltas[('students_by_program_status', json.dumps([program, old_status]))] -= 1
+        deltas[('students_by_program_status', json.dumps([program, new_status]))] += 1
+    apply_deltas(session, deltas)
+
+
+def apply_deltas(session, deltas):
+    """
+    Add the deltas to their counters in the session's current transaction.
+    """
+    changes = sorted((metric, key, delta) for (metric, key), delta in deltas.items() if delta)
+    if not changes:
+        return
+
+    table = StatCounter.__table__
+    dialect = session.get_bind(mapper=StatCounter).dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        # One upsert for all counters, in key order so concurrent writers lock rows in the same order
+        statement = upsert(table).values([{'metric': m, 'key': k, 'value': d} for m, k, d in changes])
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.metric, table.c.key],
+            set_={'value': table.c.value + statement.excluded.value}
+        ))
+        return
+
+    for metric, key, delta in changes:
+        updated = session.execute(
+            update(table).where(table.c.metric == metric, table.c.key == key).values(value=table.c.value + delta)
+        ).rowcount
+        if not updated:
+            session.execute(insert(table).values(metric=metric, key=key, value=delta))
+
+
+def recompute(session):
+    """
+    Compute every counter from scratch with GROUP BY queries over the source tables.
+    """
+    expected = Counter()
+    day = func.date(Student.created_at)
+    for program, status, count in session.execute(
+        select(Student.program, Student.admission_status, func.count()).group_by(Student.program, Student.admission_status)
+    ):
+        expected[('students_by_program_status', json.dumps([program, status]))] += count
+    for registered, count in session.execute(
+        select(day, func.count()).where(Student.created_at.isnot(None)).group_by(day)
+    ):
+        expected[('registrations_by_day', str(registered))] += count
+    for status, count in session.execute(
+        select(Document.verification_status, func.count()).group_by(Document.verification_status)
+    ):
+        expected[('documents_by_status', status or '')] += count
+    return expected
+
+
+def stored(session):
+    """
+    Return the non-zero counters currently stored.
+    """
+    rows = session.execute(select(StatCounter.metric, StatCounter.key, StatCounter.value).where(StatCounter.value != 0))
+    return Counter({(metric, key): value for metric, key, value in rows})
+
+
+def rebuild(session, expected=None):
+    """
+    Replace the stored counters with a full recount; the caller commits.
+    """
+    expected = recompute(session) if expected is None else expected
+    session.execute(delete(StatCounter))
+    if expected:
+        session.execute(insert(StatCounter), [
+            {'metric': metric, 'key': key, 'value': value} for (metric, key), value in sorted(expected.items())
+        ])
+    return expected
+
+
+stats_cli = AppGroup('stats', help='Maintain the dashboard statistics counters.')
+
+
+@stats_cli.command('rebuild')
+@click.option('--check', is_flag=True, help='Only report counters that differ from a full recount.')
+def rebuild_command(check):
+    """Recompute the statistics counters from the source tables."""
+    expected = recompute(db.session)
+    current = stored(db.session)
+    drift = sorted(group for group in expected.keys() | current.keys() if expected[group] != current[group])
+    for metric, key in drift:
+        click.echo(f"{metric:<28} {key:<40} stored {current[(metric, key)]:>8}  actual {expected[(metric, key)]:>8}")
+    click.echo(f"{len(drift)} counter(s) differ from a full recount.")
+
+    if check:
+        db.session.rollback()
+        if drift:
+            sys.exit(1)
+        return
+
+    rebuild(db.session, expected)
+    db.session.commit()
+    click.echo(f"Rebuilt {len(expected)} counter(s).")
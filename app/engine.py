@@ -0,0 +1,60 @@
+from sqlalchemy import event  # Import event to configure SQLite connections as they open
+from sqlalchemy.engine import make_url  # Import make_url to detect the database backend
+
+# Engine profiles selectable with DB_ENGINE_PROFILE
+ENGINE_PROFILES = ('tuned', 'default')
+
+
+def engine_options(config):
+    """
+    Return the SQLAlchemy engine options of the configured profile.
+
+    'default' leaves SQLAlchemy's defaults untouched. 'tuned' sizes and
+    health-checks the connection pool of server databases; SQLite is tuned
+    per connection instead, by apply_sqlite_pragmas.
+    """
+    profile = config['DB_ENGINE_PROFILE']
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown DB_ENGINE_PROFILE: {profile}")
+
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if profile == 'default' or make_url(config['SQLALCHEMY_DATABASE_URI']).get_backend_name() == 'sqlite':
+        return options
+
+    options.setdefault('pool_size', config['DB_POOL_SIZE'])
+    options.setdefault('max_overflow', config['DB_MAX_OVERFLOW'])
+    options.setdefault('pool_timeout', config['DB_POOL_TIMEOUT'])
+    options.setdefault('pool_recycle', config['DB_POOL_RECYCLE'])  # Drop connections before server-side idle timeouts
+    options.setdefault('pool_pre_ping', True)  # Replace connections that died while idle in the pool
+    return options
+
+
+def apply_sqlite_pragmas(app, engines):
+    """
+    With the 'tuned' profile, configure every new SQLite connection for concurrent use:
+    WAL lets readers run alongside the single writer, synchronous=NORMAL is durable
+    across application crashes in WAL mode, and busy_timeout makes a writer wait for
+    the lock instead of failing with "database is locked".
+    """
+    if app.config['DB_ENGINE_PROFILE'] != 'tuned':
+        return
+
+    pragmas = {
+        'journal_mode': 'WAL',
+        'synchronous': app.config['SQLITE_SYNCHRONOUS'],
+        'busy_timeout': app.config['SQLITE_BUSY_TIMEOUT'],
+        'mmap_size': app.config['SQLITE_MMAP_SIZE'],
+        'cache_size': app.config['SQLITE_CACHE_SIZE'],
+    }
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+    for engine in engines:
+        if engine.dialect.name == 'sqlite':
+            event.listen(engine, 'connect', on_connect)
@@ -0,0 +1,123 @@
+import csv  # Import csv to write CSV rows
+import io  # Import io to buffer a single CSV line at a time
+from datetime import date, datetime  # Import date types to serialize timestamps
+
+from flask import current_app  # Import current_app to encode NDJSON rows with the app's JSON provider
+from sqlalchemy import select  # Import select to build Core queries (no ORM identity map)
+
+from .models import db, Student, Admission, Document  # Importing database models
+
+# Columns exported for each resource; passwords are never exported
+EXPORT_COLUMNS = {
+    'students': [
+        Student.student_id, Student.first_name, Student.last_name, Student.email, Student.dob,
+        Student.phone_number, Student.address, Student.program, Student.admission_status, Student.created_at,
+    ],
+    'admissions': [
+        Admission.admission_id, Admission.student_id, Admission.status, Admission.review_notes,
+        Admission.admitted_date, Admission.created_at,
+    ],
+    'documents': [
+        Document.document_id, Document.student_id, Document.document_type, Document.file_path, Document.upload_date,
+        Document.verification_status, Document.verified_by, Document.verification_notes,
+    ],
+}
+
+# Optional joins for each resource: include name -> (resource to join, ON clause)
+EXPORT_JOINS = {
+    'students': {
+        'admissions': ('admissions', Admission.student_id == Student.student_id),
+        'documents': ('documents', Document.student_id == Student.student_id),
+    },
+    'admissions': {
+        'student': ('students', Student.student_id == Admission.student_id),
+    },
+    'documents': {
+        'student': ('students', Student.student_id == Document.student_id),
+    },
+}
+
+# Model and primary key of each resource; the key gives the export a stable order
+EXPORT_MODELS = {
+    'students': (Student, Student.student_id),
+    'admissions': (Admission, Admission.admission_id),
+    'documents': (Document, Document.document_id),
+}
+
+# Supported output formats and their response mimetypes
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def build_export_query(resource, include=None):
+    """
+    Build a Core SELECT for the resource, optionally LEFT OUTER JOINed with a related table.
+    Returns (statement, column names).
+    """
+    model, order_column = EXPORT_MODELS[resource]
+
+    if include is None:
+        columns = list(EXPORT_COLUMNS[resource])
+        statement = select(*columns)
+        names = [column.key for column in columns]
+    else:
+        # Prefix every column with its table so joined names never collide
+        joined, on_clause = EXPORT_JOINS[resource][include]
+        columns = [column.label(f"{resource}.{column.key}") for column in EXPORT_COLUMNS[resource]]
+        columns += [column.label(f"{joined}.{column.key}") for column in EXPORT_COLUMNS[joined]]
+        statement = select(*columns).select_from(model).outerjoin(EXPORT_MODELS[joined][0], on_clause)
+        names = [column.name for column in columns]
+
+    return statement.order_by(order_column), names
+
+
+def _plain(value):
+    # Convert dates and timestamps to ISO 8601 strings
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def stream_rows(statement, batch_size):
+    """
+    Yield result rows in batches of `batch_size` using a server-side cursor where
+    the driver supports one, so only one batch is held in memory at a time.
+    """
+    result = db.session.execute(statement.execution_options(stream_results=True, yield_per=batch_size))
+    try:
+        for row in result:
+            yield row
+    finally:
+        result.close()
+
+
+def generate_ndjson(rows, names):
+    """
+    Yield one JSON document per line, encoded by the app's compact JSON provider.
+    """
+    dumps = current_app.json.dumps
+    for row in rows:
+        yield dumps(dict(zip(names, row))) + '\n'
+
+
+def generate_csv(rows, names):
+    """
+    Yield a header line followed by one CSV line per row.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        # Hand the buffered line to the response and reset the buffer
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return line
+
+    writer.writerow(names)
+    yield flush()
+    for row in rows:
+        writer.writerow([_plain(value) for value in row])
+        yield flush()
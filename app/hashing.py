@@ -0,0 +1,192 @@
+import multiprocessing  # Import multiprocessing to pick the worker start method
+import threading  # Import threading for the in-flight limit and metric locks
+import time  # Import time to measure queue wait and hash time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout  # Process pool for CPU-bound hashing
+from concurrent.futures.process import BrokenProcessPool  # Raised when a worker process dies
+
+from werkzeug.security import generate_password_hash, check_password_hash  # Secure password hashing
+
+from .metrics import phase  # Attribute hashing time to the current request
+
+
+class HashingCapacityError(RuntimeError):
+    """
+    Raised when the hashing pool is saturated or does not answer in time.
+    Routes turn it into a 503 response with a Retry-After header.
+    """
+
+
+def _hash_in_worker(password, method):
+    # Runs inside a pool process; timestamps let the caller split queue wait from hash time
+    started = time.time()
+    hashed = generate_password_hash(password, method=method)
+    return hashed, started, time.time()
+
+
+def _check_in_worker(hashed, password):
+    # Runs inside a pool process
+    started = time.time()
+    matches = check_password_hash(hashed, password)
+    return matches, started, time.time()
+
+
+class PasswordHasher:
+    """
+    Runs scrypt password hashing in a bounded process pool so CPU-heavy work
+    never blocks the request worker's interpreter. Used for Student and Admin
+    passwords alike.
+
+    At most PASSWORD_HASH_QUEUE_DEPTH passwords may be queued or running at
+    once; beyond that, calls fail immediately with HashingCapacityError instead
+    of piling up behind the pool. Setting PASSWORD_HASH_WORKERS to 0 hashes inline.
+    """
+
+    def __init__(self, app=None):
+        self._executor = None  # Created lazily on first use
+        self._executor_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._reset_metrics()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        # Read the work factor and pool limits from the application configuration
+        self.method = app.config['PASSWORD_HASH_METHOD']
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self.queue_depth = app.config['PASSWORD_HASH_QUEUE_DEPTH']
+        self.timeout = app.config['PASSWORD_HASH_TIMEOUT']
+        self.retry_after = app.config['PASSWORD_HASH_RETRY_AFTER']
+        self._slots = threading.BoundedSemaphore(self.queue_depth)
+        app.extensions['password_hasher'] = self
+
+    def _reset_metrics(self):
+        self._metrics = {
+            "completed": 0,  # Calls that finished
+            "rejected": 0,  # Calls refused because the pool was full
+            "timedOut": 0,  # Calls that did not finish within the timeout
+            "inFlight": 0,  # Passwords currently queued or running
+            "queueWaitSeconds": 0.0,  # Total time spent waiting for a worker
+            "queueWaitMaxSeconds": 0.0,
+            "hashSeconds": 0.0,  # Total time spent hashing inside workers
+            "hashMaxSeconds": 0.0,
+        }
+
+    def _get_executor(self):
+        # Start the pool on first use so importing the app never forks processes
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def _discard_executor(self):
+        # Drop a broken pool so the next call starts a fresh one
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _record(self, submitted, started, finished):
+        with self._metrics_lock:
+            wait = max(started - submitted, 0.0)
+            elapsed = finished - started
+            self._metrics["completed"] += 1
+            self._metrics["queueWaitSeconds"] += wait
+            self._metrics["queueWaitMaxSeconds"] = max(self._metrics["queueWaitMaxSeconds"], wait)
+            self._metrics["hashSeconds"] += elapsed
+            self._metrics["hashMaxSeconds"] = max(self._metrics["hashMaxSeconds"], elapsed)
+
+    def _count(self, name, delta=1):
+        with self._metrics_lock:
+            self._metrics[name] += delta
+
+    def _run(self, function, arguments):
+        """
+        Run `function` once per tuple in `arguments`. Every call holds a pool slot while it is
+        queued or running, and a batch is submitted in chunks of at most one call per worker,
+        so single calls arriving meanwhile queue behind one chunk, not behind the whole batch.
+        """
+        results = []
+        with phase('hashing'):
+            while len(results) < len(arguments):
+                chunk = self._take_slots(min(len(arguments) - len(results), max(self.workers, 1)), bool(results))
+                self._count("inFlight", chunk)
+                try:
+                    results += self._run_in_slots(function, arguments[len(results):len(results) + chunk])
+                finally:
+                    self._count("inFlight", -chunk)
+                    for _ in range(chunk):
+                        self._slots.release()
+        return results
+
+    def _take_slots(self, wanted, waiting):
+        # One slot (a batch already under way waits up to the timeout for it), plus up to `wanted` - 1 free ones
+        if not (self._slots.acquire(timeout=self.timeout) if waiting else self._slots.acquire(blocking=False)):
+            self._count("rejected")
+            raise HashingCapacityError("Password hashing is at capacity, please retry later.")
+        taken = 1
+        while taken < wanted and self._slots.acquire(blocking=False):
+            taken += 1
+        return taken
+
+    def _run_in_slots(self, function, arguments):
+        submitted = time.time()
+        if not self.workers:
+            outcomes = [function(*args) for args in arguments]
+        else:
+            # A chunk has at most one call per worker, so it runs in parallel within the timeout
+            executor = self._get_executor()
+            futures = [executor.submit(function, *args) for args in arguments]
+            deadline = submitted + self.timeout
+            try:
+                outcomes = [future.result(timeout=max(deadline - time.time(), 0)) for future in futures]
+            except FutureTimeout:
+                for future in futures:
+                    future.cancel()
+                self._count("timedOut")
+                raise HashingCapacityError("Password hashing timed out, please retry later.")
+            except BrokenProcessPool:
+                self._discard_executor()
+                raise HashingCapacityError("Password hashing pool restarted, please retry later.")
+
+        results = []
+        for value, started, finished in outcomes:
+            self._record(submitted, started, finished)
+            results.append(value)
+        return results
+
+    def hash(self, password):
+        """
+        Hash one password with the configured method (e.g. 'scrypt:32768:8:1').
+        """
+        return self._run(_hash_in_worker, [(password, self.method)])[0]
+
+    def hash_many(self, passwords):
+        """
+        Hash many passwords in parallel across the pool, preserving order.
+        """
+        if not passwords:
+            return []
+        return self._run(_hash_in_worker, [(password, self.method) for password in passwords])
+
+    def check(self, hashed, password):
+        """
+        Verify a password against a stored hash.
+        """
+        return self._run(_check_in_worker, [(hashed, password)])[0]
+
+    def metrics(self):
+        """
+        Return a snapshot of the pool counters, including average queue wait and hash time.
+        """
+        with self._metrics_lock:
+            snapshot = dict(self._metrics)
+        completed = snapshot["completed"] or 1
+        snapshot["queueWaitAvgSeconds"] = snapshot["queueWaitSeconds"] / completed
+        snapshot["hashAvgSeconds"] = snapshot["hashSeconds"] / completed
+        snapshot["workers"] = self.workers
+        snapshot["queueDepth"] = self.queue_depth
+        snapshot["method"] = self.method
+        return snapshot
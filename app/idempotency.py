@@ -0,0 +1,245 @@
+import hashlib  # Import hashlib to fingerprint requests
+import threading  # Import threading to guard the sweep timestamp
+import time  # Import time to pace the expiry sweeps
+from datetime import datetime, timedelta  # Import datetime to compute expiry times
+from functools import wraps  # Import wraps to build the route decorator
+
+import click  # Import click to define the sweep command
+from flask import current_app, g, jsonify, make_response, request  # Import Flask request/response helpers
+from flask.cli import AppGroup  # Group the commands under `flask idempotency`
+from sqlalchemy import delete, insert, select, update  # Core constructs for atomic claims
+from sqlalchemy.exc import IntegrityError  # Raised when the key is already claimed
+from werkzeug.exceptions import RequestEntityTooLarge  # Raised while parsing an oversized upload
+
+from .models import db, IdempotencyKey  # Importing database models
+
+# Request header carrying the client's key, and the response header marking a replayed response
+KEY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+# Longest key accepted (the column size, less room for the caller's scope prefix)
+MAX_KEY_LENGTH = 200
+
+
+class IdempotencyConflict(Exception):
+    """
+    Raised when a key cannot be used for this request: it belongs to a different
+    request (422) or the original request is still running (409).
+    """
+
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def fingerprint(method, path, content_type, body=b'', parts=()):
+    """
+    Identify a request by its method, path and body. Multipart bodies are identified
+    by their parts, (name, filename, SHA-256 of the value) each, since the boundary
+    changes between retries.
+    """
+    digest = hashlib.sha256(f"{method} {path}\n{content_type or ''}\n".encode())
+    digest.update(body)
+    for name, filename, value_digest in sorted(parts, key=lambda part: (part[0], part[1] or '')):
+        digest.update(f"\n{name}\n{filename or ''}\n{value_digest}".encode())
+    return digest.hexdigest()
+
+
+def request_fingerprint():
+    # Parses a multipart body first: its files are spooled (and hashed) as they are written
+    if request.mimetype == 'multipart/form-data':
+        parts = [(name, None, hashlib.sha256(value.encode()).hexdigest()) for name, value in request.form.items(multi=True)]
+        parts += [(name, file.filename, file.stream.digest) for name, file in request.files.items(multi=True)]
+        return fingerprint(request.method, request.path, request.mimetype, parts=parts)
+    return fingerprint(request.method, request.path, request.mimetype, request.get_data(cache=True))
+
+
+def scoped_key(key, principal, remote_addr):
+    """
+    Stored form of a client's key: keys of different callers never collide, so one
+    caller cannot replay (or block) another's request by reusing its key.
+    """
+    scope = f"{principal.kind}:{principal.id}" if principal is not None else f"ip:{remote_addr}"
+    return f"{scope}:{key}"
+
+
+class IdempotencyStore:
+    """
+    Responses of write requests sent with an Idempotency-Key, kept for IDEMPOTENCY_TTL.
+
+    The first request claims the key with an INSERT committed before the route
+    runs, so a concurrent retry sees the claim and gets 409 instead of doing the
+    work twice. Responses below 500 are stored and replayed to every retry;
+    server errors release the key so the client can try again. A claim whose
+    request died is taken over after IDEMPOTENCY_LOCK_TIMEOUT. Expired keys are
+    deleted at most once per IDEMPOTENCY_SWEEP_INTERVAL by the requests that
+    claim keys, or with `flask idempotency sweep`.
+    """
+
+    def __init__(self, app=None):
+        self._last_sweep = 0.0
+        self._sweep_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = timedelta(seconds=app.config['IDEMPOTENCY_TTL'])
+        self.lock_timeout = timedelta(seconds=app.config['IDEMPOTENCY_LOCK_TIMEOUT'])
+        self.sweep_interval = app.config['IDEMPOTENCY_SWEEP_INTERVAL']
+        app.extensions['idempotency'] = self
+
+    def begin(self, session, key, request_fingerprint):
+        """
+        Claim `key` for a request and commit the claim. Returns None when the caller
+        holds the key and must run the request, or the stored IdempotencyKey row to replay.
+        Raises IdempotencyConflict when the key cannot be used.
+        """
+        now = datetime.now()
+        self._maybe_sweep(session, now)
+
+        for _ in range(2):
+            try:
+                session.execute(insert(IdempotencyKey).values(
+                    key=key, fingerprint=request_fingerprint, locked_at=now, expires_at=now + self.ttl
+                ))
+                session.commit()
+                return None
+            except IntegrityError:
+                session.rollback()
+
+            record = session.execute(select(IdempotencyKey).where(IdempotencyKey.key == key)).scalar_one_or_none()
+            if record is None:
+                continue  # Swept in between: claim it again
+            if record.expires_at <= now:
+                # Expired but not swept yet: the key is free again
+                session.execute(delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key, IdempotencyKey.expires_at == record.expires_at
+                ))
+                session.commit()
+                continue
+            if record.fingerprint != request_fingerprint:
+                raise IdempotencyConflict(422, f"{KEY_HEADER} was already used for a different request.")
+            if record.status_code is not None:
+                session.expunge(record)
+                return record
+            if record.locked_at <= now - self.lock_timeout:
+                # The original request never finished: take over its claim
+                claimed = session.execute(update(IdempotencyKey).where(
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.locked_at == record.locked_at,
+                    IdempotencyKey.status_code.is_(None)
+                ).values(locked_at=now)).rowcount
+                session.commit()
+                if claimed:
+                    return None
+            raise IdempotencyConflict(409, f"A request with this {KEY_HEADER} is still being processed.")
+        raise IdempotencyConflict(409, f"A request with this {KEY_HEADER} is still being processed.")
+
+    def finish(self, session, key, status_code, content_type, body):
+        """
+        Store the response of the request holding `key` (server errors release the key instead).
+        """
+        if status_code >= 500:
+            self.release(session, key)
+            return
+        session.execute(update(IdempotencyKey).where(IdempotencyKey.key == key).values(
+            status_code=status_code, content_type=content_type, response_body=body
+        ))
+        session.commit()
+
+    def release(self, session, key):
+        """
+        Drop the claim of a request that failed, so a retry runs it again.
+        """
+        session.rollback()
+        session.execute(delete(IdempotencyKey).where(
+            IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None)
+        ))
+        session.commit()
+
+    def sweep(self, session, now=None):
+        """
+        Delete expired keys and return how many were deleted.
+        """
+        deleted = session.execute(delete(IdempotencyKey).where(
+            IdempotencyKey.expires_at < (now or datetime.now())
+        )).rowcount
+        session.commit()
+        return deleted
+
+    def _maybe_sweep(self, session, now):
+        with self._sweep_lock:
+            if time.monotonic() - self._last_sweep < self.sweep_interval:
+                return
+            self._last_sweep = time.monotonic()
+        self.sweep(session, now)
+
+
+idempotency = IdempotencyStore()
+
+
+def check_key(key):
+    """
+    Validate an Idempotency-Key header value; raises ValueError when it is unusable.
+    """
+    if not key or len(key) > MAX_KEY_LENGTH or not key.isprintable():
+        raise ValueError(f"{KEY_HEADER} must be 1 to {MAX_KEY_LENGTH} printable characters.")
+    return key
+
+
+def replay(record):
+    """
+    Build the response of a stored request.
+    """
+    response = make_response(record.response_body or b'', record.status_code)
+    if record.content_type:
+        response.content_type = record.content_type
+    response.headers[REPLAYED_HEADER] = 'true'
+    return response
+
+
+def idempotent(view):
+    """
+    Route decorator: requests with an Idempotency-Key header run once per caller,
+    and their retries get the stored response without running the route again.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(KEY_HEADER)
+        if key is None:
+            return view(*args, **kwargs)
+        try:
+            key = scoped_key(check_key(key), g.get('principal'), request.remote_addr)
+            record = idempotency.begin(db.session, key, request_fingerprint())
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except RequestEntityTooLarge as e:
+            return jsonify({"error": e.description}), 413
+        except IdempotencyConflict as e:
+            response = jsonify({"error": str(e)})
+            if e.status_code == 409:
+                response.headers['Retry-After'] = '1'
+            return response, e.status_code
+        if record is not None:
+            return replay(record)
+
+        try:
+            response = current_app.make_response(view(*args, **kwargs))
+        except Exception:
+            idempotency.release(db.session, key)
+            raise
+        if response.is_streamed:
+            idempotency.release(db.session, key)
+        else:
+            idempotency.finish(db.session, key, response.status_code, response.content_type, response.get_data())
+        return response
+    return wrapper
+
+
+idempotency_cli = AppGroup('idempotency', help='Maintain the stored idempotency keys.')
+
+
+@idempotency_cli.command('sweep')
+def sweep_command():
+    """Delete expired idempotency keys."""
+    click.echo(f"Deleted {idempotency.sweep(db.session)} expired key(s).")
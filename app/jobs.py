@@ -0,0 +1,175 @@
+import json  # Import json to store job arguments
+import logging  # Import logging to report job failures
+import multiprocessing  # Import multiprocessing to start several worker processes
+import time  # Import time to pause between polls
+import traceback  # Import traceback to keep the last error of a job
+from datetime import datetime, timedelta  # Import datetime to schedule retries and visibility timeouts
+
+import click  # Import click to define the worker CLI commands
+from flask import current_app  # Import current_app to read the queue settings
+from flask.cli import AppGroup  # Group the job commands under `flask jobs`
+from sqlalchemy import and_, func, or_, select, update  # Import Core constructs for atomic claims
+
+from .models import db, Job  # Importing database models
+
+logger = logging.getLogger(__name__)
+
+# Registered handlers: job kind -> function(payload)
+HANDLERS = {}
+
+
+def job_handler(kind):
+    """
+    Register a function as the handler of a job kind.
+    """
+    def register(function):
+        HANDLERS[kind] = function
+        return function
+    return register
+
+
+def enqueue(kind, payload, delay=0, max_attempts=None, session=None):
+    """
+    Add a job to the current session (or `session`); it becomes visible to workers when the
+    caller commits, so a job is never queued for a write that was rolled back.
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f"No handler registered for job kind '{kind}'.")
+    job = Job(
+        kind=kind,
+        payload=json.dumps(payload),
+        run_at=datetime.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or current_app.config['JOB_MAX_ATTEMPTS']
+    )
+    (session or db.session).add(job)
+    return job
+
+
+def _due(now):
+    # Queued jobs whose time has come, and running jobs whose worker let the visibility timeout lapse
+    return or_(
+        and_(Job.status == 'queued', Job.run_at <= now),
+        and_(Job.status == 'running', Job.locked_until < now),
+    )
+
+
+def claim_next():
+    """
+    Atomically claim the next due job and return it, or None when the queue is empty.
+
+    The claim is a conditional UPDATE on the candidate row: if another worker
+    claimed it first the update matches nothing and the next candidate is tried.
+    """
+    visibility = timedelta(seconds=current_app.config['JOB_VISIBILITY_TIMEOUT'])
+    for _ in range(5):
+        now = datetime.now()
+        job_id = db.session.execute(
+            select(Job.job_id).where(_due(now)).order_by(Job.run_at, Job.job_id).limit(1)
+        ).scalar()
+        if job_id is None:
+            db.session.rollback()
+            return None
+
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.job_id == job_id, _due(now))
+            .values(status='running', locked_until=now + visibility, attempts=Job.attempts + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return db.session.get(Job, job_id, populate_existing=True)
+    return None
+
+
+def _finish(job, **values):
+    # Record the outcome only if this worker still owns the claim (same attempt, still running)
+    db.session.execute(
+        update(Job)
+        .where(Job.job_id == job.job_id, Job.status == 'running', Job.attempts == job.attempts)
+        .values(locked_until=None, **values)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+
+def run_job(job):
+    """
+    Run a claimed job, then mark it done, schedule a retry with exponential backoff, or fail it.
+    """
+    if job.attempts > job.max_attempts:
+        # A worker died while holding the job on its last attempt
+        _finish(job, status='failed', last_error=job.last_error or 'Worker stopped during the last attempt.')
+        return False
+
+    try:
+        HANDLERS[job.kind](json.loads(job.payload))
+    except Exception:
+        db.session.rollback()
+        error = traceback.format_exc(limit=5)
+        logger.warning("Job %s (%s) attempt %s failed", job.job_id, job.kind, job.attempts)
+        if job.attempts >= job.max_attempts:
+            _finish(job, status='failed', last_error=error)
+        else:
+            delay = current_app.config['JOB_RETRY_DELAY'] * 2 ** (job.attempts - 1)
+            _finish(job, status='queued', last_error=error, run_at=datetime.now() + timedelta(seconds=delay))
+        return False
+
+    _finish(job, status='done', last_error=None)
+    return True
+
+
+def work(once=False):
+    """
+    Process jobs until stopped (or until the queue is empty when `once` is set).
+    """
+    poll_interval = current_app.config['JOB_POLL_INTERVAL']
+    while True:
+        job = claim_next()
+        if job is None:
+            if once:
+                return
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+        db.session.remove()
+
+
+def _worker_process(once):
+    # Entry point of a spawned worker: build its own app and database connections
+    from . import create_app
+    app = create_app()
+    with app.app_context():
+        work(once)
+
+
+jobs_cli = AppGroup('jobs', help='Run and inspect the background job queue.')
+
+
+@jobs_cli.command('work')
+@click.option('--processes', default=1, show_default=True, help='Number of worker processes.')
+@click.option('--once', is_flag=True, help='Exit when no job is due instead of polling.')
+def work_command(processes, once):
+    """Run job workers."""
+    from . import cache  # Imported here: the cache is only needed to warn about stale entries
+    if not cache.reaches_all_processes:
+        click.echo("Warning: CACHE_BACKEND 'lru' without CACHE_INVALIDATION_URL: the web processes keep serving "
+                   "records changed by jobs until CACHE_TTL expires.", err=True)
+    if processes == 1:
+        work(once)
+        return
+
+    context = multiprocessing.get_context('spawn')
+    workers = [context.Process(target=_worker_process, args=(once,)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+@jobs_cli.command('status')
+def status_command():
+    """Show the number of jobs per status."""
+    counts = db.session.execute(select(Job.status, func.count()).group_by(Job.status)).all()
+    for status, count in counts:
+        click.echo(f"{status:<10} {count}")
@@ -0,0 +1,66 @@
+import dataclasses  # Import dataclasses to encode dataclass instances
+import decimal  # Import decimal to encode Decimal values
+import json  # Import json as the fallback encoder
+import uuid  # Import uuid to encode UUID values
+from datetime import date  # Import date to encode dates and timestamps
+
+from .metrics import InstrumentedJSONProvider, phase  # Serialization timing shared with the default provider
+
+
+def _default(value):
+    # Types the encoders do not handle themselves; dates are ISO 8601 like the serializers' output
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class CompactJSONProvider(InstrumentedJSONProvider):
+    """
+    JSON provider writing compact UTF-8 output: no whitespace or key sorting, even
+    in debug mode, and dates and timestamps as ISO 8601 strings. Uses orjson when
+    it is installed, the standard library otherwise. Encoding time is still
+    recorded as the 'serialization' phase.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        try:
+            import orjson  # Optional dependency, a faster encoder
+        except ImportError:
+            orjson = None
+        self._orjson = orjson
+
+    def encode(self, obj):
+        """
+        Serialize `obj` to compact JSON bytes.
+        """
+        if self._orjson is not None:
+            return self._orjson.dumps(obj, default=_default, option=self._orjson.OPT_NON_STR_KEYS)
+        return json.dumps(obj, default=_default, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Explicit json.dumps options (indent, sort_keys, ...) keep the standard encoder
+            kwargs.setdefault('default', _default)
+            with phase('serialization'):
+                return json.dumps(obj, **kwargs)
+        with phase('serialization'):
+            return self.encode(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if self._orjson is not None and not kwargs:
+            return self._orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        # Encode straight to bytes, skipping the str round trip of dumps()
+        obj = self._prepare_response_obj(args, kwargs)
+        with phase('serialization'):
+            body = self.encode(obj) + b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
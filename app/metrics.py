@@ -0,0 +1,260 @@
+import bisect  # Import bisect to find histogram buckets
+import logging  # Import logging for the slow-request log
+import threading  # Import threading to guard the shared registry
+import time  # Import time to measure durations
+from contextlib import contextmanager  # Import contextmanager to build the phase timer
+
+from flask import g, has_request_context, request  # Import request state helpers
+from flask.json.provider import DefaultJSONProvider  # Flask's JSON provider, timed as the serialization phase
+from sqlalchemy import event  # Import event to time SQL statements
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket bounds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Histogram:
+    """
+    Cumulative Prometheus histogram with one series per label tuple.
+    """
+
+    def __init__(self, name, help, labels, buckets):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}  # labels -> [count per bucket..., count above the last bucket, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for labels, values in sorted(series.items()):
+            label_text = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {values[-1]}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {values[-2]}")
+            lines.append(f"{self.name}_count{{{label_text}}} {values[-1]}")
+        return lines
+
+
+class Counter:
+    """
+    Prometheus counter with one series per label tuple.
+    """
+
+    def __init__(self, name, help, labels):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, value=1):
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0) + value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            series = dict(self._series)
+        for labels, value in sorted(series.items()):
+            label_text = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, labels))
+            lines.append(f"{self.name}{{{label_text}}} {value}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+@contextmanager
+def phase(name):
+    """
+    Attribute the time spent in the block to a named phase of the current request
+    (e.g. 'hashing', 'file_io'). Does nothing outside a request.
+    """
+    state = g.get('request_metrics') if has_request_context() else None
+    if state is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        state.phases[name] = state.phases.get(name, 0) + time.perf_counter() - started
+
+
+class InstrumentedJSONProvider(DefaultJSONProvider):
+    """
+    Default JSON provider whose encoding time is recorded as the 'serialization' phase.
+    """
+
+    def dumps(self, obj, **kwargs):
+        with phase('serialization'):
+            return super().dumps(obj, **kwargs)
+
+
+class _RequestState:
+    # Measurements of one request, kept on flask.g
+    __slots__ = ('method', 'path', 'started', 'statements', 'sql_seconds', 'phases', 'queries', 'responded',
+                 '_statement_started')
+
+    def __init__(self, method, path):
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.sql_seconds = 0.0
+        self.phases = {}
+        self.queries = []  # (seconds, SQL) pairs, only collected for the slow-request log
+        self.responded = False  # Set once after_request has seen the response
+        self._statement_started = None
+
+
+class RequestMetrics:
+    """
+    Per-endpoint request instrumentation exposed in the Prometheus text format.
+
+    Every request records its latency, response size, number of SQL statements
+    and time spent in SQL, plus named phases (hashing, serialization, file I/O).
+    Metrics are kept per process: scrape each worker, or run one worker per
+    metrics target. With SLOW_REQUEST_THRESHOLD set, requests slower than it are
+    logged with their phase breakdown and the slowest SQL statements.
+    """
+
+    def __init__(self, app=None):
+        self.request_seconds = Histogram(
+            'ors_request_duration_seconds', 'Request latency in seconds.',
+            ('endpoint', 'method', 'status'), LATENCY_BUCKETS
+        )
+        self.response_bytes = Histogram(
+            'ors_response_size_bytes', 'Response body size in bytes.', ('endpoint',), BYTES_BUCKETS
+        )
+        self.sql_statements = Histogram(
+            'ors_request_sql_statements', 'SQL statements executed per request.', ('endpoint',), STATEMENT_BUCKETS
+        )
+        self.sql_seconds = Histogram(
+            'ors_request_sql_duration_seconds', 'Time spent executing SQL per request.', ('endpoint',), LATENCY_BUCKETS
+        )
+        self.phase_seconds = Counter(
+            'ors_request_phase_seconds_total', 'Time spent per request phase.', ('endpoint', 'phase')
+        )
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.slow_threshold = app.config['SLOW_REQUEST_THRESHOLD']
+        self.slow_statements = app.config['SLOW_REQUEST_MAX_STATEMENTS']
+        app.json = InstrumentedJSONProvider(app)
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._teardown)
+        app.extensions['metrics'] = self
+
+    def instrument(self, engines):
+        """
+        Time every SQL statement run by the given engines.
+        """
+        for engine in engines:
+            event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def _before_cursor_execute(self, connection, cursor, statement, parameters, context, executemany):
+        state = g.get('request_metrics') if has_request_context() else None
+        if state is not None:
+            state._statement_started = time.perf_counter()
+
+    def _after_cursor_execute(self, connection, cursor, statement, parameters, context, executemany):
+        state = g.get('request_metrics') if has_request_context() else None
+        if state is None or state._statement_started is None:
+            return
+        elapsed = time.perf_counter() - state._statement_started
+        state._statement_started = None
+        state.statements += 1
+        state.sql_seconds += elapsed
+        if self.slow_threshold:
+            state.queries.append((elapsed, statement))
+
+    def _start(self):
+        g.request_metrics = _RequestState(request.method, request.full_path.rstrip('?'))
+
+    def _finish(self, response):
+        state = g.get('request_metrics')
+        if state is None:
+            return response
+
+        state.responded = True
+        endpoint = request.endpoint or 'unmatched'
+        if response.content_length is None and response.is_streamed:
+            # Generated bodies (exports) are measured, SQL included, once the last chunk is sent.
+            # File downloads know their length and keep their file wrapper untouched.
+            response.response = self._count_streamed(response.response, state, endpoint, response.status_code)
+        else:
+            self._record(state, endpoint, response.status_code, response.content_length or 0)
+        return response
+
+    def _teardown(self, exception):
+        # after_request is skipped when an exception escapes the request (PROPAGATE_EXCEPTIONS, or a failing
+        # after_request hook): count it as a 500 so the error rate includes it
+        state = g.get('request_metrics')
+        if state is not None and not state.responded:
+            state.responded = True
+            self._record(state, request.endpoint or 'unmatched', 500, 0)
+
+    def _count_streamed(self, chunks, state, endpoint, status):
+        size = 0
+        try:
+            for chunk in chunks:
+                size += len(chunk)
+                yield chunk
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+            self._record(state, endpoint, status, size)
+
+    def _record(self, state, endpoint, status, size):
+        elapsed = time.perf_counter() - state.started
+        self.request_seconds.observe((endpoint, state.method, str(status)), elapsed)
+        self.response_bytes.observe((endpoint,), size)
+        self.sql_statements.observe((endpoint,), state.statements)
+        self.sql_seconds.observe((endpoint,), state.sql_seconds)
+        self.phase_seconds.inc((endpoint, 'sql'), state.sql_seconds)
+        for name, seconds in state.phases.items():
+            self.phase_seconds.inc((endpoint, name), seconds)
+
+        if self.slow_threshold and elapsed >= self.slow_threshold:
+            slowest = sorted(state.queries, key=lambda query: query[0], reverse=True)[:self.slow_statements]
+            logger.warning(
+                "Slow request %s %s (%s): %.3fs, %d SQL statements in %.3fs, phases %s%s",
+                state.method, state.path, endpoint, elapsed, state.statements,
+                state.sql_seconds, {name: round(seconds, 4) for name, seconds in state.phases.items()},
+                ''.join(f"\n  {seconds * 1000:8.1f} ms  {' '.join(sql.split())}" for seconds, sql in slowest)
+            )
+
+    def render(self):
+        """
+        Return all metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        for metric in (self.request_seconds, self.response_bytes, self.sql_statements,
+                       self.sql_seconds, self.phase_seconds):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
@@ -4,6 +4,10 @@ from datetime import datetime  # Import datetime to handle timestamps
 # Student model representing the 'students' table in the database
 class Student(db.Model):
     __tablename__ = 'students'  # Table name in the database
+    __table_args__ = (
+        db.Index('ix_students_program_admission_status', 'program', 'admission_status'),  # Listing filtered on both
+        db.Index('ix_students_created_at_student_id', 'created_at', 'student_id'),  # Keyset listing by creation time
+    )
 
     # Defining the columns for the 'students' table
     student_id = db.Column(db.Integer, primary_key=True)  # Primary key
@@ -14,9 +18,10 @@ class Student(db.Model):
     dob = db.Column(db.Date, nullable=False)  # Date of birth
     phone_number = db.Column(db.String(20), nullable=False)  # Contact number
     address = db.Column(db.String(250), nullable=True)  # Address (optional)
-    program = db.Column(db.String(100), nullable=False)  # Program the student is enrolling in
-    admission_status = db.Column(db.String(50), default="Submitted")  # Status of admission application
-    created_at = db.Column(db.DateTime, default=datetime.now())  # Timestamp of when the record was created
+    program = db.Column(db.String(100), nullable=False)  # Program the student is enrolling in (filters use the composite index)
+    admission_status = db.Column(db.String(50), default="Submitted", index=True)  # Status of admission application
+    created_at = db.Column(db.DateTime, default=datetime.now)  # Timestamp of when the record was created
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)  # Timestamp of the last change (record version)
 
     # Relationships
     admissions = db.relationship('Admission', backref='student', lazy=True)  # One-to-many relationship with Admission
@@ -29,7 +34,6 @@ class Student(db.Model):
             "firstName": self.first_name,
             "lastName": self.last_name,
             "email": self.email,
-            "password": self.password,  # Normally, password wouldn't be exposed like this.
             "dob": self.dob,
             "phoneNumber": self.phone_number,
             "address": self.address,
@@ -45,11 +49,12 @@ class Admission(db.Model):
 
     # Defining the columns for the 'admissions' table
     admission_id = db.Column(db.Integer, primary_key=True)  # Primary key
-    student_id = db.Column(db.Integer, db.ForeignKey('students.student_id'), nullable=False)  # Foreign key linking to student
+    student_id = db.Column(db.Integer, db.ForeignKey('students.student_id'), nullable=False, index=True)  # Foreign key linking to student
     status = db.Column(db.String(50), nullable=False, default='Submitted')  # Status of admission (e.g., Submitted, Approved)
     review_notes = db.Column(db.Text, nullable=True)  # Optional notes for review process
     admitted_date = db.Column(db.DateTime)  # Date of admission
-    created_at = db.Column(db.DateTime, default=datetime.now())  # Timestamp of when the record was created
+    created_at = db.Column(db.DateTime, default=datetime.now)  # Timestamp of when the record was created
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)  # Timestamp of the last change (record version)
 
     # Method to convert the object into JSON format
     def to_json(self):
@@ -65,16 +70,20 @@ class Admission(db.Model):
 # Document model representing the 'documents' table in the database
 class Document(db.Model):
     __tablename__ = 'documents'  # Table name in the database
+    __table_args__ = (
+        db.Index('ix_documents_student_id_document_id', 'student_id', 'document_id'),  # Per-student document lookups
+    )
 
     # Defining the columns for the 'documents' table
     document_id = db.Column(db.Integer, primary_key=True)  # Primary key
     student_id = db.Column(db.Integer, db.ForeignKey('students.student_id'), nullable=False)  # Foreign key linking to student
     document_type = db.Column(db.String(100), nullable=False)  # Type of document (e.g., ID, transcript)
     file_path = db.Column(db.String(200), nullable=False)  # File path to where the document is stored
-    upload_date = db.Column(db.DateTime, default=datetime.now())  # Date when the document was uploaded
+    upload_date = db.Column(db.DateTime, default=datetime.now)  # Date when the document was uploaded
     verification_status = db.Column(db.String(50), default="Pending")  # Status of document verification (Pending, Verified)
-    verified_by = db.Column(db.Integer, db.ForeignKey('admins.admin_id'), nullable=True)  # Admin who verified the document
+    verified_by = db.Column(db.Integer, db.ForeignKey('admins.admin_id'), nullable=True, index=True)  # Admin who verified the document
     verification_notes = db.Column(db.Text, nullable=True)  # Optional notes related to verification
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)  # Timestamp of the last change (record version)
 
     # Method to convert the object into JSON format
     def to_json(self):
@@ -101,7 +110,7 @@ class Admin(db.Model):
     email = db.Column(db.String(150), unique=True, nullable=False)  # Email (must be unique)
     password = db.Column(db.String(200), nullable=False)  # Hashed password for security
     role = db.Column(db.String(50), default="Admin")  # Role of the admin (default: Admin)
-    created_at = db.Column(db.DateTime, default=datetime.now())  # Timestamp of when the record was created
+    created_at = db.Column(db.DateTime, default=datetime.now)  # Timestamp of when the record was created
 
     # Method to convert the object into JSON format
     def to_json(self):
@@ -110,6 +119,81 @@ class Admin(db.Model):
             "firstName": self.first_name,
             "lastName": self.last_name,
             "email": self.email,
-            "password": self.password,
             "role": self.role
         }
+
+
+# Job model representing the 'jobs' table, the database-backed background job queue
+class Job(db.Model):
+    __tablename__ = 'jobs'  # Table name in the database
+    __table_args__ = (
+        db.Index('ix_jobs_status_run_at', 'status', 'run_at'),  # Workers look for due jobs by status
+    )
+
+    # Defining the columns for the 'jobs' table
+    job_id = db.Column(db.Integer, primary_key=True)  # Primary key
+    kind = db.Column(db.String(100), nullable=False)  # Name of the registered handler that runs the job
+    payload = db.Column(db.Text, nullable=False, default='{}')  # JSON arguments passed to the handler
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done or failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)  # Number of times the job was claimed
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)  # Attempts allowed before the job fails
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.now)  # Earliest time the job may run
+    locked_until = db.Column(db.DateTime, nullable=True)  # End of the running worker's visibility timeout
+    last_error = db.Column(db.Text, nullable=True)  # Error raised by the last failed attempt
+    created_at = db.Column(db.DateTime, default=datetime.now)  # Timestamp of when the job was enqueued
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)  # Timestamp of the last change
+
+    # Method to convert the object into JSON format
+    def to_json(self):
+        return {
+            "jobId": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "attempts": self.attempts,
+            "maxAttempts": self.max_attempts,
+            "runAt": self.run_at.isoformat() if self.run_at else None,
+            "lastError": self.last_error,
+        }
+
+
+# StatCounter model representing the 'stat_counters' table, dashboard aggregates maintained on every write
+class StatCounter(db.Model):
+    __tablename__ = 'stat_counters'  # Table name in the database
+
+    # Defining the columns for the 'stat_counters' table
+    metric = db.Column(db.String(50), primary_key=True)  # Aggregate name, e.g. 'documents_by_status'
+    key = db.Column(db.String(200), primary_key=True)  # Group within the aggregate, e.g. 'Pending'
+    value = db.Column(db.Integer, nullable=False, default=0)  # Current count of the group
+
+
+# StoredBlob model representing the 'stored_blobs' table, the number of documents referencing each stored blob
+class StoredBlob(db.Model):
+    __tablename__ = 'stored_blobs'  # Table name in the database
+
+    # Defining the columns for the 'stored_blobs' table
+    digest = db.Column(db.String(64), primary_key=True)  # SHA-256 naming the blob under UPLOAD_FOLDER
+    ref_count = db.Column(db.Integer, nullable=False, default=0)  # Documents whose file_path references the blob
+
+
+# IdempotencyKey model representing the 'idempotency_keys' table, responses stored for retried write requests
+class IdempotencyKey(db.Model):
+    __tablename__ = 'idempotency_keys'  # Table name in the database
+
+    # Defining the columns for the 'idempotency_keys' table
+    key = db.Column(db.String(255), primary_key=True)  # Caller scope and client-supplied Idempotency-Key header
+    fingerprint = db.Column(db.String(64), nullable=False)  # SHA-256 of the method, path and body of the original request
+    status_code = db.Column(db.Integer, nullable=True)  # Stored response status; NULL while the original request runs
+    content_type = db.Column(db.String(100), nullable=True)  # Stored response content type
+    response_body = db.Column(db.LargeBinary, nullable=True)  # Stored response body
+    locked_at = db.Column(db.DateTime, nullable=False)  # When the request currently holding the key started
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # When the key may be swept and reused
+
+
+# RevokedToken model representing the 'revoked_tokens' table, the blocklist of access tokens revoked before they expire
+class RevokedToken(db.Model):
+    __tablename__ = 'revoked_tokens'  # Table name in the database
+
+    # Defining the columns for the 'revoked_tokens' table
+    jti = db.Column(db.String(36), primary_key=True)  # Unique identifier (jti claim) of the revoked token
+    revoked_at = db.Column(db.DateTime, nullable=False)  # When the token was revoked
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # When the token expires and the entry may be swept
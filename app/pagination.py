@@ -0,0 +1,101 @@
+import base64  # Import base64 to build URL-safe cursor tokens
+import json  # Import json to pack the cursor values into the token
+from datetime import datetime  # Import datetime to restore timestamp cursor values
+
+from sqlalchemy import tuple_  # Import tuple_ to build row-value keyset conditions
+
+
+class InvalidCursor(ValueError):
+    """
+    Raised when a client sends a cursor token that cannot be decoded
+    or that does not belong to the requested sort order.
+    """
+
+
+def encode_cursor(sort, values):
+    """
+    Pack the sort name and the last row's key values into an opaque token.
+    """
+    payload = {"s": sort, "v": [value.isoformat() if isinstance(value, datetime) else value for value in values]}
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, sort):
+    """
+    Unpack a token created by encode_cursor and check that it matches the sort order.
+    """
+    try:
+        # Restore the base64 padding stripped by encode_cursor
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        if payload["s"] != sort:
+            raise InvalidCursor("Cursor does not match the requested sort order.")
+        return payload["v"]
+    except InvalidCursor:
+        raise
+    except Exception:
+        raise InvalidCursor("Invalid cursor.")
+
+
+def parse_limit(value, default, maximum):
+    """
+    Validate the requested page size and clamp it to the configured maximum.
+    """
+    if value is None:
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer.")
+    if limit < 1:
+        raise ValueError("limit must be a positive integer.")
+    return min(limit, maximum)
+
+
+class KeysetPaginator:
+    """
+    Seek-method pagination over a fixed, unique column ordering.
+
+    Each page continues from the key of the last row of the previous page
+    with a WHERE condition instead of an OFFSET, so fetching any page costs
+    the same index range scan as fetching the first one.
+    """
+
+    def __init__(self, columns, converters=None):
+        self.columns = columns  # Ordered key columns; the last one must be unique
+        self.converters = converters or [None] * len(columns)  # Optional functions restoring JSON values
+
+    def after(self, values):
+        """
+        Return the condition selecting rows that sort after the given key values.
+        """
+        if len(self.columns) == 1:
+            return self.columns[0] > values[0]
+        # A row-value comparison lets the database seek directly into a composite index
+        return tuple_(*self.columns) > tuple_(*values)
+
+    def page(self, session, statement, sort, limit, cursor=None):
+        """
+        Execute `statement` for the page following `cursor` and return (rows, next_cursor).
+        The statement must select the key columns.
+        """
+        if cursor:
+            values = decode_cursor(cursor, sort)
+            if len(values) != len(self.columns):
+                raise InvalidCursor("Invalid cursor.")
+            try:
+                values = [convert(value) if convert else value for convert, value in zip(self.converters, values)]
+            except (TypeError, ValueError):
+                raise InvalidCursor("Invalid cursor.")
+            statement = statement.where(self.after(values))
+
+        # Fetch one extra row to know whether another page exists
+        rows = session.execute(statement.order_by(*self.columns).limit(limit + 1)).all()
+        if len(rows) <= limit:
+            return rows, None
+
+        rows = rows[:limit]
+        last = rows[-1]._mapping
+        next_cursor = encode_cursor(sort, [last[column] for column in self.columns])
+        return rows, next_cursor
@@ -0,0 +1,261 @@
+import multiprocessing  # Import multiprocessing to pick the worker start method
+import os  # Import os to manage the preview cache directory
+import shutil  # Import shutil to locate the poppler command-line tools
+import subprocess  # Import subprocess to render PDF pages with pdftoppm
+import tempfile  # Import tempfile to write previews atomically
+import threading  # Import threading to share in-flight renders between requests
+import time  # Import time to pace the cache eviction walks
+from concurrent.futures import Future, ProcessPoolExecutor  # Process pool for CPU-bound image work
+from concurrent.futures.process import BrokenProcessPool  # Raised when a worker process dies
+
+from flask import current_app  # Import current_app to reach document storage
+
+# Document extensions that can be previewed
+PREVIEWABLE_EXTENSIONS = {'jpg', 'png', 'pdf'}
+
+
+class PreviewUnavailable(Exception):
+    """
+    Raised when a preview cannot be produced for a document (unsupported
+    format or unreadable file).
+    """
+
+
+class PreviewDependencyMissing(PreviewUnavailable):
+    """
+    Raised when the optional imaging dependencies needed for a preview are not installed.
+    """
+
+
+def _render_preview(source, extension, size, target):
+    # Runs inside a pool process: write a JPEG no larger than size x size to `target`
+    try:
+        from PIL import Image  # Optional dependency, only needed for previews
+    except ImportError:
+        raise PreviewDependencyMissing("Previews require the 'Pillow' package (pip install Pillow).")
+
+    page = None
+    try:
+        if extension == 'pdf':
+            page = source = _render_first_pdf_page(source, size, os.path.dirname(target))
+        with Image.open(source) as image:
+            image.draft('RGB', (size, size))  # Let JPEG decoding downscale while reading
+            image.thumbnail((size, size))
+            image.convert('RGB').save(target, 'JPEG', quality=80, optimize=True)
+    except Image.DecompressionBombError:
+        raise PreviewUnavailable("The document image is too large to preview.")
+    except OSError as e:
+        raise PreviewUnavailable(f"Could not read the document image: {e}")
+    finally:
+        if page is not None and os.path.exists(page):
+            os.unlink(page)
+
+
+def _render_first_pdf_page(source, size, directory):
+    # Rasterize page 1 with PyMuPDF when installed, otherwise with poppler's pdftoppm; returns the PNG path
+    handle, output = tempfile.mkstemp(dir=directory, suffix='.png')
+    os.close(handle)
+    try:
+        try:
+            import fitz  # Optional dependency (PyMuPDF)
+        except ImportError:
+            fitz = None
+
+        if fitz is not None:
+            with fitz.open(source) as pdf:
+                page = pdf[0]
+                zoom = size / max(page.rect.width, page.rect.height)
+                page.get_pixmap(matrix=fitz.Matrix(zoom, zoom)).save(output)
+            return output
+
+        if shutil.which('pdftoppm') is None:
+            raise PreviewDependencyMissing("PDF previews require PyMuPDF or poppler's pdftoppm.")
+        prefix = output[:-len('.png')]
+        subprocess.run(
+            ['pdftoppm', '-f', '1', '-l', '1', '-singlefile', '-png', '-scale-to', str(size), source, prefix],
+            check=True, capture_output=True, timeout=60
+        )
+        return output
+    except PreviewUnavailable:
+        os.unlink(output)
+        raise
+    except Exception as e:
+        # Corrupt, encrypted or fake PDFs: pdftoppm exits non-zero (or hangs), PyMuPDF raises its own errors
+        os.unlink(output)
+        raise PreviewUnavailable(f"Could not render the PDF: {e}")
+
+
+class PreviewService:
+    """
+    Generates document thumbnails and first-page previews in a process pool.
+
+    Previews are rendered lazily on first request and kept on disk under
+    PREVIEW_CACHE_FOLDER, keyed by document content and size. Every hit
+    refreshes the file's mtime, and when the cache grows past
+    PREVIEW_CACHE_BUDGET bytes the least recently used previews are removed (the
+    cache is measured at most once per PREVIEW_EVICT_INTERVAL seconds).
+    With PREVIEW_WORKERS set to 0 previews are rendered in the calling process.
+    """
+
+    def __init__(self, app=None):
+        self._executor = None  # Created lazily on first use
+        self._lock = threading.Lock()
+        self._in_flight = {}  # preview path -> Future, so concurrent requests share one render
+        self._last_evict = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.root = os.path.abspath(app.config['PREVIEW_CACHE_FOLDER'])
+        self.budget = app.config['PREVIEW_CACHE_BUDGET']
+        self.sizes = app.config['PREVIEW_SIZES']
+        self.workers = app.config['PREVIEW_WORKERS']
+        self.timeout = app.config['PREVIEW_TIMEOUT']
+        self.prewarm = app.config['PREVIEW_PREWARM']
+        self.evict_interval = app.config['PREVIEW_EVICT_INTERVAL']
+        app.extensions['previews'] = self
+
+    def _submit(self, *args):
+        if not self.workers:
+            future = Future()
+            try:
+                future.set_result(_render_preview(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        executor = self._get_executor()
+        try:
+            render = executor.submit(_render_preview, *args)
+        except BrokenProcessPool:
+            # A worker died since the last render: start a fresh pool and try once more
+            self._discard_executor(executor)
+            executor = self._get_executor()
+            render = executor.submit(_render_preview, *args)
+        render.add_done_callback(lambda render: self._check_pool(render, executor))
+        return render
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def _discard_executor(self, executor):
+        # Drop a broken pool so the next render starts a fresh one (unless another request already did)
+        with self._lock:
+            if self._executor is executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _check_pool(self, render, executor):
+        # A worker that died mid-render breaks the whole pool: replace it rather than failing every later render
+        if not render.cancelled() and isinstance(render.exception(), BrokenProcessPool):
+            self._discard_executor(executor)
+
+    def path_for(self, key, size):
+        return os.path.join(self.root, key[:2], f"{key}-{size}.jpg")
+
+    def get(self, document, size):
+        """
+        Return the path of the cached preview of a Document, rendering it first if needed.
+        Raises FileNotFoundError when the document file is missing.
+        """
+        extension = document.file_path.rsplit('.', 1)[-1].lower()
+        if extension not in PREVIEWABLE_EXTENSIONS:
+            raise PreviewUnavailable(f"Previews are not available for .{extension} files.")
+
+        # Stored blobs are keyed by content, so identical uploads share their previews
+        storage = current_app.extensions['storage']
+        key = storage.digest_of(document.file_path) or f"document-{document.document_id}"
+        source = storage.path_for(document.file_path)
+        if not os.path.exists(source):
+            raise FileNotFoundError(source)
+
+        target = self.path_for(key, size)
+        try:
+            os.utime(target)  # Cache hit: mark it as recently used
+            return target
+        except FileNotFoundError:
+            pass
+
+        with self._lock:
+            published = self._in_flight.get(target)
+            owner = published is None
+            if owner:
+                published = self._in_flight[target] = Future()
+
+        if owner:
+            # First request for this preview: render it; concurrent requests wait for the same result
+            try:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                handle, partial = tempfile.mkstemp(dir=os.path.dirname(target), suffix='.part')
+                os.close(handle)
+                render = self._submit(source, extension, size, partial)
+            except Exception as e:
+                with self._lock:
+                    self._in_flight.pop(target, None)
+                published.set_exception(e)
+                raise
+            render.add_done_callback(lambda render: self._publish(render, partial, target, published))
+
+        # A timeout only stops waiting: the render still completes and lands in the cache
+        published.result(timeout=self.timeout)
+        return target
+
+    def _publish(self, render, partial, target, published):
+        # Move a finished render into the cache before releasing the requests waiting for it
+        try:
+            render.result()
+            os.replace(partial, target)
+        except Exception as e:
+            if os.path.exists(partial):
+                os.unlink(partial)
+            published.set_exception(e)
+        else:
+            published.set_result(target)
+            self._maybe_evict(keep=target)
+        finally:
+            with self._lock:
+                self._in_flight.pop(target, None)
+
+    def _maybe_evict(self, keep):
+        # Walking the cache costs a stat per preview, so renders trigger it at most once per interval
+        with self._lock:
+            now = time.monotonic()
+            if self._last_evict is not None and now - self._last_evict < self.evict_interval:
+                return
+            self._last_evict = now
+        self._evict(keep)
+
+    def _evict(self, keep):
+        # Remove least recently used previews (never `keep`, which is about to be served)
+        # until the cache fits in 90% of its budget
+        entries = []
+        total = 0
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if name.endswith('.jpg'):
+                    path = os.path.join(directory, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue  # Evicted concurrently
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+        if total <= self.budget:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.budget * 0.9:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+                total -= size
+            except FileNotFoundError:
+                pass
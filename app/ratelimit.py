@@ -0,0 +1,241 @@
+import math  # Import math to round Retry-After up to whole seconds
+import threading  # Import threading for the per-shard and per-class locks
+import time  # Import time to refill the token buckets
+from functools import wraps  # Import wraps to build the route decorator
+
+from flask import current_app, g, jsonify, request  # Import Flask request/response helpers
+
+
+class Throttled(Exception):
+    """
+    Raised when a request is not admitted: the client is over its rate (429) or
+    the route class is at its concurrency cap (503). Routes turn it into a
+    response with a Retry-After header.
+    """
+
+    def __init__(self, status_code, retry_after, message):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class TokenBuckets:
+    """
+    One token bucket per client key, refilled at `rate` tokens per second up to
+    `burst` tokens.
+
+    Buckets are spread over `shards` dicts, each with its own lock held only for
+    the few arithmetic operations of one update, so concurrent requests from
+    different clients rarely wait on each other. A shard holding more than its
+    share of `max_keys` drops its full (idle) buckets, which is the same as
+    forgetting a client that has not been seen for burst / rate seconds.
+    """
+
+    def __init__(self, rate, burst, shards, max_keys):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys_per_shard = max(1, max_keys // shards)
+        self._shards = [({}, threading.Lock()) for _ in range(shards)]
+
+    def take(self, key, cost, now=None):
+        """
+        Take `cost` tokens from the bucket of `key`. Returns 0 when they were taken,
+        otherwise the seconds until the bucket holds enough tokens.
+        """
+        now = time.monotonic() if now is None else now
+        buckets, lock = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            tokens, updated = buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            allowed = tokens >= cost
+            buckets[key] = (tokens - cost if allowed else tokens, now)
+            if len(buckets) > self.max_keys_per_shard:
+                self._prune(buckets, now)
+        return 0.0 if allowed else (cost - tokens) / self.rate
+
+    def refund(self, key, cost):
+        """
+        Give back tokens taken for a request that was not admitted after all.
+        """
+        buckets, lock = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            if key in buckets:
+                tokens, updated = buckets[key]
+                buckets[key] = (min(self.burst, tokens + cost), updated)
+
+    def size(self):
+        return sum(len(buckets) for buckets, _ in self._shards)
+
+    def _prune(self, buckets, now):
+        # Drop the buckets that have refilled completely, then the least recently updated ones
+        full_after = self.burst / self.rate
+        for key in [key for key, (_, updated) in buckets.items() if now - updated >= full_after]:
+            del buckets[key]
+        if len(buckets) > self.max_keys_per_shard:
+            oldest = sorted(buckets, key=lambda key: buckets[key][1])
+            for key in oldest[:len(buckets) - self.max_keys_per_shard]:
+                del buckets[key]
+
+
+class ConcurrencySlots:
+    """
+    Non-blocking concurrency cap of one route class (a limit of 0 means no cap),
+    with admission counters.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self.admitted = 0
+        self.rate_limited = 0
+        self.shed = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        with self._lock:
+            if self.limit and self.in_flight >= self.limit:
+                self.shed += 1
+                return False
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+
+    def count_rate_limited(self):
+        with self._lock:
+            self.rate_limited += 1
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def stats(self):
+        return {"limit": self.limit or None, "inFlight": self.in_flight, "admitted": self.admitted,
+                "rateLimited": self.rate_limited, "shed": self.shed}
+
+
+class AdmissionControl:
+    """
+    Rate limiting and concurrency caps for the expensive routes.
+
+    Every request of a route class costs RATE_LIMIT_COSTS[class] tokens (password
+    hashing and uploads cost more than the default) from the bucket of its client
+    IP and, when it is authenticated, from the bucket of its token identity; a
+    client out of tokens gets 429. Each class also has a cap on requests in
+    progress (ROUTE_CONCURRENCY_LIMITS) beyond which requests are shed with 503
+    rather than queued. Limits are per process.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config['ADMISSION_CONTROL_ENABLED']
+        self.costs = app.config['RATE_LIMIT_COSTS']
+        self.retry_after = app.config['ROUTE_CONCURRENCY_RETRY_AFTER']
+        burst = app.config['RATE_LIMIT_BURST']
+        too_expensive = [name for name, cost in self.costs.items() if cost > burst]
+        if too_expensive:
+            raise ValueError(f"RATE_LIMIT_COSTS above RATE_LIMIT_BURST ({burst}) can never be admitted: {too_expensive}")
+        self.buckets = TokenBuckets(
+            app.config['RATE_LIMIT_RATE'], burst, app.config['RATE_LIMIT_SHARDS'], app.config['RATE_LIMIT_MAX_CLIENTS']
+        )
+        self.slots = {name: ConcurrencySlots(limit) for name, limit in app.config['ROUTE_CONCURRENCY_LIMITS'].items()}
+        app.extensions['admission_control'] = self
+
+    def admit(self, route_class, client_keys):
+        """
+        Admit a request of `route_class` from the client identified by `client_keys`.
+        Returns the function to call once the request is done; raises Throttled.
+        """
+        if not self.enabled:
+            return _noop
+        slots = self.slots.get(route_class)
+        if slots is None:
+            slots = self.slots.setdefault(route_class, ConcurrencySlots(0))  # A class without a cap
+        cost = self.costs.get(route_class, self.costs.get('default', 1))
+
+        taken = []
+        for key in client_keys:
+            wait = self.buckets.take(key, cost)
+            if wait:
+                for taken_key in taken:
+                    self.buckets.refund(taken_key, cost)
+                slots.count_rate_limited()
+                raise Throttled(429, math.ceil(wait), "Too many requests, retry later.")
+            taken.append(key)
+
+        if not slots.try_acquire():
+            for key in taken:
+                self.buckets.refund(key, cost)
+            raise Throttled(503, self.retry_after, "Server is busy, retry later.")
+
+        released = []
+
+        def release():
+            # Safe to call more than once (a streamed response may close twice)
+            if not released:
+                released.append(True)
+                slots.release()
+        return release
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "trackedClients": self.buckets.size(),
+            "routeClasses": {name: slots.stats() for name, slots in sorted(self.slots.items())},
+        }
+
+
+def _noop():
+    pass
+
+
+admission = AdmissionControl()
+
+
+def client_keys(remote_addr, principal=None):
+    """
+    Bucket keys of a client: its IP address, plus its identity when the request is authenticated.
+    """
+    keys = [f"ip:{remote_addr}"]
+    if principal is not None:
+        keys.append(f"sub:{principal.kind}:{principal.id}")
+    return keys
+
+
+def throttled_response(error):
+    # 429/503 response telling the client when to try again
+    response = jsonify({"error": str(error)})
+    response.status_code = error.status_code
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
+def admission_controlled(route_class):
+    """
+    Route decorator applying the rate limit and concurrency cap of `route_class`.
+    Streamed responses hold their concurrency slot until the stream is closed.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not admission.enabled:
+                return view(*args, **kwargs)
+            try:
+                release = admission.admit(route_class, client_keys(request.remote_addr, g.get('principal')))
+            except Throttled as e:
+                return throttled_response(e)
+            try:
+                response = current_app.make_response(view(*args, **kwargs))
+            except Exception:
+                release()
+                raise
+            if response.is_streamed:
+                response.call_on_close(release)
+            else:
+                release()
+            return response
+        return wrapper
+    return decorator
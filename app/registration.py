@@ -0,0 +1,109 @@
+import json  # Import json to decode NDJSON lines
+from datetime import datetime  # Import datetime to parse dates of birth
+
+from sqlalchemy import insert, select  # Import Core constructs for batched inserts and lookups
+
+from .counters import record_students  # Keep the dashboard counters in step with Core inserts
+from .models import db, Student  # Importing database models
+
+# Payload fields required for every student, mapped to their column names
+REQUIRED_STUDENT_FIELDS = {
+    'firstName': 'first_name',
+    'lastName': 'last_name',
+    'email': 'email',
+    'password': 'password',
+    'dob': 'dob',
+    'phoneNumber': 'phone_number',
+    'program': 'program',
+}
+
+
+class BulkPayloadError(ValueError):
+    """
+    Raised when the bulk request body itself cannot be read.
+    """
+
+
+def read_bulk_payload(request, max_rows):
+    """
+    Read student payloads from a JSON array (or {"students": [...]}) or an NDJSON body.
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        payloads = []
+        for number, line in enumerate(request.stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                payloads.append(json.loads(line))
+            except ValueError:
+                raise BulkPayloadError(f"Line {number} is not valid JSON.")
+            if len(payloads) > max_rows:
+                raise BulkPayloadError(f"At most {max_rows} students can be registered per request.")
+        return payloads
+
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('students')
+    if not isinstance(data, list):
+        raise BulkPayloadError("Expected a JSON array of students or an NDJSON body.")
+    if len(data) > max_rows:
+        raise BulkPayloadError(f"At most {max_rows} students can be registered per request.")
+    return data
+
+
+def validate_student_payload(data):
+    """
+    Check one student payload and return the column values to insert (password still in clear).
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Student must be a JSON object.")
+
+    missing = [field for field in REQUIRED_STUDENT_FIELDS if not data.get(field)]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}.")
+    not_strings = [field for field in (*REQUIRED_STUDENT_FIELDS, 'address')
+                   if data.get(field) is not None and not isinstance(data[field], str)]
+    if not_strings:
+        raise ValueError(f"Fields must be strings: {', '.join(not_strings)}.")
+
+    values = {column: data[field] for field, column in REQUIRED_STUDENT_FIELDS.items()}
+    try:
+        values['dob'] = datetime.strptime(data['dob'], "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise ValueError("dob must be a date in YYYY-MM-DD format.")
+    values['address'] = data.get('address')
+    return values
+
+
+def find_existing_emails(emails, chunk_size):
+    """
+    Return the subset of `emails` already registered, querying in IN-list chunks.
+    """
+    existing = set()
+    emails = list(emails)
+    for start in range(0, len(emails), chunk_size):
+        chunk = emails[start:start + chunk_size]
+        existing.update(db.session.execute(select(Student.email).where(Student.email.in_(chunk))).scalars())
+    return existing
+
+
+def insert_students(rows, batch_size):
+    """
+    Insert prepared rows with one executemany per batch, each batch in its own transaction.
+    Yields (batch, {email: student_id}, None) on success or (batch, None, error) on failure.
+    """
+    statement = insert(Student).returning(
+        Student.student_id, Student.email, Student.program, Student.admission_status, Student.created_at
+    )
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        try:
+            created = db.session.execute(statement, batch).all()
+            record_students(db.session, created)  # Counted in the batch's transaction
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            yield batch, None, e
+            continue
+        yield batch, {row.email: row.student_id for row in created}, None
@@ -0,0 +1,70 @@
+import itertools  # Import itertools to rotate through the replicas
+import threading  # Import threading to share the rotation between request threads
+
+from flask import has_request_context, request  # Import request to detect read-only requests
+from flask_sqlalchemy.session import Session  # Flask-SQLAlchemy's bind-aware session
+from sqlalchemy import event  # Import event to notice the first write of a request
+
+# Bind key prefix of the replica engines registered in SQLALCHEMY_BINDS
+REPLICA_BIND_PREFIX = 'replica_'
+
+# HTTP methods whose requests are served from a replica
+READ_ONLY_METHODS = {'GET', 'HEAD'}
+
+
+def replica_binds(config):
+    """
+    Return SQLALCHEMY_BINDS with one bind per URI in SQLALCHEMY_REPLICA_URIS added.
+    """
+    binds = dict(config.get('SQLALCHEMY_BINDS') or {})
+    for index, uri in enumerate(config['SQLALCHEMY_REPLICA_URIS']):
+        binds[f"{REPLICA_BIND_PREFIX}{index}"] = uri
+    return binds
+
+
+class RoutingSession(Session):
+    """
+    Session sending the queries of read-only requests to a replica.
+
+    A GET or HEAD request picks one replica (round-robin across requests) and
+    keeps it for all its reads. Everything else uses the primary: other methods,
+    CLI commands and job workers, and any request from its first flush on, so a
+    request always reads its own writes. Replicas lag behind the primary, so a
+    read-only request right after a write may briefly see the previous state.
+    """
+
+    _rotation = None  # Shared cycle over the replica bind keys, created on first use
+    _rotation_keys = None
+    _rotation_lock = threading.Lock()
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if getattr(clause, 'is_dml', False):
+            self.info['primary'] = True  # Core INSERT/UPDATE/DELETE statements write too
+        if bind is None:
+            replica = self._replica()
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica(self):
+        if self.info.get('primary') or not has_request_context() or request.method not in READ_ONLY_METHODS:
+            return None
+
+        engines = self._db.engines
+        key = self.info.get('replica')
+        if key is None:
+            keys = sorted(key for key in engines if key and key.startswith(REPLICA_BIND_PREFIX))
+            if not keys:
+                return None
+            with RoutingSession._rotation_lock:
+                if RoutingSession._rotation is None or RoutingSession._rotation_keys != keys:
+                    RoutingSession._rotation = itertools.cycle(keys)
+                    RoutingSession._rotation_keys = keys
+                key = self.info['replica'] = next(RoutingSession._rotation)
+        return engines[key]
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _stay_on_primary(session, flush_context, instances):
+    # Once a request has written anything, it stays on the primary
+    session.info['primary'] = True
@@ -0,0 +1,134 @@
+from datetime import datetime  # Import datetime to parse admitted dates
+
+from sqlalchemy import case, select, update  # Import Core constructs for set-based status updates
+
+from .counters import record_status_changes  # Keep the dashboard counters in step with the UPDATEs
+from .models import db, Admission, Student  # Importing database models
+from .registration import BulkPayloadError  # Raised when the request body itself cannot be read
+
+# Statuses an admission may move to from each status; Approved is final
+ADMISSION_TRANSITIONS = {
+    'Submitted': {'Under Review', 'Approved', 'Rejected'},
+    'Under Review': {'Approved', 'Rejected'},
+    'Rejected': {'Under Review'},
+    'Approved': set(),
+}
+
+# Sentinel for a decision that leaves review_notes as they are
+UNCHANGED = object()
+
+
+def read_decisions(request, max_rows):
+    """
+    Read review decisions from a JSON array or {"decisions": [...]}.
+    """
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('decisions')
+    if not isinstance(data, list):
+        raise BulkPayloadError("Expected a JSON array of decisions.")
+    if len(data) > max_rows:
+        raise BulkPayloadError(f"At most {max_rows} admissions can be reviewed per request.")
+    return data
+
+
+def validate_decision(data):
+    """
+    Check one decision ({"admissionId", "status", "reviewNotes"?, "admittedDate"?}) and return its values.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Decision must be a JSON object.")
+
+    admission_id = data.get('admissionId')
+    if not isinstance(admission_id, int) or isinstance(admission_id, bool):
+        raise ValueError("admissionId must be an integer.")
+    status = data.get('status')
+    if status not in ADMISSION_TRANSITIONS:
+        raise ValueError(f"status must be one of: {', '.join(ADMISSION_TRANSITIONS)}.")
+
+    review_notes = data.get('reviewNotes', UNCHANGED)
+    if review_notes is not UNCHANGED and review_notes is not None and not isinstance(review_notes, str):
+        raise ValueError("reviewNotes must be a string.")
+
+    admitted_date = None
+    if data.get('admittedDate') is not None:
+        if status != 'Approved':
+            raise ValueError("admittedDate is only allowed when approving.")
+        try:
+            admitted_date = datetime.fromisoformat(data['admittedDate'])
+        except (TypeError, ValueError):
+            raise ValueError("admittedDate must be an ISO 8601 date or date-time.")
+
+    return {'admission_id': admission_id, 'status': status,
+            'review_notes': review_notes, 'admitted_date': admitted_date}
+
+
+def load_review_states(admission_ids, chunk_size):
+    """
+    Return {admission_id: (student_id, status, program, student admission_status)}, locking the
+    admissions (where the database supports it) so the transitions are checked against current rows.
+    """
+    states = {}
+    admission_ids = sorted(admission_ids)
+    for start in range(0, len(admission_ids), chunk_size):
+        chunk = admission_ids[start:start + chunk_size]
+        rows = db.session.execute(
+            select(Admission.admission_id, Admission.student_id, Admission.status,
+                   Student.program, Student.admission_status)
+            .join(Student, Student.student_id == Admission.student_id)
+            .where(Admission.admission_id.in_(chunk))
+            .with_for_update(of=Admission)
+        )
+        for admission_id, student_id, status, program, student_status in rows:
+            states[admission_id] = (student_id, status, program, student_status)
+    return states
+
+
+def apply_decisions(decisions, now):
+    """
+    Apply validated decisions with one admissions UPDATE and one students UPDATE per target status,
+    in the caller's transaction. Each decision also carries the student_id, program and student
+    admission_status loaded with load_review_states.
+    """
+    groups = {}
+    for decision in decisions:
+        groups.setdefault(decision['status'], []).append(decision)
+
+    changes = []
+    for status, group in sorted(groups.items()):
+        group.sort(key=lambda decision: decision['admission_id'])
+        ids = [decision['admission_id'] for decision in group]
+        values = {'status': status}
+
+        # Per-row notes and dates as CASE expressions keyed on the admission ID
+        notes = [(decision['admission_id'], decision['review_notes'])
+                 for decision in group if decision['review_notes'] is not UNCHANGED]
+        if notes:
+            values['review_notes'] = case(
+                *((Admission.admission_id == admission_id, text) for admission_id, text in notes),
+                else_=Admission.review_notes
+            )
+        if status == 'Approved':
+            dates = [(decision['admission_id'], decision['admitted_date'])
+                     for decision in group if decision['admitted_date'] is not None]
+            values['admitted_date'] = case(
+                *((Admission.admission_id == admission_id, date) for admission_id, date in dates), else_=now
+            ) if dates else now
+        else:
+            values['admitted_date'] = None
+
+        db.session.execute(
+            update(Admission).where(Admission.admission_id.in_(ids)).values(**values),
+            execution_options={'synchronize_session': False}
+        )
+
+        # Keep the student's denormalized status in step with the reviewed admission
+        students = {decision['student_id']: decision for decision in group}
+        db.session.execute(
+            update(Student).where(Student.student_id.in_(sorted(students))).values(admission_status=status),
+            execution_options={'synchronize_session': False}
+        )
+        changes.extend((decision['program'], decision['student_status'], status)
+                       for decision in students.values() if decision['student_status'] != status)
+
+    record_status_changes(db.session, changes)
@@ -1,53 +1,195 @@
-from datetime import datetime  # Importing datetime to handle date and time operations
+from datetime import datetime, timedelta  # Importing datetime to handle date and time operations
+import json  # Importing json to decode composite counter keys
 import os  # Importing os to interact with the file system
-
-from flask import Blueprint, request, jsonify, make_response, send_file  # Importing necessary Flask functions
-from werkzeug.utils import secure_filename  # Secure filename for file uploads
-from werkzeug.security import generate_password_hash  # Secure password hashing
-
-from .models import Student, db, Document, Admission  # Importing database models
+import time  # Importing time to measure bulk registration throughput
+
+from flask import Blueprint, g, request, jsonify, make_response, current_app, Response, stream_with_context, send_file  # Importing necessary Flask functions
+from flask_jwt_extended import create_access_token  # Issue access tokens at login
+from sqlalchemy import select  # Import select for lightweight single-column queries
+from sqlalchemy.orm import selectinload  # Eager-load relationships without N+1 queries
+from werkzeug.exceptions import RequestEntityTooLarge  # Raised when an upload exceeds the size limit
+from werkzeug.utils import secure_filename  # Secure filename for downloaded documents
+
+from . import hasher, cache, storage, previews, metrics  # Application services
+from .blobs import add_reference, releasing  # Reference-counted document blobs
+from .auth import authenticator, authenticate_request, public, admin_required, owner_or_admin, check_owner, unauthorized, AuthError  # Bearer token authentication
+from .hashing import HashingCapacityError  # Raised when the hashing pool is saturated
+from .conditional import record_validators, is_not_modified, not_modified, add_validators  # Conditional GET helpers
+from .idempotency import idempotent  # Replay stored responses to retried write requests
+from .jobs import enqueue  # Background job queue
+from .metrics import phase  # Attribute request time to named phases
+from .ratelimit import admission, admission_controlled  # Rate limits and concurrency caps of the expensive routes
+from .previews import PREVIEWABLE_EXTENSIONS, PreviewUnavailable, PreviewDependencyMissing  # Document previews
+from .models import Student, db, Document, Admission, Admin, Job, StatCounter  # Importing database models
+from .export import (  # Streaming export helpers
+    EXPORT_MODELS, EXPORT_FORMATS, EXPORT_JOINS, build_export_query, stream_rows, generate_ndjson, generate_csv
+)
+from .registration import (  # Bulk registration helpers
+    BulkPayloadError, read_bulk_payload, validate_student_payload, find_existing_emails, insert_students
+)
+from .review import ADMISSION_TRANSITIONS, read_decisions, validate_decision, load_review_states, apply_decisions  # Batch admission review
+from .serializers import STUDENT_FIELDS, ADMISSION_FIELDS, DOCUMENT_FIELDS  # Column-projection serializers
+from .pagination import KeysetPaginator, InvalidCursor, parse_limit  # Keyset pagination helpers
+from .search import parse_terms, search_students  # Student search index
 
 # Blueprint to define routes under the "main" namespace
 main = Blueprint('main', __name__)
+main.before_request(authenticate_request)  # Every route needs an access token unless marked @public
 
 # Route for the index page
 @main.route('/', methods=['GET'])
+@public
 def index():
     # Returns a message as a JSON response
     return make_response(jsonify({'message': 'Online Registration System By ABOGO'}))
 
 """
-    ========= Students Management Routes
+    ========= Authentication Routes
 """
 
-# Route to get all students
-@main.route('/get_students', methods=['GET'])
-def get_students():
+# Route exchanging an admin or student email and password for an access token
+@main.route('/auth/login', methods=['POST'])
+@public
+@admission_controlled('hashing')
+def login():
+    data = request.get_json(silent=True) or {}
+    account_type = data.get('accountType', 'student')
+    if account_type not in ('admin', 'student'):
+        return jsonify({"error": "accountType must be 'admin' or 'student'."}), 400
+    model, id_column = (Admin, Admin.admin_id) if account_type == 'admin' else (Student, Student.student_id)
+    account = db.session.execute(
+        select(id_column, model.password).where(model.email == data.get('email'))
+    ).first()
     try:
-        # Fetch all students from the database
-        students = Student.query.all()
+        # Verify the password in the hashing pool
+        valid = account is not None and hasher.check(account.password, str(data.get('password') or ''))
+    except HashingCapacityError as e:
+        # Shed load quickly when the hashing pool is saturated
+        return hashing_unavailable(e)
+    if not valid:
+        return jsonify({"error": "Invalid email or password."}), 401
+
+    expires = current_app.config['JWT_ACCESS_TOKEN_EXPIRES']
+    return jsonify({
+        "accessToken": create_access_token(identity=f"{account_type}:{account[0]}"),
+        "tokenType": "Bearer",
+        "expiresIn": int(expires.total_seconds()) if expires else None
+    }), 200
 
-        # If there are no students, return an empty list
-        if not students:
-            return jsonify({"data": []}), 200
+# Route revoking the access token of the request
+@main.route('/auth/logout', methods=['POST'])
+def logout():
+    try:
+        authenticator.revoke(db.session, request.headers.get('Authorization'))
+    except AuthError as e:
+        return unauthorized(e)
+    return jsonify({"message": "Logged out."}), 200
 
-        # Convert each student to JSON format
-        students_data = [student.to_json() for student in students]
+"""
+    ========= Students Management Routes
+"""
 
-        # Return the student data
-        return jsonify({"data": students_data}), 200
+# Keyset orderings supported by the students listing (the last column is always unique)
+STUDENT_SORTS = {
+    'student_id': KeysetPaginator([Student.student_id]),
+    'created_at': KeysetPaginator([Student.created_at, Student.student_id], [datetime.fromisoformat, None]),
+}
+
+# Helper building the students listing query from the query string: (paginator, statement, sort, limit, keys).
+# Shared with the ASGI listing route; raises InvalidCursor/ValueError for malformed arguments.
+def students_page_query(args):
+    # Read the page size and sort order from the query string
+    limit = parse_limit(
+        args.get('limit'),
+        current_app.config['STUDENTS_PAGE_SIZE'],
+        current_app.config['STUDENTS_MAX_PAGE_SIZE']
+    )
+    sort = args.get('sort', 'student_id')
+    if sort not in STUDENT_SORTS:
+        raise ValueError(f"sort must be one of: {', '.join(STUDENT_SORTS)}.")
+
+    # Select only the requested fields, plus the keyset columns
+    keys = STUDENT_FIELDS.parse(args.get('fields'))
+    statement = STUDENT_FIELDS.select(keys, *STUDENT_SORTS[sort].columns)
+
+    # Apply the optional server-side filters
+    if 'program' in args:
+        statement = statement.where(Student.program == args['program'])
+    if 'admission_status' in args:
+        statement = statement.where(Student.admission_status == args['admission_status'])
+    if sort == 'created_at':
+        statement = statement.where(Student.created_at.isnot(None))
+    return STUDENT_SORTS[sort], statement, sort, limit, keys
+
+# Route to get a page of students
+@main.route('/get_students', methods=['GET'])
+@admin_required
+def get_students():
+    try:
+        paginator, statement, sort, limit, keys = students_page_query(request.args)
+
+        # Fetch the page that follows the cursor, without any OFFSET scan
+        rows, next_cursor = paginator.page(db.session, statement, sort, limit, request.args.get('cursor'))
+
+        # Return the student data together with the token for the next page
+        to_json = STUDENT_FIELDS.mapper(keys)
+        return jsonify({
+            "data": [to_json(row) for row in rows],
+            "nextCursor": next_cursor,
+            "limit": limit
+        }), 200
+    except (InvalidCursor, ValueError) as e:
+        # Return a client error for a malformed limit, sort, cursor or field list
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         # Return an error message if something goes wrong
         return jsonify({"error": str(e)}), 500
 
+# Route to search students by partial name, email, phone number or program, best matches first
+@main.route('/students/search', methods=['GET'])
+@admin_required
+def find_students():
+    try:
+        # Read the query, page size and cursor from the query string
+        terms = parse_terms(request.args.get('q', ''))
+        limit = parse_limit(
+            request.args.get('limit'),
+            current_app.config['STUDENTS_PAGE_SIZE'],
+            current_app.config['STUDENTS_MAX_PAGE_SIZE']
+        )
+        keys = STUDENT_FIELDS.parse(request.args.get('fields'))
+
+        # Match every term through the search index and page by (score, student ID)
+        statement, score = search_students(
+            STUDENT_FIELDS.select(keys, Student.student_id), terms, db.session.get_bind().dialect.name
+        )
+        paginator = KeysetPaginator([score, Student.student_id], [float, None])
+        rows, next_cursor = paginator.page(
+            db.session, statement, 'search:' + ' '.join(terms), limit, request.args.get('cursor')
+        )
+
+        # Return the matching students together with the token for the next page
+        to_json = STUDENT_FIELDS.mapper(keys)
+        return jsonify({
+            "data": [to_json(row) for row in rows],
+            "nextCursor": next_cursor,
+            "limit": limit
+        }), 200
+    except (InvalidCursor, ValueError) as e:
+        # Return a client error for a missing query or a malformed limit, cursor or field list
+        return jsonify({"error": str(e)}), 400
+
 # Route to register a new student
 @main.route('/register_student', methods=['POST'])
+@public
+@admission_controlled('hashing')
+@idempotent
 def register_student():
     try:
         # Get data from the request
         data = request.get_json()
-        # Hash the student's password securely
-        hashed_password = generate_password_hash(data['password'], method='scrypt')
+        # Hash the student's password securely in the hashing pool
+        hashed_password = hasher.hash(data['password'])
 
         # Convert the provided date of birth string to a date object
         dob = datetime.strptime(data['dob'], "%Y-%m-%d").date()
@@ -69,40 +211,212 @@ def register_student():
 
         # Return success message
         return jsonify({"message": "Student registered successfully!"}), 201
+    except HashingCapacityError as e:
+        # Shed load quickly when the hashing pool is saturated
+        return hashing_unavailable(e)
+    except Exception as e:
+        # Return error message if something goes wrong
+        return jsonify({"error": str(e)}), 500
+
+# Route to register many students at once
+@main.route('/register_students', methods=['POST'])
+@admin_required
+@admission_controlled('bulk')
+def register_students():
+    started = time.perf_counter()
+    try:
+        payloads = read_bulk_payload(request, current_app.config['BULK_REGISTRATION_MAX_ROWS'])
+    except BulkPayloadError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        # Validate every row up front, including duplicate emails within the request
+        results = [{"index": index, "status": "error"} for index in range(len(payloads))]
+        valid = {}
+        seen_emails = set()
+        for index, data in enumerate(payloads):
+            try:
+                values = validate_student_payload(data)
+            except ValueError as e:
+                results[index]["error"] = str(e)
+                continue
+            results[index]["email"] = values['email']
+            if values['email'] in seen_emails:
+                results[index]["error"] = "Duplicate email in request."
+                continue
+            seen_emails.add(values['email'])
+            valid[index] = values
+
+        # Reject emails that are already registered
+        batch_size = current_app.config['BULK_INSERT_BATCH_SIZE']
+        existing = find_existing_emails(seen_emails, batch_size)
+        for index in [index for index, values in valid.items() if values['email'] in existing]:
+            results[index]["error"] = "Email already registered."
+            del valid[index]
+
+        # Hash all remaining passwords in parallel across the hashing pool
+        indexes = list(valid)
+        hashed = hasher.hash_many([valid[index]['password'] for index in indexes])
+        for index, password in zip(indexes, hashed):
+            valid[index]['password'] = password
+
+        # Insert in executemany batches and record the outcome of every row
+        rows = [valid[index] for index in indexes]
+        index_by_email = {valid[index]['email']: index for index in indexes}
+        for batch, created, error in insert_students(rows, batch_size):
+            for row in batch:
+                result = results[index_by_email[row['email']]]
+                if error is not None:
+                    result["error"] = str(error)
+                else:
+                    result.update({"status": "created", "studentId": created[row['email']]})
+                    result.pop("error", None)
+    except HashingCapacityError as e:
+        # Shed load quickly when the hashing pool is saturated
+        return hashing_unavailable(e)
     except Exception as e:
         # Return error message if something goes wrong
+        db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
+    # Summarize the run, measured in rows rather than requests
+    elapsed = time.perf_counter() - started
+    created_count = sum(1 for result in results if result["status"] == "created")
+    status_code = 201 if created_count == len(results) else (207 if created_count else 422)
+    return jsonify({
+        "created": created_count,
+        "failed": len(results) - created_count,
+        "elapsedSeconds": round(elapsed, 4),
+        "rowsPerSecond": round(len(results) / elapsed, 1) if elapsed else None,
+        "results": results
+    }), status_code
+
+# Helper serving a single record with ETag/Last-Modified validators.
+# A conditional request is answered with 304 from the record version alone (taken from the
+# cache or from a one-column query), without loading or serializing the full record.
+def conditional_record(kind, key, field_map, version_statement, loader, not_found, envelope=False):
+    # Validate the optional ?fields= selection first
+    try:
+        keys = field_map.parse(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    cache_key = f"{kind}:{key}"
+    cached = cache.get(cache_key)
+    if cached is not None:
+        updated_at = datetime.fromisoformat(cached['updatedAt']) if cached.get('updatedAt') else None
+    else:
+        version = db.session.execute(version_statement).first()
+        if version is None:
+            return jsonify({"error": not_found}), 404
+        updated_at = version[0]
+
+    variant = ','.join(keys) if keys != field_map.default else ''
+    validators = record_validators(kind, key, updated_at, variant) if updated_at else None
+    if validators and is_not_modified(*validators):
+        return not_modified(*validators)
+
+    data = cached if cached is not None else cache.load(cache_key, loader)
+    if data is None:
+        return jsonify({"error": not_found}), 404
+
+    # The cache always holds every field; trim to the requested ones
+    data = field_map.trim(data, keys)
+    response = jsonify({"data": data} if envelope else data)
+    if validators:
+        add_validators(response, *validators)
+    return response
+
+# Helper building the backpressure response used when password hashing is at capacity
+def hashing_unavailable(error):
+    response = jsonify({"error": str(error)})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(hasher.retry_after)
+    return response
+
+# Helper loading the student's information as a dictionary (None if the student does not exist)
+def load_student_data(student_id):
+    return STUDENT_FIELDS.fetch_one(db.session, Student.student_id == student_id)
+
 # Route to get a specific student by ID
 @main.route('/get_student/<int:student_id>', methods=['GET'])
+@owner_or_admin
 def get_student(student_id):
     try:
-        # Find the student by ID
-        student = Student.query.get(student_id)
-        if student is None:
-            return jsonify({"error": "Student not found"}), 404
+        # Answer from the record version when possible, otherwise serve the cached or loaded student
+        return conditional_record(
+            'student', student_id, STUDENT_FIELDS,
+            select(Student.updated_at).where(Student.student_id == student_id),
+            lambda: load_student_data(student_id),
+            "Student not found",
+            envelope=True
+        )
+    except Exception as e:
+        # Return error message if something goes wrong
+        return jsonify({"error": str(e)}), 500
 
-        # Create a dictionary with the student's information
-        student_data = {
-            "firstName": student.first_name,
-            "lastName": student.last_name,
-            "email": student.email,
-            "dob": student.dob.isoformat(),  # Convert date to ISO format
-            "phoneNumber": student.phone_number,
-            "address": student.address,
-            "program": student.program,
-            "admissionStatus": student.admission_status,  # Assuming admissionStatus exists in the model
-            "createdAt": student.created_at.isoformat()  # Convert created date to ISO format
+# Helper loading students with their admissions and documents in a fixed number of queries
+# (one for the students, one per relationship), however many students are requested
+def load_dossiers(student_ids):
+    students = db.session.execute(
+        select(Student)
+        .where(Student.student_id.in_(student_ids))
+        .options(selectinload(Student.admissions), selectinload(Student.documents))
+    ).scalars().all()
+
+    return {
+        student.student_id: {
+            **STUDENT_FIELDS.dump(student),
+            "admissions": [ADMISSION_FIELDS.dump(admission) for admission in student.admissions],
+            "documents": [DOCUMENT_FIELDS.dump(document) for document in student.documents],
         }
+        for student in students
+    }
+
+# Route to get a student together with their admissions and documents
+@main.route('/students/<int:student_id>/dossier', methods=['GET'])
+@owner_or_admin
+def get_dossier(student_id):
+    try:
+        dossier = load_dossiers([student_id]).get(student_id)
+        if dossier is None:
+            return jsonify({"error": "Student not found"}), 404
+
+        # Return the student's dossier
+        return jsonify({"data": dossier}), 200
+    except Exception as e:
+        # Return error message if something goes wrong
+        return jsonify({"error": str(e)}), 500
+
+# Route to get the dossiers of many students at once (?ids=1,2,3)
+@main.route('/students/dossiers', methods=['GET'])
+@admin_required
+def get_dossiers():
+    # Parse and validate the requested student IDs
+    try:
+        student_ids = list(dict.fromkeys(int(value) for value in request.args.get('ids', '').split(',') if value.strip()))
+    except ValueError:
+        return jsonify({"error": "ids must be a comma-separated list of integers."}), 400
+    if not student_ids:
+        return jsonify({"error": "ids is required."}), 400
+    if len(student_ids) > current_app.config['DOSSIER_MAX_IDS']:
+        return jsonify({"error": f"At most {current_app.config['DOSSIER_MAX_IDS']} ids can be requested at once."}), 400
 
-        # Return the student data
-        return jsonify({"data": student_data}), 200
+    try:
+        dossiers = load_dossiers(student_ids)
+
+        # Return the dossiers in the requested order, listing IDs that do not exist
+        return jsonify({
+            "data": [dossiers[student_id] for student_id in student_ids if student_id in dossiers],
+            "notFound": [student_id for student_id in student_ids if student_id not in dossiers]
+        }), 200
     except Exception as e:
         # Return error message if something goes wrong
         return jsonify({"error": str(e)}), 500
 
 # Route to update a student's information
 @main.route('/update_student/<int:student_id>', methods=['PATCH'])
+@owner_or_admin
 def update_student(student_id):
     try:
         # Get the data from the request
@@ -132,6 +446,7 @@ def update_student(student_id):
 
         # Commit the updates to the database
         db.session.commit()
+        cache.invalidate_student(student_id)
 
         # Return success message
         return jsonify({"message": "Student updated successfully!"}), 200
@@ -141,6 +456,7 @@ def update_student(student_id):
 
 # Route to delete a student by ID
 @main.route('/delete_student/<int:student_id>', methods=['DELETE'])
+@owner_or_admin
 def delete_student(student_id):
     try:
         # Find the student by ID
@@ -153,6 +469,8 @@ def delete_student(student_id):
         # Delete the student from the database
         db.session.delete(student)
         db.session.commit()
+        cache.invalidate_student(student_id)
+        authenticator.forget_identity('student', student_id)  # Its cached tokens stop working right away
 
         # Return success message
         return jsonify({"message": "Student deleted successfully!"}), 200
@@ -160,33 +478,66 @@ def delete_student(student_id):
         # Return error message if something goes wrong
         return jsonify({"error": str(e)}), 500
 
+# Route to stream a full export of students, admissions or documents
+@main.route('/export/<resource>', methods=['GET'])
+@admin_required
+@admission_controlled('export')
+def export_resource(resource):
+    if resource not in EXPORT_MODELS:
+        return jsonify({"error": f"resource must be one of: {', '.join(EXPORT_MODELS)}."}), 404
+
+    # Validate the requested output format
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}."}), 400
+
+    # Validate the optional related table to join
+    include = request.args.get('include')
+    if include is not None and include not in EXPORT_JOINS[resource]:
+        return jsonify({"error": f"include must be one of: {', '.join(EXPORT_JOINS[resource])}."}), 400
+
+    # Rows are fetched and written batch by batch while the response is being sent
+    statement, names = build_export_query(resource, include)
+    rows = stream_rows(statement, current_app.config['EXPORT_BATCH_SIZE'])
+    generate = generate_ndjson if export_format == 'ndjson' else generate_csv
+
+    response = Response(stream_with_context(generate(rows, names)), mimetype=EXPORT_FORMATS[export_format])
+    response.headers['Content-Disposition'] = f'attachment; filename={resource}.{export_format}'
+    return response
+
 """
     ========= Documents Management Routes
 """
 
 # Route to get a specific document for a student
 @main.route('/students/<int:student_id>/documents/<int:document_id>', methods=['GET'])
+@owner_or_admin
 def get_document(student_id, document_id):
+    # Answer from the record version when possible, otherwise serve the cached or loaded document
+    return conditional_record(
+        'document', f"{student_id}:{document_id}", DOCUMENT_FIELDS,
+        select(Document.updated_at).where(Document.student_id == student_id, Document.document_id == document_id),
+        lambda: load_document_data(student_id, document_id),
+        "Document not found."
+    )
+
+# Helper loading a student's document as a dictionary (None if it does not exist)
+def load_document_data(student_id, document_id):
     # Find the document by student ID and document ID
-    document = Document.query.filter_by(student_id=student_id, id=document_id).first()
-
-    if not document:
-        return jsonify({"error": "Document not found."}), 404
-
-    # Return the document data
-    return jsonify({
-        "documentId": document.id,
-        "studentId": document.student_id,
-        "documentType": document.document_type,
-        "filePath": document.file_path,
-    }), 200
+    return DOCUMENT_FIELDS.fetch_one(db.session, Document.student_id == student_id, Document.document_id == document_id)
 
 # Route to upload documents for a student
 @main.route('/students/<int:student_id>/documents', methods=['POST'])
+@owner_or_admin
+@admission_controlled('upload')
+@idempotent
 def upload_documents(student_id):
-    # Check if the request contains a file
-    if 'document' not in request.files:
-        return jsonify({"error": "No file part in the request."}), 400
+    # Check if the request contains a file (parsing streams it to storage and enforces the size limit)
+    try:
+        if 'document' not in request.files:
+            return jsonify({"error": "No file part in the request."}), 400
+    except RequestEntityTooLarge as e:
+        return jsonify({"error": e.description}), 413
 
     file = request.files['document']
 
@@ -201,31 +552,45 @@ def upload_documents(student_id):
     if not document_type:
         return jsonify({"error": "Document type is required."}), 400
 
-    # Save the file with a secure filename
-    filename = secure_filename(file.filename)
-    file_path = os.path.join('uploads', filename)
-
     try:
-        # Save the file to the specified path
-        file.save(file_path)
+        # Hash and fsync the streamed upload; add_document puts it in content-addressed storage
+        file_path = storage.store(file, file.filename.rsplit('.', 1)[1])
 
-        # Create a new document entry in the database
-        new_document = Document(
-            student_id=student_id,
-            document_type=document_type,
-            file_path=file_path
-        )
-        db.session.add(new_document)
+        # Create the document entry and queue its automated checks
+        new_document, job = add_document(db.session, student_id, document_type, file_path)
         db.session.commit()
+        cache.invalidate_student(student_id)
 
         # Return success message
-        return jsonify({"message": "Document uploaded successfully!"}), 201
+        return jsonify({
+            "message": "Document uploaded successfully!",
+            "documentId": new_document.document_id,
+            "jobId": job.job_id
+        }), 201
 
     except Exception as e:
         # Handle exceptions and roll back the transaction if needed
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
 
+# Helper adding a stored upload as a document, with its background jobs queued in the same transaction
+# (workers only see them once the caller commits). Shared with the ASGI upload route.
+def add_document(session, student_id, document_type, file_path):
+    new_document = Document(
+        student_id=student_id,
+        document_type=document_type,
+        file_path=file_path
+    )
+    session.add(new_document)
+    session.flush()
+    add_reference(session, file_path)  # Count the blob's new reference and put it in place
+
+    # Queue the automated checks and return without waiting for them
+    job = enqueue('process_document', {"documentId": new_document.document_id}, session=session)
+    if previews.prewarm and file_path.rsplit('.', 1)[1] in PREVIEWABLE_EXTENSIONS:
+        enqueue('generate_previews', {"documentId": new_document.document_id}, session=session)
+    return new_document, job
+
 # Function to check if the file type is allowed (helper function)
 def allowed_file(filename):
     # Define allowed file extensions
@@ -234,25 +599,74 @@ def allowed_file(filename):
 
 # Route to download a specific document for a student
 @main.route('/students/<int:student_id>/documents/<int:document_id>/download', methods=['GET'])
+@owner_or_admin
 def download_document(student_id, document_id):
     # Find the document by student ID and document ID
-    document = Document.query.filter_by(student_id=student_id, id=document_id).first()
+    document = Document.query.filter_by(student_id=student_id, document_id=document_id).first()
 
     if not document:
         return jsonify({"error": "Document not found."}), 404
 
-    # Check if the file exists
-    if not os.path.isfile(document.file_path):
+    try:
+        # Send the file (or hand it to the front proxy) as a downloadable, range-capable response
+        return storage.send(document.file_path, document_download_name(document))
+    except FileNotFoundError:
         return jsonify({"error": "File does not exist."}), 404
 
-    # Send the file to the user as a downloadable file
-    return send_file(document.file_path, as_attachment=True)
+# Route to get a downscaled preview (image thumbnail or PDF first page) of a document
+@main.route('/students/<int:student_id>/documents/<int:document_id>/preview', methods=['GET'])
+@owner_or_admin
+def preview_document(student_id, document_id):
+    # Validate the requested size against the configured preview sizes
+    size = request.args.get('size', previews.sizes[0], type=int)
+    if size not in previews.sizes:
+        return jsonify({"error": f"size must be one of {previews.sizes}."}), 400
+
+    # Find the document by student ID and document ID
+    document = Document.query.filter_by(student_id=student_id, document_id=document_id).first()
+
+    if not document:
+        return jsonify({"error": "Document not found."}), 404
+
+    try:
+        # Render the preview in the process pool on first request, then serve it from the disk cache
+        with phase('previews'):
+            path = previews.get(document, size)
+    except FileNotFoundError:
+        return jsonify({"error": "File does not exist."}), 404
+    except PreviewDependencyMissing as e:
+        return jsonify({"error": str(e)}), 501
+    except PreviewUnavailable as e:
+        return jsonify({"error": str(e)}), 415
+    except TimeoutError:
+        response = jsonify({"error": "Preview is still being generated, please retry."})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+
+    # The file name (content hash and size) is the ETag: cache hits touch the mtime, so the default ETag would change
+    response = send_file(
+        path,
+        mimetype='image/jpeg',
+        etag=os.path.basename(path),
+        max_age=current_app.config['DOCUMENT_CACHE_MAX_AGE']
+    )
+    response.cache_control.private = True  # Previews are as private as the documents themselves
+    response.cache_control.public = False
+    return response
+
+# Helper naming a downloaded document after its type and ID (stored blobs carry no filename)
+def document_download_name(document):
+    if storage.digest_of(document.file_path) is None:
+        return os.path.basename(document.file_path)
+    extension = document.file_path.rsplit('.', 1)[1]
+    return f"{secure_filename(document.document_type) or 'document'}-{document.document_id}.{extension}"
 
 # Route to update a specific document for a student
 @main.route('/students/<int:student_id>/documents/<int:document_id>', methods=['PUT'])
+@owner_or_admin
 def update_document(student_id, document_id):
     # Find the document by student ID and document ID
-    document = Document.query.filter_by(student_id=student_id, id=document_id).first()
+    document = Document.query.filter_by(student_id=student_id, document_id=document_id).first()
 
     if not document:
         return jsonify({"error": "Document not found."}), 404
@@ -266,6 +680,8 @@ def update_document(student_id, document_id):
         # Update the document type
         document.document_type = new_document_type
         db.session.commit()
+        cache.invalidate_student(student_id)
+        cache.delete(f"document:{student_id}:{document_id}")
 
         # Return success message
         return jsonify({"message": "Document updated successfully!"}), 200
@@ -277,21 +693,22 @@ def update_document(student_id, document_id):
 
 # Route to delete a specific document for a student
 @main.route('/students/<int:student_id>/documents/<int:document_id>', methods=['DELETE'])
+@owner_or_admin
 def delete_document(student_id, document_id):
     # Find the document by student ID and document ID
-    document = Document.query.filter_by(student_id=student_id, id=document_id).first()
+    document = Document.query.filter_by(student_id=student_id, document_id=document_id).first()
 
     if not document:
         return jsonify({"error": "Document not found."}), 404
 
     try:
-        # Delete the document entry from the database
+        # Delete the document entry and its reference to the stored file together; the file is
+        # removed along with its last reference
         db.session.delete(document)
-        db.session.commit()
-
-        # Remove the actual file from the file system
-        if os.path.exists(document.file_path):
-            os.remove(document.file_path)
+        with releasing(db.session, document.file_path):
+            db.session.commit()
+        cache.invalidate_student(student_id)
+        cache.delete(f"document:{student_id}:{document_id}")
 
         # Return success message
         return jsonify({"message": "Document deleted successfully!"}), 200
@@ -307,6 +724,8 @@ def delete_document(student_id, document_id):
 
 # Route to submit admission details for a student
 @main.route('/students/<int:student_id>/admissions', methods=['POST'])
+@owner_or_admin
+@idempotent
 def submit_admission(student_id):
     try:
         # Get admission data from the request
@@ -316,10 +735,11 @@ def submit_admission(student_id):
         admission = Admission(
             student_id=student_id,
             status=data['status'],
-            admitted_at=datetime.now()
+            admitted_date=datetime.now()
         )
         db.session.add(admission)
         db.session.commit()
+        cache.invalidate_student(student_id)
 
         # Return success message
         return jsonify({"message": "Admission details submitted successfully!"}), 201
@@ -331,16 +751,199 @@ def submit_admission(student_id):
 
 # Route to get admission details for a specific student
 @main.route('/students/<int:student_id>/admissions', methods=['GET'])
+@owner_or_admin
 def get_admission(student_id):
-    # Find the admission record for the student
-    admission = Admission.query.filter_by(student_id=student_id).first()
+    # Answer from the record version when possible, otherwise serve the cached or loaded admission
+    return conditional_record(
+        'admission', student_id, ADMISSION_FIELDS,
+        select(Admission.updated_at).where(Admission.student_id == student_id).order_by(Admission.admission_id).limit(1),
+        lambda: load_admission_data(student_id),
+        "Admission not found."
+    )
+
+# Helper loading the student's admission as a dictionary (None if there is none)
+def load_admission_data(student_id):
+    return ADMISSION_FIELDS.fetch_one(db.session, Admission.student_id == student_id, order_by=Admission.admission_id)
+
+# Route to review many admissions at once, applying status transitions as set-based updates
+@main.route('/admissions/review', methods=['POST'])
+@admin_required
+@admission_controlled('bulk')
+def review_admissions():
+    try:
+        payloads = read_decisions(request, current_app.config['ADMISSION_REVIEW_MAX_BATCH'])
+    except BulkPayloadError as e:
+        return jsonify({"error": str(e)}), 400
 
-    if not admission:
-        return jsonify({"error": "Admission not found."}), 404
+    try:
+        # Validate every decision up front, including duplicate admissions within the request
+        results = [{"index": index, "status": "error"} for index in range(len(payloads))]
+        valid = {}
+        seen_admissions = set()
+        for index, data in enumerate(payloads):
+            try:
+                decision = validate_decision(data)
+            except ValueError as e:
+                results[index]["error"] = str(e)
+                continue
+            results[index]["admissionId"] = decision['admission_id']
+            if decision['admission_id'] in seen_admissions:
+                results[index]["error"] = "Duplicate admission in request."
+                continue
+            seen_admissions.add(decision['admission_id'])
+            valid[index] = decision
+
+        # Check each transition against the current (locked) admission rows
+        states = load_review_states(seen_admissions, current_app.config['BULK_INSERT_BATCH_SIZE'])
+        reviewed_students = set()
+        for index, decision in list(valid.items()):
+            result = results[index]
+            state = states.get(decision['admission_id'])
+            if state is None:
+                result["error"] = "Admission not found."
+                del valid[index]
+                continue
+            student_id, current, program, student_status = state
+            result.update({"studentId": student_id, "from": current, "to": decision['status']})
+            if decision['status'] == current:
+                # Already in the requested state: retried requests change nothing
+                result["status"] = "unchanged"
+                del valid[index]
+            elif decision['status'] not in ADMISSION_TRANSITIONS.get(current, ()):
+                result["error"] = f"Cannot change status from {current} to {decision['status']}."
+                del valid[index]
+            elif student_id in reviewed_students:
+                result["error"] = "Another decision in this request reviews the same student."
+                del valid[index]
+            else:
+                reviewed_students.add(student_id)
+                decision.update({"student_id": student_id, "program": program, "student_status": student_status})
+
+        # One UPDATE per target status for admissions and students, committed together
+        apply_decisions(list(valid.values()), datetime.now())
+        db.session.commit()
+        for index in valid:
+            results[index]["status"] = "updated"
+            results[index].pop("error", None)
+        for student_id in reviewed_students:
+            cache.invalidate_student(student_id)
+    except Exception as e:
+        # Return error message if something goes wrong
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 500
 
-    # Return the admission data
+    # Report the outcome of every decision
+    updated_count = sum(1 for result in results if result["status"] == "updated")
+    unchanged_count = sum(1 for result in results if result["status"] == "unchanged")
+    failed_count = len(results) - updated_count - unchanged_count
+    status_code = 200 if not failed_count else (207 if failed_count < len(results) else 422)
     return jsonify({
-        "studentId": admission.student_id,
-        "status": admission.status,
-        "admittedAt": admission.admitted_at.isoformat(),
-    }), 200
+        "updated": updated_count,
+        "unchanged": unchanged_count,
+        "failed": failed_count,
+        "results": results
+    }), status_code
+
+"""
+    ========= Background Job Routes
+"""
+
+# Route to get the state of a background job
+@main.route('/jobs/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return jsonify({"error": "Job not found."}), 404
+
+    data = job.to_json()
+    if authenticator.required and g.principal.kind != 'admin':
+        # Students may follow the jobs of their own documents, without the worker's error details
+        document_id = json.loads(job.payload).get('documentId')
+        owner_id = db.session.execute(
+            select(Document.student_id).where(Document.document_id == document_id)
+        ).scalar() if document_id is not None else None
+        try:
+            check_owner(g.principal, owner_id)
+        except AuthError as e:
+            return unauthorized(e)
+        del data['lastError']
+
+    # Return the job state
+    return jsonify({"data": data}), 200
+
+"""
+    ========= Service Statistics Routes
+"""
+
+# Route exposing per-endpoint request metrics in the Prometheus text format
+@main.route('/metrics', methods=['GET'])
+@admin_required
+def prometheus_metrics():
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+# Route to get the password hashing pool metrics
+@main.route('/stats/hashing', methods=['GET'])
+@admin_required
+def hashing_stats():
+    # Return queue wait vs. hash time counters for the hashing pool
+    return jsonify({"data": hasher.metrics()}), 200
+
+# Route to get the read-through cache counters
+@main.route('/stats/cache', methods=['GET'])
+@admin_required
+def cache_stats():
+    # Return hit/miss/eviction counters for the single-record cache
+    return jsonify({"data": cache.stats()}), 200
+
+# Route to get the admission control counters
+@main.route('/stats/admission', methods=['GET'])
+@admin_required
+def admission_stats():
+    # Return in-flight, admitted, rate-limited and shed counts per route class
+    return jsonify({"data": admission.stats()}), 200
+
+# Route to get the token cache counters
+@main.route('/stats/auth', methods=['GET'])
+@admin_required
+def auth_stats():
+    # Return hit/miss/eviction counters of the verified token cache
+    return jsonify({"data": authenticator.stats()}), 200
+
+# Route to get the dashboard aggregates, read from the precomputed counters instead of scanning the tables
+@main.route('/stats/dashboard', methods=['GET'])
+@admin_required
+def dashboard_stats():
+    try:
+        days = int(request.args.get('days', 30))
+        if not 1 <= days <= 366:
+            raise ValueError
+    except ValueError:
+        return jsonify({"error": "days must be an integer between 1 and 366."}), 400
+
+    # One indexed read of the counter rows; registrations only for the requested window
+    since = (datetime.now() - timedelta(days=days - 1)).date().isoformat()
+    rows = db.session.execute(
+        select(StatCounter.metric, StatCounter.key, StatCounter.value).where(
+            StatCounter.value != 0,
+            (StatCounter.metric != 'registrations_by_day') | (StatCounter.key >= since)
+        )
+    ).all()
+
+    by_program = {}
+    by_verification = {}
+    by_day = {}
+    for metric, key, value in rows:
+        if metric == 'students_by_program_status':
+            program, status = json.loads(key)
+            by_program.setdefault(program, {})[status] = value
+        elif metric == 'documents_by_status':
+            by_verification[key] = value
+        elif metric == 'registrations_by_day':
+            by_day[key] = value
+
+    return jsonify({"data": {
+        "studentsByProgramAndStatus": by_program,
+        "documentsByVerificationStatus": by_verification,
+        "documentBacklog": by_verification.get('Pending', 0),
+        "registrationsByDay": [{"date": day, "count": by_day[day]} for day in sorted(by_day)],
+    }}), 200
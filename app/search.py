@@ -0,0 +1,145 @@
+import re  # Import re to split search queries into terms
+
+from sqlalchemy import DDL, and_, case, event, func, literal_column, or_, table, column  # Core constructs for the index
+
+from .models import Student  # Importing database models
+
+# Student columns covered by the search index, with their bm25 weights (names rank highest)
+SEARCH_COLUMNS = {
+    'first_name': 10.0,
+    'last_name': 10.0,
+    'email': 5.0,
+    'phone_number': 5.0,
+    'program': 1.0,
+}
+
+# Shortest term the trigram index can match; shorter terms are matched as word prefixes
+MIN_TERM_LENGTH = 3
+
+# Maximum number of terms in one query
+MAX_TERMS = 8
+
+FTS_TABLE = 'students_fts'
+
+# Word index answering the terms too short for trigrams: FTS5 keeps 1- and 2-character prefix entries
+PREFIX_TABLE = 'students_fts_prefix'
+
+
+def _sqlite_index_ddl(name, options):
+    # FTS5 index over the search columns kept in sync with the students table by triggers, so every
+    # write path (register_student, update_student, delete_student, bulk registration) updates it
+    columns = ', '.join(SEARCH_COLUMNS)
+    new = ', '.join('new.' + column for column in SEARCH_COLUMNS)
+    old = ', '.join('old.' + column for column in SEARCH_COLUMNS)
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5(
+            {columns}, content='students', content_rowid='student_id', {options}
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {name}_insert AFTER INSERT ON students BEGIN
+            INSERT INTO {name}(rowid, {columns}) VALUES (new.student_id, {new});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {name}_delete AFTER DELETE ON students BEGIN
+            INSERT INTO {name}({name}, rowid, {columns}) VALUES ('delete', old.student_id, {old});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {name}_update AFTER UPDATE OF {columns} ON students BEGIN
+            INSERT INTO {name}({name}, rowid, {columns}) VALUES ('delete', old.student_id, {old});
+            INSERT INTO {name}(rowid, {columns}) VALUES (new.student_id, {new});
+        END""",
+    ]
+
+
+SQLITE_INDEX_DDL = (
+    _sqlite_index_ddl(FTS_TABLE, "tokenize='trigram'")
+    + _sqlite_index_ddl(PREFIX_TABLE, "tokenize='unicode61', prefix='1 2'")
+)
+
+# Other backends search with LIKE; on PostgreSQL, trigram GIN indexes make substring LIKE indexable
+POSTGRESQL_INDEX_DDL = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"] + [
+    f"CREATE INDEX IF NOT EXISTS ix_students_{name}_trgm ON students USING gin (lower({name}) gin_trgm_ops)"
+    for name in SEARCH_COLUMNS
+]
+
+# Create the index together with the students table (db.create_all); migrations create it on existing databases
+for statement in SQLITE_INDEX_DDL:
+    event.listen(Student.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+for statement in POSTGRESQL_INDEX_DDL:
+    event.listen(Student.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+
+_fts = table(FTS_TABLE, column('rowid'))
+_prefix = table(PREFIX_TABLE, column('rowid'))
+
+
+def include_name(name, type_, parent_names):
+    """
+    Keep the FTS5 tables and their shadow tables out of Alembic autogenerate,
+    which would otherwise see them as tables to drop.
+    """
+    return not (type_ == 'table' and name.startswith(FTS_TABLE))
+
+
+def parse_terms(query):
+    """
+    Split a search query into lower-case terms; raises ValueError when there is nothing to search for.
+    """
+    terms = [term for term in re.split(r'\s+', query.strip().lower()) if term][:MAX_TERMS]
+    if not terms:
+        raise ValueError("q is required.")
+    return terms
+
+
+def _quote(term):
+    # FTS5 string literal: the term is matched as a substring, never parsed as query syntax
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _escape_like(term):
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def _any_column_like(pattern):
+    return or_(*(func.lower(getattr(Student, name)).like(pattern, escape='\\') for name in SEARCH_COLUMNS))
+
+
+def _prefix_of_any_column(term):
+    return _any_column_like(_escape_like(term) + '%')
+
+
+def _substring_of_any_column(term):
+    return _any_column_like('%' + _escape_like(term) + '%')
+
+
+def search_students(statement, terms, dialect):
+    """
+    Restrict a students SELECT to rows matching every term and return
+    (statement, score): lower scores rank first.
+
+    On SQLite, terms of MIN_TERM_LENGTH or more characters are substring matches
+    answered by the FTS5 trigram index, and shorter terms are word prefixes
+    answered by the FTS5 prefix index; rows are ranked with bm25. Other backends
+    match long terms as substrings and short terms as column prefixes with LIKE,
+    and rank students whose columns start with a term first.
+    """
+    long_terms = [term for term in terms if len(term) >= MIN_TERM_LENGTH]
+    short_terms = [term for term in terms if len(term) < MIN_TERM_LENGTH]
+
+    if dialect == 'sqlite':
+        # Ranked by the trigram index when it takes part, which matches most specifically
+        ranked_by = FTS_TABLE if long_terms else PREFIX_TABLE
+        score = func.bm25(literal_column(ranked_by), *SEARCH_COLUMNS.values()).label('score')
+        statement = statement.add_columns(score)
+        if long_terms:
+            statement = (
+                statement.join(_fts, _fts.c.rowid == Student.student_id)
+                .where(literal_column(FTS_TABLE).op('MATCH')(' AND '.join(_quote(term) for term in long_terms)))
+            )
+        if short_terms:
+            statement = (
+                statement.join(_prefix, _prefix.c.rowid == Student.student_id)
+                .where(literal_column(PREFIX_TABLE).op('MATCH')(' AND '.join(_quote(term) + '*' for term in short_terms)))
+            )
+        return statement, score
+
+    conditions = [_substring_of_any_column(term) if len(term) >= MIN_TERM_LENGTH else _prefix_of_any_column(term)
+                  for term in terms]
+    score = case((and_(*(_prefix_of_any_column(term) for term in terms)), 0), else_=1).label('score')
+    return statement.add_columns(score).where(*conditions), score
@@ -0,0 +1,136 @@
+from datetime import date, datetime  # Import date types to pick per-field converters
+from functools import lru_cache  # Import lru_cache to precompile row mappers per field selection
+
+from sqlalchemy import select  # Import select to build column-projection queries
+
+from .models import Student, Admission, Document  # Importing database models
+
+
+def _isoformat(value):
+    # Dates and timestamps are always sent as ISO 8601 strings
+    return value.isoformat() if value is not None else None
+
+
+class FieldMap:
+    """
+    Maps camelCase API field names to model columns and serializes result rows.
+
+    Queries select only the requested columns as plain Core rows (no ORM
+    instances or identity map), and each row is turned into a dict by a
+    mapper precompiled once per field selection.
+    """
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.attributes = dict(fields)  # camelCase key -> model attribute name
+        self.columns = {key: getattr(model, attribute) for key, attribute in fields}  # camelCase key -> column
+        self.default = tuple(self.columns)  # Fields returned when none are requested
+
+        # Choose the value converter of every field once, from the column type
+        self.converters = {}
+        for key, column in self.columns.items():
+            python_type = column.type.python_type
+            self.converters[key] = _isoformat if issubclass(python_type, (date, datetime)) else None
+
+        self._mapper = lru_cache(maxsize=64)(self._compile)
+
+    def parse(self, fields):
+        """
+        Turn a comma-separated `?fields=` value into a tuple of known keys (all fields if empty).
+        """
+        if not fields:
+            return self.default
+        keys = tuple(dict.fromkeys(key.strip() for key in fields.split(',') if key.strip()))
+        unknown = [key for key in keys if key not in self.columns]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}.")
+        return keys or self.default
+
+    def select(self, keys, *extra):
+        """
+        Build a SELECT of the requested fields, followed by any `extra` columns (e.g. keyset columns).
+        """
+        return select(*[self.columns[key] for key in keys], *extra).select_from(self.model)
+
+    def _compile(self, keys):
+        # Pair every output key with its row position and converter
+        plan = tuple((key, index, self.converters[key]) for index, key in enumerate(keys))
+
+        def mapper(row):
+            return {key: convert(row[index]) if convert else row[index] for key, index, convert in plan}
+
+        return mapper
+
+    def mapper(self, keys):
+        """
+        Return the precompiled row -> dict function for this field selection.
+        """
+        return self._mapper(keys)
+
+    def dump(self, instance, keys=None):
+        """
+        Serialize an already loaded ORM instance (e.g. from an eager-loaded relationship).
+        """
+        keys = keys or self.default
+        data = {}
+        for key in keys:
+            value = getattr(instance, self.attributes[key])
+            convert = self.converters[key]
+            data[key] = convert(value) if convert else value
+        return data
+
+    def fetch_one(self, session, *criteria, order_by=None):
+        """
+        Load one record matching `criteria` as a dict of all fields, or None.
+        """
+        statement = self.select(self.default).where(*criteria)
+        if order_by is not None:
+            statement = statement.order_by(order_by)
+        row = session.execute(statement.limit(1)).first()
+        return None if row is None else self.mapper(self.default)(row)
+
+    def trim(self, data, keys):
+        """
+        Keep only the requested keys of an already serialized record.
+        """
+        if keys == self.default:
+            return data
+        return {key: data[key] for key in keys}
+
+
+# Field maps for every model; passwords are never part of any of them
+STUDENT_FIELDS = FieldMap(Student, [
+    ('studentId', 'student_id'),
+    ('firstName', 'first_name'),
+    ('lastName', 'last_name'),
+    ('email', 'email'),
+    ('dob', 'dob'),
+    ('phoneNumber', 'phone_number'),
+    ('address', 'address'),
+    ('program', 'program'),
+    ('admissionStatus', 'admission_status'),
+    ('createdAt', 'created_at'),
+    ('updatedAt', 'updated_at'),
+])
+
+ADMISSION_FIELDS = FieldMap(Admission, [
+    ('admissionId', 'admission_id'),
+    ('studentId', 'student_id'),
+    ('status', 'status'),
+    ('reviewNotes', 'review_notes'),
+    ('admittedAt', 'admitted_date'),
+    ('createdAt', 'created_at'),
+    ('updatedAt', 'updated_at'),
+])
+
+DOCUMENT_FIELDS = FieldMap(Document, [
+    ('documentId', 'document_id'),
+    ('studentId', 'student_id'),
+    ('documentType', 'document_type'),
+    ('filePath', 'file_path'),
+    ('uploadDate', 'upload_date'),
+    ('verificationStatus', 'verification_status'),
+    ('verifiedBy', 'verified_by'),
+    ('verificationNotes', 'verification_notes'),
+    ('updatedAt', 'updated_at'),
+])
@@ -0,0 +1,223 @@
+import hashlib  # Import hashlib to compute content hashes while uploading
+import mimetypes  # Import mimetypes to label offloaded downloads
+import os  # Import os to manage the storage directories
+import re  # Import re to recognize content-addressed file references
+import tempfile  # Import tempfile to spool uploads before they are committed
+
+from flask import Request, current_app, g, make_response, request, send_file  # Import Flask request/response helpers
+from werkzeug.exceptions import RequestEntityTooLarge  # Raised when an upload exceeds the size limit
+
+from .metrics import phase  # Attribute storage time to the current request
+
+# Document.file_path value for a stored blob: "<sha256 hex>.<original extension>"
+CONTENT_REFERENCE = re.compile(r'^(?P<digest>[0-9a-f]{64})\.(?P<extension>[a-z0-9]+)$')
+
+# Size of the chunks copied when an upload did not arrive through the spooling stream
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+class SpooledUpload:
+    """
+    Writable temp file handed to Werkzeug's multipart parser. It hashes and
+    counts every chunk as it is written, and aborts the request with 413 as
+    soon as the upload grows past the limit, before the rest is received.
+    """
+
+    def __init__(self, directory, max_size):
+        self._file = tempfile.NamedTemporaryFile(dir=directory, prefix='upload-', delete=False)
+        self._sha256 = hashlib.sha256()
+        self.path = self._file.name
+        self.max_size = max_size
+        self.size = 0
+        self.committed = False
+
+    def write(self, data):
+        self.size += len(data)
+        if self.max_size and self.size > self.max_size:
+            raise RequestEntityTooLarge(f"Uploads are limited to {self.max_size} bytes.")
+        self._sha256.update(data)
+        return self._file.write(data)
+
+    @property
+    def digest(self):
+        return self._sha256.hexdigest()
+
+    def __getattr__(self, name):
+        # read(), seek(), tell(), close(), ... go straight to the temp file
+        return getattr(self._file, name)
+
+
+class StreamingUploadRequest(Request):
+    """
+    Request class that spools file uploads through SpooledUpload instead of
+    Werkzeug's default in-memory/temp-file buffer.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return current_app.extensions['storage'].spool()
+
+
+class ContentStore:
+    """
+    Content-addressed document storage.
+
+    Blobs live under UPLOAD_FOLDER in a two-level sharded layout
+    (ab/cd/abcdef...) named by their SHA-256, so identical files are stored
+    once and different files never overwrite each other.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.root = os.path.abspath(app.config['UPLOAD_FOLDER'])
+        self.max_size = app.config['MAX_UPLOAD_SIZE']
+        self.spool_directory = os.path.join(self.root, 'tmp')
+        self.offload = app.config['DOCUMENT_OFFLOAD']
+        self.accel_prefix = app.config['DOCUMENT_ACCEL_PREFIX'].rstrip('/') + '/'
+        self.max_age = app.config['DOCUMENT_CACHE_MAX_AGE']
+        if self.offload not in ('', 'x-accel', 'x-sendfile'):
+            raise ValueError(f"Unknown DOCUMENT_OFFLOAD mode: {self.offload}")
+        # Flask's send_file emits X-Sendfile itself when USE_X_SENDFILE is set
+        app.config['USE_X_SENDFILE'] = self.offload == 'x-sendfile'
+        app.extensions['storage'] = self
+        app.teardown_request(self.discard_uncommitted)
+
+    def spool(self):
+        """
+        Start a new spooled upload; it is deleted at the end of the request unless committed.
+        """
+        os.makedirs(self.spool_directory, exist_ok=True)
+        upload = SpooledUpload(self.spool_directory, self.max_size)
+        g.setdefault('spooled_uploads', []).append(upload)
+        return upload
+
+    def blob_path(self, digest):
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def store(self, file, extension):
+        """
+        Hash and fsync an uploaded FileStorage and return its Document.file_path reference.
+        The blob is put in place by place(), once the document referencing it holds its count row.
+        """
+        with phase('file_io'):
+            return self._store(file, extension)
+
+    def _store(self, file, extension):
+        upload = file.stream
+        if not isinstance(upload, SpooledUpload):
+            # The upload was buffered elsewhere; copy it through a spool to hash it
+            upload = self.spool()
+            for chunk in iter(lambda: file.stream.read(COPY_CHUNK_SIZE), b''):
+                upload.write(chunk)
+
+        upload.flush()
+        os.fsync(upload.fileno())
+        upload.close()
+        g.setdefault('stored_uploads', {})[upload.digest] = upload
+        return f"{upload.digest}.{extension.lower()}"
+
+    def place(self, digest):
+        """
+        Make sure the blob `digest` exists, moving in the upload stored with it in this request.
+        Raises FileNotFoundError when the blob is neither stored nor uploaded.
+        """
+        target = self.blob_path(digest)
+        if os.path.exists(target):
+            return  # Identical content is already stored: keep a single copy (the spool is discarded)
+        upload = g.get('stored_uploads', {}).get(digest)
+        if upload is None:
+            raise FileNotFoundError(target)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(upload.path, target)
+        upload.committed = True
+
+    def set_aside(self, digest):
+        """
+        Move the blob `digest` out of the way before its last reference is committed away.
+        Returns where it went (None when it was missing), for restore() or os.remove().
+        """
+        target = self.blob_path(digest)
+        released = f"{target}.released"
+        try:
+            os.replace(target, released)
+        except FileNotFoundError:
+            return None
+        return released
+
+    def restore(self, digest, released):
+        """
+        Put back a blob moved aside by set_aside() when its deletion was not committed.
+        """
+        if released is not None:
+            os.replace(released, self.blob_path(digest))
+
+    def path_for(self, file_path):
+        """
+        Resolve a Document.file_path to a filesystem path (legacy paths are returned as-is).
+        """
+        match = CONTENT_REFERENCE.match(file_path)
+        return self.blob_path(match.group('digest')) if match else file_path
+
+    def digest_of(self, file_path):
+        """
+        Return the content hash referenced by a Document.file_path, or None for legacy paths.
+        """
+        match = CONTENT_REFERENCE.match(file_path)
+        return match.group('digest') if match else None
+
+    def send(self, file_path, download_name):
+        """
+        Build the download response for a stored document.
+
+        Content-addressed blobs never change, so their hash is a strong ETag and
+        a matching If-None-Match is answered before touching the disk. Otherwise
+        the body is either handed to the front proxy (X-Accel-Redirect or
+        X-Sendfile) or sent by Werkzeug, which serves Range requests (206) and
+        uses the server's wsgi.file_wrapper (sendfile) for full-file responses.
+        Raises FileNotFoundError when the file is missing.
+        """
+        digest = self.digest_of(file_path)
+        if digest is not None and request.if_none_match.contains(digest):
+            return self.cacheable(make_response('', 304), digest)
+
+        if digest is not None and self.offload == 'x-accel':
+            # nginx serves the bytes from an `internal` location mapped onto UPLOAD_FOLDER
+            response = make_response('')
+            response.headers['X-Accel-Redirect'] = f"{self.accel_prefix}{digest[:2]}/{digest[2:4]}/{digest}"
+            response.mimetype = mimetypes.guess_type(download_name)[0] or 'application/octet-stream'
+            response.headers.set('Content-Disposition', 'attachment', filename=download_name)
+            return self.cacheable(response, digest)
+
+        response = send_file(
+            self.path_for(file_path),
+            as_attachment=True,
+            download_name=download_name,
+            etag=digest or True,
+            conditional=self.offload != 'x-sendfile',  # With X-Sendfile the proxy answers Range requests itself
+            max_age=self.max_age if digest else None
+        )
+        return self.cacheable(response, digest) if digest else response
+
+    def cacheable(self, response, digest):
+        """
+        Mark a response for a content-addressed blob as privately cacheable forever.
+        The body behind a content hash is immutable; documents are still private to the student.
+        """
+        response.set_etag(digest)
+        response.cache_control.private = True
+        response.cache_control.public = False
+        response.cache_control.max_age = self.max_age
+        response.cache_control.immutable = True
+        return response
+
+    def discard_uncommitted(self, exception=None):
+        """
+        Remove spooled uploads that no route committed (validation errors, aborted requests).
+        """
+        for upload in g.pop('spooled_uploads', []):
+            if not upload.committed:
+                upload.close()
+                if os.path.exists(upload.path):
+                    os.unlink(upload.path)
@@ -0,0 +1,81 @@
+import re  # Import re to count PDF pages
+
+from . import cache, storage, previews  # Read-through cache, document storage and previews
+from .jobs import job_handler  # Register functions as job handlers
+from .previews import PreviewUnavailable  # Raised for documents that cannot be previewed
+from .models import db, Document  # Importing database models
+
+# Leading bytes identifying each allowed document format
+FILE_SIGNATURES = {
+    'pdf': [b'%PDF-'],
+    'png': [b'\x89PNG\r\n\x1a\n'],
+    'jpg': [b'\xff\xd8\xff'],
+    'doc': [b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'],  # OLE compound file
+    'docx': [b'PK\x03\x04'],  # ZIP container
+}
+
+# A PDF page object (but not the /Pages tree nodes)
+PDF_PAGE = re.compile(rb'/Type\s{0,32}/Page(?![a-zA-Z])')
+# Longest PDF_PAGE match plus the byte its lookahead reads
+PDF_PAGE_MAX_LENGTH = 43
+# Bytes read at a time when scanning an uploaded file
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+def count_pdf_pages(file):
+    """
+    Count the page objects of a PDF file, reading it in chunks.
+    """
+    pages = 0
+    buffer = b''
+    for chunk in iter(lambda: file.read(READ_CHUNK_SIZE), b''):
+        buffer += chunk
+        # A match starting in the last bytes may continue in the next chunk: count it next round
+        keep_from = max(len(buffer) - PDF_PAGE_MAX_LENGTH, 0)
+        pages += sum(1 for match in PDF_PAGE.finditer(buffer) if match.start() < keep_from)
+        buffer = buffer[keep_from:]
+    return pages + len(PDF_PAGE.findall(buffer))
+
+
+@job_handler('process_document')
+def process_document(payload):
+    """
+    Automated checks run after an upload: the content must match the file extension,
+    and PDFs get their page count recorded. Documents already reviewed by an admin are left alone.
+    """
+    document = db.session.get(Document, payload['documentId'])
+    if document is None or document.verification_status != 'Pending':
+        return
+
+    extension = document.file_path.rsplit('.', 1)[-1].lower()
+    with open(storage.path_for(document.file_path), 'rb') as file:
+        head = file.read(16)
+        if not any(head.startswith(signature) for signature in FILE_SIGNATURES.get(extension, [])):
+            document.verification_status = 'Rejected'
+            document.verification_notes = f"Automated check: file content is not a valid .{extension} file."
+        elif extension == 'pdf':
+            file.seek(0)
+            pages = count_pdf_pages(file)
+            document.verification_notes = f"Automated check passed: PDF with {pages} page(s)."
+        else:
+            document.verification_notes = f"Automated check passed: valid .{extension} file."
+    db.session.commit()
+
+    # Reaches the web processes through the shared backend or CACHE_INVALIDATION_URL
+    cache.invalidate_student(document.student_id)
+    cache.delete(f"document:{document.student_id}:{document.document_id}")
+
+
+@job_handler('generate_previews')
+def generate_previews(payload):
+    """
+    Render every configured preview size of a freshly uploaded document so the first review is a cache hit.
+    """
+    document = db.session.get(Document, payload['documentId'])
+    if document is None:
+        return
+    try:
+        for size in previews.sizes:
+            previews.get(document, size)
+    except PreviewUnavailable:
+        return  # Retrying will not help; the preview route reports the reason on demand
@@ -0,0 +1,6 @@
+"""
+Benchmarks for the Online School Registration System API.
+
+Every script runs offline against a scratch SQLite database and is started
+from the repository root, e.g. `python -m bench.serialization`.
+"""
@@ -0,0 +1,197 @@
+"""
+Compare how many concurrent slow connections the WSGI and ASGI servers hold,
+and what each connection costs in server memory.
+
+Each mode serves the same seeded database from its own process: 'wsgi' is
+the threaded Werkzeug server (one thread per connection), 'asgi' is uvicorn
+with create_asgi_app(). For every connection count, that many clients upload
+a document slowly (the body trickles in over --duration seconds) while the
+benchmark samples the server's resident memory and thread count and times a
+fast listing request. Memory per connection gives the capacity at equal
+memory: the connections that fit in --memory-budget MB above the idle process.
+
+    python -m bench.asgi_capacity --connections 50,200,500 --duration 5
+
+Requires uvicorn, a2wsgi and aiosqlite.
+"""
+import argparse  # Import argparse to read the benchmark options
+import asyncio  # Import asyncio to drive many slow clients from one thread
+import json  # Import json to store results
+import os  # Import os to build paths and pass the environment
+import random  # Import random for reproducible upload bodies
+import socket  # Import socket to pick a free port
+import statistics  # Import statistics to summarize probe latencies
+import subprocess  # Import subprocess to run each server in its own process
+import sys  # Import sys to start the server processes
+import time  # Import time to measure latencies
+
+from .common import make_app, seed
+from .load import fake_pdf, multipart
+
+MODES = ('wsgi', 'asgi')
+
+
+def serve(mode, directory, port):
+    # Server process entry point
+    settings = {
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(directory, 'bench.db'),
+        'UPLOAD_FOLDER': os.path.join(directory, 'uploads'),
+        'PASSWORD_HASH_WORKERS': 0,
+        'ADMISSION_CONTROL_ENABLED': False,  # Benchmarks drive the expensive routes from one client on purpose
+        'AUTH_REQUIRED': False,  # Benchmarks call the routes without tokens (bench.auth measures authentication)
+    }
+    if mode == 'wsgi':
+        import logging
+        from werkzeug.serving import make_server
+        from app import create_app
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        make_server('127.0.0.1', port, create_app(settings), threaded=True).serve_forever()
+    else:
+        import uvicorn
+        from app.asgi import create_asgi_app
+        uvicorn.run(create_asgi_app(settings), host='127.0.0.1', port=port, log_level='warning', backlog=4096)
+
+
+def process_status(pid):
+    # Resident memory (bytes) and thread count of a process, from /proc
+    values = {}
+    with open(f'/proc/{pid}/status') as file:
+        for line in file:
+            name, _, value = line.partition(':')
+            values[name] = value.split()
+    return int(values['VmRSS'][0]) * 1024, int(values['Threads'][0])
+
+
+async def http_request(port, method, path, body=b'', headers=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\nContent-Length: {len(body)}\r\n"
+    head += ''.join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+    writer.write(head.encode() + b'\r\n' + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    await reader.read()
+    writer.close()
+    return status
+
+
+async def slow_upload(port, body, content_type, duration, chunks, student_id):
+    # Send the headers and the body in `chunks` pieces spread over `duration` seconds
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write((f"POST /students/{student_id}/documents HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                  f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n").encode())
+    step = -(-len(body) // chunks)
+    for start in range(0, len(body), step):
+        writer.write(body[start:start + step])
+        await writer.drain()
+        await asyncio.sleep(duration / chunks)
+    status = int((await reader.readline()).split()[1])
+    await reader.read()
+    writer.close()
+    return status
+
+
+async def run_level(port, pid, connections, args):
+    rng = random.Random(connections)
+    body, content_type = multipart({'document_type': 'transcript'}, [('document', 'slow.pdf', fake_pdf(rng, args.upload_size))])
+    idle_rss, _ = process_status(pid)
+
+    uploads = [asyncio.create_task(slow_upload(port, body, content_type, args.duration, args.chunks,
+                                               rng.randint(1, args.students)))
+               for _ in range(connections)]
+    peak_rss, peak_threads, probes = idle_rss, 0, []
+    deadline = time.perf_counter() + args.duration
+    while time.perf_counter() < deadline and not all(task.done() for task in uploads):
+        rss, threads = process_status(pid)
+        peak_rss, peak_threads = max(peak_rss, rss), max(peak_threads, threads)
+        started = time.perf_counter()
+        await http_request(port, 'GET', '/get_students?limit=20')
+        probes.append(time.perf_counter() - started)
+        await asyncio.sleep(0.1)
+
+    statuses = await asyncio.gather(*uploads, return_exceptions=True)
+    completed = sum(1 for status in statuses if status == 201)
+    per_connection = (peak_rss - idle_rss) / connections
+    return {
+        'connections': connections,
+        'completed': completed,
+        'idleRssMb': round(idle_rss / 2 ** 20, 1),
+        'peakRssMb': round(peak_rss / 2 ** 20, 1),
+        'peakThreads': peak_threads,
+        'kbPerConnection': round(per_connection / 1024, 1),
+        'connectionsPerBudget': int(args.memory_budget * 2 ** 20 / per_connection) if per_connection > 0 else None,
+        'probeP50Ms': round(statistics.median(probes) * 1000, 2) if probes else None,
+        'probeMaxMs': round(max(probes) * 1000, 2) if probes else None,
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_up(port):
+    for _ in range(200):
+        try:
+            await http_request(port, 'GET', '/get_students?limit=1')
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+    raise RuntimeError("server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', default=','.join(MODES), help='comma-separated server modes to run')
+    parser.add_argument('--connections', default='50,200,500', help='comma-separated concurrent connection counts')
+    parser.add_argument('--duration', type=float, default=5, help='seconds each slow upload takes')
+    parser.add_argument('--chunks', type=int, default=10, help='pieces each upload body is sent in')
+    parser.add_argument('--upload-size', type=int, default=64 * 1024, help='bytes per uploaded document')
+    parser.add_argument('--students', type=int, default=1000, help='students to seed')
+    parser.add_argument('--memory-budget', type=float, default=100, help='MB of connection memory used to express capacity')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--serve', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--directory', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.directory, args.port)
+        return
+
+    seeded = make_app()
+    seed(seeded, args.students, admissions_per_student=0, documents_per_student=0)
+    directory = os.path.dirname(seeded.config['SQLALCHEMY_DATABASE_URI'][len('sqlite:///'):])
+
+    results = {'options': {name: value for name, value in vars(args).items() if name not in ('output', 'serve', 'directory', 'port')},
+               'modes': {}}
+    print(f"{'mode':<5} {'conns':>6} {'done':>6} {'idle MB':>8} {'peak MB':>8} {'threads':>8} "
+          f"{'KB/conn':>8} {f'conns/{args.memory_budget:g}MB':>12} {'probe p50':>10} {'probe max':>10}")
+    for mode in [name for name in args.modes.split(',') if name]:
+        results['modes'][mode] = []
+        for connections in [int(value) for value in args.connections.split(',') if value]:
+            # A fresh server per level, so every level starts from an idle process
+            port = free_port()
+            server = subprocess.Popen(
+                [sys.executable, '-m', 'bench.asgi_capacity', '--serve', mode, '--directory', directory, '--port', str(port)],
+                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            )
+            try:
+                asyncio.run(wait_until_up(port))
+                result = asyncio.run(run_level(port, server.pid, connections, args))
+            finally:
+                server.terminate()
+                server.wait()
+            results['modes'][mode].append(result)
+            print(f"{mode:<5} {connections:>6} {result['completed']:>6} {result['idleRssMb']:>8} {result['peakRssMb']:>8} "
+                  f"{result['peakThreads']:>8} {result['kbPerConnection']:>8} {str(result['connectionsPerBudget']):>12} "
+                  f"{str(result['probeP50Ms']):>10} {str(result['probeMaxMs']):>10}")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"\nresults written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Compare the per-request cost of authentication through the token cache with
+uncached flask_jwt_extended verification.
+
+Two probe routes are added to the app, each returning the caller's identity:
+'cached' authenticates through app.auth (the blueprint hook every route
+uses), 'uncached' calls verify_jwt_in_request() and loads the identity row on
+every request, the usual flask_jwt_extended pattern. Both are timed through
+the test client with the same tokens, with a single token and with a pool of
+--tokens tokens (one per admin), against a route that does no
+authentication at all.
+
+    python -m bench.auth --requests 5000 --tokens 100
+"""
+import argparse  # Import argparse to read benchmark options
+import statistics  # Import statistics to summarize latencies
+import time  # Import time to measure latencies
+
+from flask import g, jsonify  # Import Flask helpers for the probe routes
+from flask_jwt_extended import create_access_token, get_jwt_identity, verify_jwt_in_request  # Uncached verification
+from sqlalchemy import select  # Import select for the identity lookup
+from werkzeug.security import generate_password_hash  # Hash the shared admin password once
+
+from app import db  # Database object
+from app.auth import authenticate_request, public  # Authentication hook under test
+from app.models import Admin  # Importing database models
+
+from .common import make_app
+
+
+def add_probe_routes(app):
+    @app.route('/bench/none')
+    @public
+    def no_auth():
+        return jsonify({"identity": None})
+
+    @app.route('/bench/cached')
+    def cached():
+        return jsonify({"identity": [g.principal.kind, g.principal.id]})
+
+    @app.route('/bench/uncached')
+    @public
+    def uncached():
+        verify_jwt_in_request()
+        kind, _, admin_id = get_jwt_identity().partition(':')
+        row = db.session.execute(select(Admin.admin_id, Admin.role).where(Admin.admin_id == int(admin_id))).first()
+        return jsonify({"identity": [kind, row.admin_id]})
+
+    # The probes live on the app, not the blueprint, so register the blueprint's hook on the app too
+    app.before_request(authenticate_request)
+
+
+def latencies(client, path, tokens, requests):
+    # Per-request latency in microseconds, cycling through the tokens
+    durations = []
+    for index in range(requests):
+        headers = {'Authorization': f'Bearer {tokens[index % len(tokens)]}'}
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        durations.append((time.perf_counter() - started) * 1e6)
+        assert response.status_code == 200, response.get_data()
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--tokens', type=int, default=100, help='distinct tokens (admins) in the pool case')
+    args = parser.parse_args()
+
+    app = make_app(AUTH_REQUIRED=True)
+    add_probe_routes(app)
+    with app.app_context():
+        password = generate_password_hash('bench')
+        db.session.add_all([Admin(first_name='Bench', last_name=str(index), email=f'admin{index}@example.com',
+                                  password=password) for index in range(args.tokens)])
+        db.session.commit()
+        tokens = [create_access_token(identity=f"admin:{admin_id}")
+                  for admin_id in db.session.execute(select(Admin.admin_id)).scalars()]
+    client = app.test_client()
+
+    print(f"{args.requests} requests per case, microseconds per request (test client, including routing)")
+    print(f"  {'case':<44} {'p50':>8} {'p99':>8} {'auth cost p50':>14}")
+    for pool in ([tokens[0]], tokens):
+        baseline = statistics.median(latencies(client, '/bench/none', pool, args.requests))
+        for name, path in (('no authentication', '/bench/none'), ('flask_jwt_extended, uncached', '/bench/uncached'),
+                           ('app.auth, cached', '/bench/cached')):
+            latencies(client, path, pool, min(len(pool), args.requests))  # Warm up (fills the cache)
+            durations = sorted(latencies(client, path, pool, args.requests))
+            p50, p99 = statistics.median(durations), durations[int(len(durations) * 0.99) - 1]
+            print(f"  {name + f' ({len(pool)} token(s))':<44} {p50:>8.1f} {p99:>8.1f} {p50 - baseline:>+14.1f}")
+
+
+if __name__ == '__main__':
+    main()
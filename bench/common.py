@@ -0,0 +1,87 @@
+import os  # Import os to build scratch database paths
+import statistics  # Import statistics to summarize timings
+import tempfile  # Import tempfile to create scratch directories
+import time  # Import time to measure elapsed time
+from datetime import date, datetime, timedelta  # Import date types to generate seed data
+
+from sqlalchemy import insert  # Import insert for fast executemany seeding
+from werkzeug.security import generate_password_hash  # Hash the shared seed password once
+
+from app import create_app, db  # Application factory and database object
+from app.counters import rebuild  # Recount the dashboard counters after Core inserts
+from app.models import Student, Admission, Document  # Importing database models
+
+PROGRAMS = ['Computer Science', 'Mathematics', 'Medicine', 'Law', 'Economics']  # Seed programs
+STATUSES = ['Submitted', 'Under Review', 'Approved', 'Rejected']  # Seed admission statuses
+
+
+def make_app(directory=None, **config):
+    """
+    Create the application on a fresh SQLite database inside `directory` (a new temp dir by default).
+    """
+    directory = directory or tempfile.mkdtemp(prefix='ors-bench-')
+    settings = {
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(directory, 'bench.db'),
+        'UPLOAD_FOLDER': os.path.join(directory, 'uploads'),
+        'PASSWORD_HASH_WORKERS': 0,
+        'ADMISSION_CONTROL_ENABLED': False,  # Benchmarks drive the expensive routes from one client on purpose
+        'AUTH_REQUIRED': False,  # Benchmarks call the routes without tokens (bench.auth measures authentication)
+    }
+    settings.update(config)
+    app = create_app(settings)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def seed(app, students, admissions_per_student=1, documents_per_student=2, batch_size=1000):
+    """
+    Insert `students` students with their admissions and documents using executemany batches.
+    Every student shares one pre-hashed password ("password") so seeding skips scrypt.
+    """
+    password = generate_password_hash('password', method='scrypt')
+    created = datetime(2024, 1, 1)
+    with app.app_context():
+        for start in range(0, students, batch_size):
+            rows = [{
+                'student_id': number,
+                'first_name': f'First{number}',
+                'last_name': f'Last{number}',
+                'email': f'student{number}@example.com',
+                'password': password,
+                'dob': date(2000, 1, 1) + timedelta(days=number % 3650),
+                'phone_number': f'+1555{number:07d}',
+                'address': f'{number} Main Street',
+                'program': PROGRAMS[number % len(PROGRAMS)],
+                'admission_status': STATUSES[number % len(STATUSES)],
+                'created_at': created + timedelta(seconds=number),
+            } for number in range(start + 1, min(start + batch_size, students) + 1)]
+            db.session.execute(insert(Student), rows)
+            if admissions_per_student:
+                db.session.execute(insert(Admission), [{
+                    'student_id': row['student_id'],
+                    'status': row['admission_status'],
+                    'created_at': row['created_at'],
+                } for row in rows for _ in range(admissions_per_student)])
+            if documents_per_student:
+                db.session.execute(insert(Document), [{
+                    'student_id': row['student_id'],
+                    'document_type': f'type{index}',
+                    'file_path': f'seed/{row["student_id"]}-{index}.pdf',
+                    'upload_date': row['created_at'],
+                } for row in rows for index in range(documents_per_student)])
+            db.session.commit()
+        rebuild(db.session)  # Core inserts skip the counter hooks
+        db.session.commit()
+
+
+def timed(function, repeat=5):
+    """
+    Call `function` `repeat` times and return the median duration in milliseconds.
+    """
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        durations.append((time.perf_counter() - started) * 1000)
+    return statistics.median(durations)
@@ -0,0 +1,87 @@
+"""
+Measure the bytes-on-wire and CPU trade-off of response compression and of the
+compact JSON provider.
+
+Every case requests a listing page and a streamed NDJSON export through the
+test client with one Accept-Encoding, and reports the body size on the wire,
+the ratio to the uncompressed body and the process CPU time per request (the
+median of --repeat runs, including the route itself, so the identity row is
+the baseline). A second table compares encoding a listing page with Flask's
+default provider and with CompactJSONProvider.
+
+    python -m bench.compression --students 20000
+
+'br' and 'zstd' rows need the brotli and zstandard packages.
+"""
+import argparse  # Import argparse to read benchmark options
+import statistics  # Import statistics to summarize CPU timings
+import time  # Import time to measure CPU time
+
+from flask.json.provider import DefaultJSONProvider  # Flask's stock provider, the encoding baseline
+
+from app import db  # Database object
+from app.json_provider import CompactJSONProvider  # Provider under test
+from app.models import Student  # Importing database models
+
+from .common import make_app, seed
+
+# Accept-Encoding values compared, identity first as the baseline
+ENCODINGS = ['identity', 'gzip', 'br', 'zstd']
+
+
+def cpu_ms(function, repeat):
+    # Median process CPU time of `function` in milliseconds, with its last result
+    durations, result = [], None
+    for _ in range(repeat):
+        started = time.process_time()
+        result = function()
+        durations.append((time.process_time() - started) * 1000)
+    return statistics.median(durations), result
+
+
+def fetch(client, path, encoding):
+    response = client.get(path, headers={'Accept-Encoding': encoding})
+    body = response.get_data()  # Drains streamed responses
+    return len(body), response.headers.get('Content-Encoding', 'identity')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--students', type=int, default=20000)
+    parser.add_argument('--limit', type=int, default=500, help='listing page size')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = make_app()
+    seed(app, args.students, admissions_per_student=0, documents_per_student=0)
+    client = app.test_client()
+    paths = [('listing', f'/get_students?limit={args.limit}'), ('export', '/export/students?format=ndjson')]
+
+    print(f"{args.students} students, median CPU of {args.repeat} requests")
+    print(f"  {'response':<10} {'encoding':<9} {'bytes':>11} {'ratio':>7} {'CPU ms':>9} {'+CPU ms':>9}")
+    for name, path in paths:
+        baseline_size = baseline_cpu = None
+        for encoding in ENCODINGS:
+            milliseconds, (size, applied) = cpu_ms(lambda: fetch(client, path, encoding), args.repeat)
+            if applied != encoding:
+                print(f"  {name:<10} {encoding:<9} {'not available':>11}")
+                continue
+            baseline_size = baseline_size or size
+            baseline_cpu = baseline_cpu if baseline_cpu is not None else milliseconds
+            print(f"  {name:<10} {encoding:<9} {size:>11} {size / baseline_size:>7.3f} {milliseconds:>9.1f} "
+                  f"{milliseconds - baseline_cpu:>+9.1f}")
+
+    with app.app_context():
+        page = [student.to_json() for student in Student.query.order_by(Student.student_id).limit(args.limit)]
+        db.session.expunge_all()
+    providers = [('DefaultJSONProvider', DefaultJSONProvider(app)), ('CompactJSONProvider', CompactJSONProvider(app))]
+
+    print(f"\nencoding {args.limit} Student.to_json() records")
+    print(f"  {'provider':<22} {'bytes':>9} {'CPU ms':>9}")
+    for name, provider in providers:
+        milliseconds, body = cpu_ms(lambda: provider.response(page).get_data(), args.repeat * 10)
+        print(f"  {name:<22} {len(body):>9} {milliseconds:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+"""
+Load test the API over HTTP with concurrent clients.
+
+The app is built with create_app() on a seeded scratch SQLite database and
+served by a threaded Werkzeug server on localhost; each scenario drives one
+real route and reports requests per second and p50/p95/p99 latency. Results
+are written as JSON so runs can be compared:
+
+    python -m bench.load --students 5000 --clients 8 --output before.json
+    python -m bench.load --students 5000 --clients 8 --output after.json --compare before.json
+"""
+import argparse  # Import argparse to read the benchmark options
+import http.client  # Import http.client for keep-alive HTTP clients
+import io  # Import io to upload setup documents through the test client
+import itertools  # Import itertools for unique registration emails
+import json  # Import json to encode requests and store results
+import logging  # Import logging to silence the per-request server log
+import os  # Import os to read the CPU count
+import platform  # Import platform to record the environment
+import random  # Import random for reproducible request mixes
+import sqlite3  # Import sqlite3 to record the SQLite version
+import statistics  # Import statistics to compute percentiles
+import subprocess  # Import subprocess to record the git revision
+import sys  # Import sys to report regressions through the exit status
+import threading  # Import threading to run the server and the clients
+import time  # Import time to measure latencies
+import uuid  # Import uuid to build multipart boundaries
+from datetime import datetime, timezone  # Import datetime to timestamp the results
+
+from werkzeug.serving import WSGIRequestHandler, make_server  # Threaded development server
+
+from .common import make_app, seed
+
+# Scenarios in the order they run; registration and upload write, the others read
+SCENARIOS = ('list', 'lookup', 'register', 'upload', 'download')
+
+# Number of documents uploaded during setup for the download scenario
+DOWNLOAD_DOCUMENTS = 20
+
+
+class KeepAliveHandler(WSGIRequestHandler):
+    # Keep connections open between requests, like a production server behind a proxy
+    protocol_version = 'HTTP/1.1'
+
+
+def multipart(fields, files):
+    """
+    Encode form fields and (name, filename, content) files as multipart/form-data.
+    """
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, filename, content in files:
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n'.encode() + content + b'\r\n'
+        )
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+def fake_pdf(rng, size):
+    return b'%PDF-1.4\n1 0 obj << /Type /Page >> endobj\n' + rng.randbytes(size)
+
+
+class Requests:
+    """
+    Builds the (method, path, body, headers) of each scenario's requests.
+    """
+
+    def __init__(self, students, documents, upload_size):
+        self.students = students
+        self.documents = documents
+        self.upload_size = upload_size
+        self.emails = itertools.count()
+
+    def list(self, rng):
+        program = rng.choice(['', '&program=Law', '&admission_status=Approved'])
+        return 'GET', f'/get_students?limit=50{program}', None, {}
+
+    def lookup(self, rng):
+        return 'GET', f'/get_student/{rng.randint(1, self.students)}', None, {}
+
+    def register(self, rng):
+        body = json.dumps({
+            'firstName': 'Load', 'lastName': 'Test', 'email': f'load{next(self.emails)}@example.com',
+            'password': 'correct horse battery staple', 'dob': '2000-01-01',
+            'phoneNumber': '+15550000000', 'address': '1 Bench Street', 'program': 'Law',
+        }).encode()
+        return 'POST', '/register_student', body, {'Content-Type': 'application/json'}
+
+    def upload(self, rng):
+        body, content_type = multipart(
+            {'document_type': 'transcript'}, [('document', 'transcript.pdf', fake_pdf(rng, self.upload_size))]
+        )
+        return 'POST', f'/students/{rng.randint(1, self.students)}/documents', body, {'Content-Type': content_type}
+
+    def download(self, rng):
+        student_id, document_id = rng.choice(self.documents)
+        return 'GET', f'/students/{student_id}/documents/{document_id}/download', None, {}
+
+
+def setup(args):
+    app = make_app(PASSWORD_HASH_WORKERS=args.hash_workers)
+    seed(app, args.students, admissions_per_student=args.admissions, documents_per_student=args.documents)
+
+    # Downloads need real files behind their documents
+    rng = random.Random(args.seed)
+    client = app.test_client()
+    documents = []
+    for student_id in range(1, min(DOWNLOAD_DOCUMENTS, args.students) + 1):
+        response = client.post(f'/students/{student_id}/documents', data={
+            'document_type': 'transcript',
+            'document': (io.BytesIO(fake_pdf(rng, args.upload_size)), 'transcript.pdf'),
+        })
+        documents.append((student_id, response.get_json()['documentId']))
+    return app, Requests(args.students, documents, args.upload_size)
+
+
+def run_scenario(port, build, clients, total, seed_value):
+    latencies = []
+    statuses = {}
+    remaining = itertools.count()
+    lock = threading.Lock()
+
+    def client(index):
+        rng = random.Random(seed_value * 1000 + index)
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        own_latencies = []
+        own_statuses = {}
+        while next(remaining) < total:
+            method, path, body, headers = build(rng)
+            started = time.perf_counter()
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            own_latencies.append(time.perf_counter() - started)
+            own_statuses[response.status] = own_statuses.get(response.status, 0) + 1
+        connection.close()
+        with lock:
+            latencies.extend(own_latencies)
+            for status, count in own_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return {
+        'requests': len(latencies),
+        'errors': sum(count for status, count in statuses.items() if status >= 400),
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'requestsPerSecond': round(len(latencies) / elapsed, 1),
+        'meanMs': round(statistics.fmean(latencies) * 1000, 2),
+        'p50Ms': round(cuts[49] * 1000, 2),
+        'p95Ms': round(cuts[94] * 1000, 2),
+        'p99Ms': round(cuts[98] * 1000, 2),
+    }
+
+
+def environment():
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'revision': revision,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print the change against a previous run; return the scenarios that regressed beyond `tolerance` percent.
+    """
+    regressions = []
+    print(f"\n{'scenario':<10} {'req/s':>18} {'p95 ms':>20}")
+    for name, current in results['scenarios'].items():
+        previous = baseline['scenarios'].get(name)
+        if previous is None:
+            continue
+        throughput = (current['requestsPerSecond'] / previous['requestsPerSecond'] - 1) * 100
+        latency = (current['p95Ms'] / previous['p95Ms'] - 1) * 100
+        print(f"{name:<10} {previous['requestsPerSecond']:>7} -> {current['requestsPerSecond']:<7} {throughput:+5.0f}%"
+              f" {previous['p95Ms']:>7} -> {current['p95Ms']:<7} {latency:+5.0f}%")
+        if tolerance is not None and (throughput < -tolerance or latency > tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--students', type=int, default=2000, help='students to seed')
+    parser.add_argument('--admissions', type=int, default=1, help='admissions seeded per student')
+    parser.add_argument('--documents', type=int, default=2, help='documents seeded per student')
+    parser.add_argument('--clients', type=int, default=8, help='concurrent clients')
+    parser.add_argument('--requests', type=int, default=500, help='requests per scenario')
+    parser.add_argument('--warmup', type=int, default=20, help='unmeasured requests sent before each scenario')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='comma-separated scenarios to run')
+    parser.add_argument('--upload-size', type=int, default=64 * 1024, help='bytes per uploaded document')
+    parser.add_argument('--hash-workers', type=int, default=os.cpu_count(), help='password hashing processes')
+    parser.add_argument('--seed', type=int, default=1, help='random seed of the request mix')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='previous results JSON file to compare against')
+    parser.add_argument('--tolerance', type=float, help='exit with status 1 if req/s or p95 regress by more than this percent')
+    args = parser.parse_args()
+
+    scenarios = [name for name in args.scenarios.split(',') if name]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    app, requests = setup(args)
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    results = {
+        'environment': environment(),
+        'options': {name: value for name, value in vars(args).items() if name not in ('output', 'compare', 'tolerance')},
+        'scenarios': {},
+    }
+    print(f"{'scenario':<10} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    try:
+        for name in scenarios:
+            if args.warmup:
+                run_scenario(server.port, getattr(requests, name), args.clients, args.warmup, args.seed + 1)
+            result = run_scenario(server.port, getattr(requests, name), args.clients, args.requests, args.seed)
+            results['scenarios'][name] = result
+            print(f"{name:<10} {result['requests']:>8} {result['errors']:>6} {result['requestsPerSecond']:>8}"
+                  f" {result['p50Ms']:>8} {result['p95Ms']:>8} {result['p99Ms']:>8}")
+    finally:
+        server.shutdown()
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"\nresults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        if regressions:
+            print(f"FAIL: regression beyond {args.tolerance}% in {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
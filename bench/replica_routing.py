@@ -0,0 +1,76 @@
+"""
+Check read-replica routing locally with two SQLite files: the primary and a
+copy of it used as the replica. Read-only requests must hit the replica,
+writes the primary, and reads after a write in the same request the primary.
+
+    python -m bench.replica_routing
+"""
+import os  # Import os to build the database paths
+import shutil  # Import shutil to copy the primary into the replica
+import sys  # Import sys to report failure through the exit status
+import tempfile  # Import tempfile to create the scratch directory
+from datetime import date  # Import date for the new student's birth date
+
+from sqlalchemy import event, select  # Import event to see which database runs each statement
+
+from app import db  # Database object
+from app.models import Student  # Importing database models
+
+from .common import make_app, seed
+
+
+def main():
+    directory = tempfile.mkdtemp(prefix='ors-replica-')
+    primary = os.path.join(directory, 'bench.db')
+    replica = os.path.join(directory, 'replica.db')
+
+    seeded = make_app(directory)
+    seed(seeded, 100)
+    with seeded.app_context():
+        db.engine.dispose()  # Closing the last connection checkpoints the WAL into the database file
+    shutil.copy(primary, replica)
+    app = make_app(directory, SQLALCHEMY_REPLICA_URIS=['sqlite:///' + replica])
+
+    executed = []
+    with app.app_context():
+        for key, engine in db.engines.items():
+            name = key or 'primary'
+            event.listen(engine, 'before_cursor_execute', lambda *args, name=name: executed.append(name))
+
+    client = app.test_client()
+    failures = []
+
+    def check(label, expected):
+        used = set(executed)
+        print(f"  {label:<40} -> {', '.join(sorted(used)) or 'no queries'}")
+        if used != expected:
+            failures.append(label)
+        executed.clear()
+
+    assert client.get('/get_students?limit=10').status_code == 200
+    check('GET /get_students', {'replica_0'})
+    assert client.get('/get_student/1').status_code == 200
+    check('GET /get_student/1', {'replica_0'})
+    assert client.patch('/update_student/1', json={'address': '1 Primary Street'}).status_code == 200
+    check('PATCH /update_student/1', {'primary'})
+
+    with app.test_request_context('/', method='GET'):
+        db.session.execute(select(Student.student_id).limit(1)).all()
+        check('GET request, read', {'replica_0'})
+        db.session.add(Student(
+            first_name='New', last_name='Student', email='new@example.com', password='x',
+            dob=date(2000, 1, 1), phone_number='0', address='-', program='Law'
+        ))
+        db.session.flush()
+        db.session.execute(select(Student.student_id).where(Student.email == 'new@example.com')).one()
+        check('GET request, write then read', {'primary'})
+        db.session.rollback()
+
+    if failures:
+        print(f"FAIL: unexpected routing for {', '.join(failures)}")
+        sys.exit(1)
+    print("ok: reads go to the replica, writes and read-your-writes to the primary")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare the ORM serialization path (full instances + to_json) with the
+column-projection serializers (Core rows + precompiled field maps).
+
+    python -m bench.serialization --students 20000
+"""
+import argparse  # Import argparse to read benchmark options
+import json  # Import json to include encoding in the measurement
+import tracemalloc  # Import tracemalloc to compare peak memory
+
+from app import db  # Database object
+from app.models import Student  # Importing database models
+from app.serializers import STUDENT_FIELDS  # Column-projection serializer
+
+from .common import make_app, seed, timed
+
+
+def orm_path():
+    # Hydrate every ORM instance, then build each dict with to_json()
+    students = Student.query.all()
+    data = [student.to_json() for student in students]
+    db.session.expunge_all()
+    return json.dumps(data, default=str)
+
+
+def projection_path(keys):
+    # Select only the requested columns as Core rows and map them with the precompiled mapper
+    to_json = STUDENT_FIELDS.mapper(keys)
+    rows = db.session.execute(STUDENT_FIELDS.select(keys)).all()
+    return json.dumps([to_json(row) for row in rows])
+
+
+def peak_kib(function):
+    # Peak Python heap allocation while running `function`
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--students', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    app = make_app()
+    seed(app, args.students, admissions_per_student=0, documents_per_student=0)
+
+    narrow = STUDENT_FIELDS.parse('studentId,firstName,lastName,program')
+    cases = [
+        ('ORM + to_json (all fields)', orm_path),
+        ('projection (all fields)', lambda: projection_path(STUDENT_FIELDS.default)),
+        ('projection (?fields=studentId,firstName,lastName,program)', lambda: projection_path(narrow)),
+    ]
+
+    print(f"{args.students} students, median of {args.repeat} runs")
+    with app.app_context():
+        baseline = None
+        for name, function in cases:
+            milliseconds = timed(function, args.repeat)
+            baseline = baseline or milliseconds
+            print(f"  {name:<60} {milliseconds:9.1f} ms  x{baseline / milliseconds:4.1f}  peak {peak_kib(function):9.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare write contention on SQLite between the 'default' and 'tuned' engine
+profiles: concurrent writers register students and upload document rows
+while readers page through the student list, as under a busy deployment.
+
+    python -m bench.write_contention [--threads 8] [--seconds 5]
+"""
+import argparse  # Import argparse to read the benchmark options
+import statistics  # Import statistics to summarize latencies
+import threading  # Import threading to run concurrent clients
+import time  # Import time to measure latencies
+from datetime import date  # Import date for the students' birth dates
+
+from sqlalchemy import select  # Import select for the reader queries
+from sqlalchemy.exc import OperationalError  # Raised as "database is locked"
+
+from app import db  # Database object
+from app.models import Student, Document  # Importing database models
+
+from .common import make_app, seed
+
+
+def writer(app, number, deadline, results):
+    # Register a student with one document per transaction, like register_student and upload_documents
+    with app.app_context():
+        sequence = 0
+        while time.perf_counter() < deadline:
+            sequence += 1
+            started = time.perf_counter()
+            try:
+                student = Student(
+                    first_name='Bench', last_name=f'Writer{number}', email=f'w{number}-{sequence}@example.com',
+                    password='x', dob=date(2000, 1, 1), phone_number='0', address='-', program='Law'
+                )
+                db.session.add(student)
+                db.session.flush()
+                db.session.add(Document(student_id=student.student_id, document_type='id', file_path='bench.pdf'))
+                db.session.commit()
+                results['writes'].append(time.perf_counter() - started)
+            except OperationalError:
+                db.session.rollback()
+                results['errors'] += 1
+
+
+def reader(app, deadline, results):
+    # Page through recent students, like GET /get_students
+    with app.app_context():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                db.session.execute(select(Student).order_by(Student.student_id.desc()).limit(50)).all()
+                db.session.commit()
+                results['reads'].append(time.perf_counter() - started)
+            except OperationalError:
+                db.session.rollback()
+                results['errors'] += 1
+
+
+def run(profile, threads, seconds):
+    app = make_app(DB_ENGINE_PROFILE=profile)
+    seed(app, 5000, documents_per_student=1)
+    results = {'writes': [], 'reads': [], 'errors': 0}
+    deadline = time.perf_counter() + seconds
+    workers = [threading.Thread(target=writer, args=(app, number, deadline, results)) for number in range(threads)]
+    workers += [threading.Thread(target=reader, args=(app, deadline, results)) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return results
+
+
+def percentile(values, fraction):
+    return sorted(values)[int(len(values) * fraction)] * 1000 if values else float('nan')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=8, help='writer threads (and as many reader threads)')
+    parser.add_argument('--seconds', type=float, default=5, help='duration of each run')
+    args = parser.parse_args()
+
+    print(f"{'profile':<8} {'writes/s':>9} {'reads/s':>9} {'errors':>7} {'write p50':>10} {'write p99':>10} {'read p99':>9}")
+    for profile in ('default', 'tuned'):
+        results = run(profile, args.threads, args.seconds)
+        print(
+            f"{profile:<8} {len(results['writes']) / args.seconds:>9.0f} {len(results['reads']) / args.seconds:>9.0f}"
+            f" {results['errors']:>7} {statistics.median(results['writes'] or [0]) * 1000:>8.1f}ms"
+            f" {percentile(results['writes'], 0.99):>8.1f}ms {percentile(results['reads'], 0.99):>7.1f}ms"
+        )
+
+
+if __name__ == '__main__':
+    main()
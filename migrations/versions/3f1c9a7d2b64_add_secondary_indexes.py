@@ -0,0 +1,44 @@
+"""Add secondary indexes for foreign-key and filter columns
+
+Revision ID: 3f1c9a7d2b64
+Revises: 580dcf885861
+Create Date: 2026-10-17 09:12:30.418265
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7d2b64'
+down_revision = '580dcf885861'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('students', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_students_admission_status'), ['admission_status'], unique=False)
+        batch_op.create_index('ix_students_program_admission_status', ['program', 'admission_status'], unique=False)
+        batch_op.create_index('ix_students_created_at_student_id', ['created_at', 'student_id'], unique=False)
+
+    with op.batch_alter_table('admissions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_admissions_student_id'), ['student_id'], unique=False)
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.create_index('ix_documents_student_id_document_id', ['student_id', 'document_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_documents_verified_by'), ['verified_by'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_documents_verified_by'))
+        batch_op.drop_index('ix_documents_student_id_document_id')
+
+    with op.batch_alter_table('admissions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_admissions_student_id'))
+
+    with op.batch_alter_table('students', schema=None) as batch_op:
+        batch_op.drop_index('ix_students_created_at_student_id')
+        batch_op.drop_index('ix_students_program_admission_status')
+        batch_op.drop_index(batch_op.f('ix_students_admission_status'))
@@ -0,0 +1,49 @@
+"""Add student search prefix index for terms shorter than a trigram
+
+Revision ID: 6d2f8a4c1e95
+Revises: b91e5c7a3f08
+Create Date: 2026-10-18 09:14:27.602318
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '6d2f8a4c1e95'
+down_revision = 'b91e5c7a3f08'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ['first_name', 'last_name', 'email', 'phone_number', 'program']
+NEW = ', '.join('new.' + name for name in COLUMNS)
+OLD = ', '.join('old.' + name for name in COLUMNS)
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return  # Other backends answer short terms with the prefix LIKE the trigram indexes already serve
+    # FTS5 word index with 1- and 2-character prefix entries, kept in sync by triggers
+    op.execute(f"""CREATE VIRTUAL TABLE students_fts_prefix USING fts5(
+        {', '.join(COLUMNS)}, content='students', content_rowid='student_id', tokenize='unicode61', prefix='1 2'
+    )""")
+    op.execute(f"""CREATE TRIGGER students_fts_prefix_insert AFTER INSERT ON students BEGIN
+        INSERT INTO students_fts_prefix(rowid, {', '.join(COLUMNS)}) VALUES (new.student_id, {NEW});
+    END""")
+    op.execute(f"""CREATE TRIGGER students_fts_prefix_delete AFTER DELETE ON students BEGIN
+        INSERT INTO students_fts_prefix(students_fts_prefix, rowid, {', '.join(COLUMNS)}) VALUES ('delete', old.student_id, {OLD});
+    END""")
+    op.execute(f"""CREATE TRIGGER students_fts_prefix_update AFTER UPDATE OF {', '.join(COLUMNS)} ON students BEGIN
+        INSERT INTO students_fts_prefix(students_fts_prefix, rowid, {', '.join(COLUMNS)}) VALUES ('delete', old.student_id, {OLD});
+        INSERT INTO students_fts_prefix(rowid, {', '.join(COLUMNS)}) VALUES (new.student_id, {NEW});
+    END""")
+    # Index the existing students
+    op.execute("INSERT INTO students_fts_prefix(students_fts_prefix) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TRIGGER students_fts_prefix_update")
+    op.execute("DROP TRIGGER students_fts_prefix_delete")
+    op.execute("DROP TRIGGER students_fts_prefix_insert")
+    op.execute("DROP TABLE students_fts_prefix")
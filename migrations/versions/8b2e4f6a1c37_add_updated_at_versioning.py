@@ -0,0 +1,43 @@
+"""Add updated_at versioning to students, admissions and documents
+
+Revision ID: 8b2e4f6a1c37
+Revises: 3f1c9a7d2b64
+Create Date: 2026-10-17 10:41:05.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e4f6a1c37'
+down_revision = '3f1c9a7d2b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('students', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    with op.batch_alter_table('admissions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # Existing rows start at the version they were created with
+    op.execute("UPDATE students SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)")
+    op.execute("UPDATE admissions SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)")
+    op.execute("UPDATE documents SET updated_at = COALESCE(upload_date, CURRENT_TIMESTAMP)")
+
+
+def downgrade():
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('admissions', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
+
+    with op.batch_alter_table('students', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
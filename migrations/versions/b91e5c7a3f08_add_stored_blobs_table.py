@@ -0,0 +1,43 @@
+"""Add stored_blobs table counting the documents that reference each stored blob
+
+Revision ID: b91e5c7a3f08
+Revises: a7c4e1f93d26
+Create Date: 2026-10-17 23:02:47.381925
+
+"""
+import re
+from collections import Counter
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b91e5c7a3f08'
+down_revision = 'a7c4e1f93d26'
+branch_labels = None
+depends_on = None
+
+# Same pattern as app.storage.CONTENT_REFERENCE
+CONTENT_REFERENCE = re.compile(r'^(?P<digest>[0-9a-f]{64})\.(?P<extension>[a-z0-9]+)$')
+
+
+def upgrade():
+    stored_blobs = op.create_table('stored_blobs',
+    sa.Column('digest', sa.String(length=64), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('digest')
+    )
+
+    # Backfill from the existing documents (legacy file paths are not content-addressed)
+    counts = Counter()
+    for (file_path,) in op.get_bind().execute(sa.text("SELECT file_path FROM documents")):
+        match = CONTENT_REFERENCE.match(file_path or '')
+        if match:
+            counts[match.group('digest')] += 1
+    if counts:
+        op.bulk_insert(stored_blobs, [{'digest': digest, 'ref_count': count} for digest, count in counts.items()])
+
+
+def downgrade():
+    op.drop_table('stored_blobs')
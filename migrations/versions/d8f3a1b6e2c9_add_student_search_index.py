@@ -0,0 +1,57 @@
+"""Add student search index
+
+Revision ID: d8f3a1b6e2c9
+Revises: c47d19e8a5b2
+Create Date: 2026-10-17 12:41:09.508214
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8f3a1b6e2c9'
+down_revision = 'c47d19e8a5b2'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ['first_name', 'last_name', 'email', 'phone_number', 'program']
+NEW = ', '.join('new.' + name for name in COLUMNS)
+OLD = ', '.join('old.' + name for name in COLUMNS)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        # FTS5 trigram index over the searchable columns, kept in sync by triggers
+        op.execute(f"""CREATE VIRTUAL TABLE students_fts USING fts5(
+            {', '.join(COLUMNS)}, content='students', content_rowid='student_id', tokenize='trigram'
+        )""")
+        op.execute(f"""CREATE TRIGGER students_fts_insert AFTER INSERT ON students BEGIN
+            INSERT INTO students_fts(rowid, {', '.join(COLUMNS)}) VALUES (new.student_id, {NEW});
+        END""")
+        op.execute(f"""CREATE TRIGGER students_fts_delete AFTER DELETE ON students BEGIN
+            INSERT INTO students_fts(students_fts, rowid, {', '.join(COLUMNS)}) VALUES ('delete', old.student_id, {OLD});
+        END""")
+        op.execute(f"""CREATE TRIGGER students_fts_update AFTER UPDATE OF {', '.join(COLUMNS)} ON students BEGIN
+            INSERT INTO students_fts(students_fts, rowid, {', '.join(COLUMNS)}) VALUES ('delete', old.student_id, {OLD});
+            INSERT INTO students_fts(rowid, {', '.join(COLUMNS)}) VALUES (new.student_id, {NEW});
+        END""")
+        # Index the existing students
+        op.execute("INSERT INTO students_fts(students_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        # Trigram GIN indexes serving the LIKE search
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name in COLUMNS:
+            op.execute(f"CREATE INDEX ix_students_{name}_trgm ON students USING gin (lower({name}) gin_trgm_ops)")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER students_fts_update")
+        op.execute("DROP TRIGGER students_fts_delete")
+        op.execute("DROP TRIGGER students_fts_insert")
+        op.execute("DROP TABLE students_fts")
+    elif dialect == 'postgresql':
+        for name in COLUMNS:
+            op.execute(f"DROP INDEX ix_students_{name}_trgm")
@@ -0,0 +1,49 @@
+"""Add stat_counters table for the dashboard aggregates
+
+Revision ID: e5b7c2d94f18
+Revises: d8f3a1b6e2c9
+Create Date: 2026-10-17 16:41:09.532117
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b7c2d94f18'
+down_revision = 'd8f3a1b6e2c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    stat_counters = op.create_table('stat_counters',
+    sa.Column('metric', sa.String(length=50), nullable=False),
+    sa.Column('key', sa.String(length=200), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('metric', 'key')
+    )
+
+    # Backfill from the existing rows, with the same keys as app.counters
+    connection = op.get_bind()
+    rows = []
+    for program, status, count in connection.execute(sa.text(
+        "SELECT program, admission_status, COUNT(*) FROM students GROUP BY program, admission_status"
+    )):
+        rows.append({'metric': 'students_by_program_status', 'key': json.dumps([program, status]), 'value': count})
+    for day, count in connection.execute(sa.text(
+        "SELECT DATE(created_at), COUNT(*) FROM students WHERE created_at IS NOT NULL GROUP BY DATE(created_at)"
+    )):
+        rows.append({'metric': 'registrations_by_day', 'key': str(day), 'value': count})
+    for status, count in connection.execute(sa.text(
+        "SELECT COALESCE(verification_status, ''), COUNT(*) FROM documents GROUP BY COALESCE(verification_status, '')"
+    )):
+        rows.append({'metric': 'documents_by_status', 'key': status, 'value': count})
+    if rows:
+        op.bulk_insert(stat_counters, rows)
+
+
+def downgrade():
+    op.drop_table('stat_counters')
@@ -0,0 +1,52 @@
+from datetime import date  # Import date for the fixture students
+
+import pytest  # Import pytest to define the shared fixtures
+from flask_jwt_extended import create_access_token  # Issue tokens without going through /auth/login
+from werkzeug.security import generate_password_hash  # Hash the fixture password once
+
+from app import create_app, db  # Application factory and database object
+from app.models import Admin, Student  # Importing database models
+
+
+@pytest.fixture
+def app_config():
+    # Settings added to the test configuration; override this fixture in a test module to change them
+    return {}
+
+
+@pytest.fixture
+def app(tmp_path, app_config):
+    # Application on a fresh SQLite database, with authentication on
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + str(tmp_path / 'test.db'),
+        'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+        'PASSWORD_HASH_WORKERS': 0,
+        'AUTH_REQUIRED': True,
+        **app_config,
+    })
+    with app.app_context():
+        db.create_all()
+        password = generate_password_hash('password')
+        db.session.add(Admin(first_name='Ada', last_name='Admin', email='admin@example.com', password=password))
+        for number in (1, 2):
+            db.session.add(Student(
+                first_name=f'First{number}', last_name=f'Last{number}', email=f'student{number}@example.com',
+                password=password, dob=date(2000, 1, number), phone_number=f'+1555000000{number}', program='Law'
+            ))
+        db.session.commit()
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(app):
+    # Authorization headers for an identity such as 'admin:1' or 'student:2'
+    def headers(identity):
+        with app.app_context():
+            return {'Authorization': f'Bearer {create_access_token(identity=identity)}'}
+    return headers
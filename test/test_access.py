@@ -0,0 +1,77 @@
+import json  # Import json to build the job payload
+
+import pytest  # Import pytest to parametrize the routes
+
+from app import db  # Database object
+from app.models import Document, Job  # Importing database models
+
+
+# Routes of student 2, requested with student 1's token
+OTHER_STUDENT_ROUTES = [
+    ('GET', '/get_student/2'),
+    ('GET', '/students/2/dossier'),
+    ('PATCH', '/update_student/2'),
+    ('DELETE', '/delete_student/2'),
+    ('GET', '/students/2/admissions'),
+    ('POST', '/students/2/admissions'),
+    ('POST', '/students/2/documents'),
+    ('GET', '/students/2/documents/1'),
+    ('PUT', '/students/2/documents/1'),
+    ('DELETE', '/students/2/documents/1'),
+    ('GET', '/students/2/documents/1/download'),
+    ('GET', '/students/2/documents/1/preview'),
+]
+
+# Routes reading every student's records
+ADMIN_ROUTES = [
+    ('GET', '/get_students'),
+    ('GET', '/students/search?q=First'),
+    ('GET', '/students/dossiers?ids=1,2'),
+    ('GET', '/export/students'),
+]
+
+
+@pytest.mark.parametrize('method, path', OTHER_STUDENT_ROUTES)
+def test_student_cannot_access_another_students_records(client, auth_headers, method, path):
+    response = client.open(path, method=method, headers=auth_headers('student:1'), json={})
+    assert response.status_code == 403
+
+
+def test_student_can_access_own_records(client, auth_headers):
+    assert client.get('/get_student/1', headers=auth_headers('student:1')).status_code == 200
+    assert client.get('/students/1/dossier', headers=auth_headers('student:1')).status_code == 200
+
+
+def test_deleting_another_student_leaves_it_in_place(client, auth_headers):
+    assert client.delete('/delete_student/2', headers=auth_headers('student:1')).status_code == 403
+    assert client.get('/get_student/2', headers=auth_headers('admin:1')).status_code == 200
+
+
+@pytest.mark.parametrize('method, path', ADMIN_ROUTES)
+def test_listing_routes_are_admin_only(client, auth_headers, method, path):
+    assert client.open(path, method=method, headers=auth_headers('student:1')).status_code == 403
+    assert client.open(path, method=method, headers=auth_headers('admin:1')).status_code == 200
+
+
+def test_requests_without_a_token_are_rejected(client):
+    response = client.get('/get_student/1')
+    assert response.status_code == 401
+    assert response.headers['WWW-Authenticate'] == 'Bearer'
+
+
+def test_jobs_are_visible_to_their_document_owner_only(app, client, auth_headers):
+    with app.app_context():
+        document = Document(student_id=1, document_type='transcript', file_path='transcript.pdf')
+        db.session.add(document)
+        db.session.flush()
+        job = Job(kind='process_document', payload=json.dumps({"documentId": document.document_id}),
+                  last_error='Traceback (most recent call last): ...')
+        db.session.add(job)
+        db.session.commit()
+        path = f'/jobs/{job.job_id}'
+
+    assert client.get(path, headers=auth_headers('student:2')).status_code == 403
+    own = client.get(path, headers=auth_headers('student:1'))
+    assert own.status_code == 200
+    assert 'lastError' not in own.get_json()['data']
+    assert client.get(path, headers=auth_headers('admin:1')).get_json()['data']['lastError'].startswith('Traceback')
@@ -0,0 +1,51 @@
+import asyncio  # Import asyncio to drive the ASGI app
+import threading  # Import threading to see where the identity lookup runs
+
+import pytest  # Import pytest to skip without the ASGI dependencies
+
+pytest.importorskip('a2wsgi')
+pytest.importorskip('aiosqlite')
+
+from app.asgi import create_asgi_app  # noqa: E402
+from app.auth import authenticator  # noqa: E402
+
+
+def get(asgi, path, headers):
+    # Status of a GET request sent straight to the ASGI app
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'', 'client': ('127.0.0.1', 1),
+             'headers': [(name.lower().encode(), value.encode()) for name, value in headers.items()]}
+    asyncio.run(asgi(scope, receive, send))
+    return messages[0]['status']
+
+
+def test_identity_lookup_runs_off_the_event_loop(app, auth_headers, monkeypatch):
+    asgi = create_asgi_app({name: app.config[name] for name in
+                            ('SQLALCHEMY_DATABASE_URI', 'UPLOAD_FOLDER', 'PASSWORD_HASH_WORKERS', 'AUTH_REQUIRED')})
+    lookups = []
+    load_principal = authenticator.load_principal
+
+    def recording_load_principal(subject):
+        lookups.append(threading.current_thread() is threading.main_thread())
+        return load_principal(subject)
+    monkeypatch.setattr(authenticator, 'load_principal', recording_load_principal)
+
+    headers = auth_headers('admin:1')
+    assert get(asgi, '/get_students', headers) == 200
+    assert get(asgi, '/get_students', headers) == 200  # Cached: no second lookup
+    assert lookups == [False]
+
+
+def test_native_routes_apply_the_flask_access_rules(app, auth_headers):
+    asgi = create_asgi_app({name: app.config[name] for name in
+                            ('SQLALCHEMY_DATABASE_URI', 'UPLOAD_FOLDER', 'PASSWORD_HASH_WORKERS', 'AUTH_REQUIRED')})
+    assert get(asgi, '/get_students', {}) == 401
+    assert get(asgi, '/get_students', auth_headers('student:1')) == 403
+    assert get(asgi, '/students/2/documents/1/download', auth_headers('student:1')) == 403
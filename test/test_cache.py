@@ -0,0 +1,14 @@
+import pytest  # Import pytest to check configuration errors
+
+from app import create_app  # Application factory
+
+
+def test_process_local_cache_refuses_several_processes(tmp_path):
+    # Deletions would only reach the process that made them
+    with pytest.raises(ValueError, match='CACHE_INVALIDATION_URL'):
+        create_app({
+            'TESTING': True,
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + str(tmp_path / 'test.db'),
+            'CACHE_BACKEND': 'lru',
+            'CACHE_PROCESSES': 4,
+        })
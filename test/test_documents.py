@@ -0,0 +1,70 @@
+import io  # Import io to build the uploaded files
+import os  # Import os to look at the stored blobs
+
+from app import db, storage  # Database object and document storage
+from app.models import Document, StoredBlob  # Importing database models
+
+
+def upload(client, headers, content, student_id=1):
+    # Upload `content` as a transcript of the student and return the new document ID
+    response = client.post(f'/students/{student_id}/documents', headers=headers, data={
+        'document': (io.BytesIO(content), 'transcript.pdf'),
+        'document_type': 'transcript',
+    }, content_type='multipart/form-data')
+    assert response.status_code == 201, response.get_data()
+    return response.get_json()['documentId']
+
+
+def digest_of(app, document_id):
+    # Content hash referenced by a document
+    with app.app_context():
+        return storage.digest_of(db.session.get(Document, document_id).file_path)
+
+
+def blob_state(app, digest):
+    # (reference count, whether the blob file exists)
+    with app.app_context():
+        row = db.session.get(StoredBlob, digest)
+        return (row.ref_count if row else 0), os.path.exists(storage.blob_path(digest))
+
+
+def test_shared_blob_is_removed_with_its_last_reference(app, client, auth_headers):
+    admin = auth_headers('admin:1')
+    first = upload(client, admin, b'%PDF-1 shared', student_id=1)
+    second = upload(client, admin, b'%PDF-1 shared', student_id=2)
+    digest = digest_of(app, first)
+    assert blob_state(app, digest) == (2, True)
+
+    assert client.delete(f'/students/1/documents/{first}', headers=admin).status_code == 200
+    assert blob_state(app, digest) == (1, True)
+    assert client.get(f'/students/2/documents/{second}/download', headers=admin).data == b'%PDF-1 shared'
+
+    assert client.delete(f'/students/2/documents/{second}', headers=admin).status_code == 200
+    assert blob_state(app, digest) == (0, False)
+
+    # Uploading the same bytes again stores the blob again
+    third = upload(client, admin, b'%PDF-1 shared', student_id=1)
+    assert blob_state(app, digest) == (1, True)
+    assert client.get(f'/students/1/documents/{third}/download', headers=admin).data == b'%PDF-1 shared'
+
+
+def test_failed_delete_puts_the_blob_back(app, client, auth_headers, monkeypatch):
+    admin = auth_headers('admin:1')
+    document_id = upload(client, admin, b'%PDF-1 kept')
+    digest = digest_of(app, document_id)
+
+    def failing_commit():
+        raise RuntimeError("database is locked")
+    monkeypatch.setattr(db.session, 'commit', failing_commit)
+    assert client.delete(f'/students/1/documents/{document_id}', headers=admin).status_code == 500
+    monkeypatch.undo()
+    assert blob_state(app, digest) == (1, True)
+
+
+def test_pdf_pages_are_counted_across_read_chunks(monkeypatch):
+    from app import tasks  # Imported here: only this test reads the task module's settings
+    content = b'%PDF-1.4\n' + b''.join(
+        b'%d 0 obj << /Type' % number + b' ' * (number % 5) + b'/Page /Parent 1 0 R >>\n' for number in range(40)
+    ) + b'<< /Type /Pages /Count 40 >>\n'
+    monkeypatch.setattr(tasks, 'READ_CHUNK_SIZE', 7)
+    assert tasks.count_pdf_pages(io.BytesIO(content)) == 40 == len(tasks.PDF_PAGE.findall(content))
@@ -0,0 +1,47 @@
+from datetime import date  # Import date for the extra students
+
+from sqlalchemy import event  # Import event to count executed statements
+
+from app import db  # Database object
+from app.models import Admission, Document, Student  # Importing database models
+
+
+def add_students(app, count):
+    # Students 3.. with two admissions and three documents each; returns every student ID
+    with app.app_context():
+        for number in range(3, count + 1):
+            student = Student(first_name=f'First{number}', last_name=f'Last{number}', email=f'student{number}@example.com',
+                              password='x', dob=date(2000, 1, 1), phone_number=f'+1555{number:07d}', program='Law')
+            db.session.add(student)
+            db.session.flush()
+            db.session.add_all([Admission(student_id=student.student_id, status='Submitted') for _ in range(2)])
+            db.session.add_all([Document(student_id=student.student_id, document_type=f'type{index}',
+                                         file_path=f'seed/{number}-{index}.pdf') for index in range(3)])
+        db.session.commit()
+        return db.session.execute(db.select(Student.student_id).order_by(Student.student_id)).scalars().all()
+
+
+def test_dossier_statement_count_does_not_grow_with_students(app, client, auth_headers):
+    student_ids = add_students(app, 20)
+    headers = auth_headers('admin:1')
+    client.get('/students/dossiers?ids=1', headers=headers)  # Warm up: token verification and blocklist sync
+
+    counts = {}
+    with app.app_context():
+        statements = []
+
+        def listener(connection, cursor, statement, *args):
+            statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            for size in (1, len(student_ids)):
+                statements.clear()
+                response = client.get(f"/students/dossiers?ids={','.join(map(str, student_ids[:size]))}",
+                                      headers=headers)
+                assert response.status_code == 200, response.get_data()
+                assert len(response.get_json()['data']) == size
+                counts[size] = len(statements)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert counts[1] and counts[1] == counts[len(student_ids)], counts
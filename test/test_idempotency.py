@@ -0,0 +1,37 @@
+from app.idempotency import KEY_HEADER, REPLAYED_HEADER  # Request and response headers under test
+
+
+def upload(client, headers, content, key='upload-1'):
+    # Upload `content` as student 1's transcript with an Idempotency-Key, with a fixed boundary so
+    # that bodies of the same length are indistinguishable by their headers
+    body = (
+        b'--boundary\r\nContent-Disposition: form-data; name="document_type"\r\n\r\ntranscript\r\n'
+        b'--boundary\r\nContent-Disposition: form-data; name="document"; filename="transcript.pdf"\r\n'
+        b'Content-Type: application/pdf\r\n\r\n' + content + b'\r\n--boundary--\r\n'
+    )
+    return client.post('/students/1/documents', headers={**headers, KEY_HEADER: key}, data=body,
+                       content_type='multipart/form-data; boundary=boundary')
+
+
+def test_keys_are_scoped_to_the_caller(client, auth_headers):
+    # The same key sent by two students is two different requests
+    for student_id in (1, 2):
+        response = client.post(f'/students/{student_id}/admissions', json={"status": "Submitted"},
+                               headers={**auth_headers(f'student:{student_id}'), KEY_HEADER: 'same-key'})
+        assert response.status_code == 201, response.get_data()
+        assert REPLAYED_HEADER not in response.headers
+
+
+def test_upload_retry_is_matched_on_the_file_contents(client, auth_headers):
+    headers = auth_headers('student:1')
+    first = upload(client, headers, b'%PDF-1 original')
+    assert first.status_code == 201, first.get_data()
+
+    retry = upload(client, headers, b'%PDF-1 original')
+    assert retry.status_code == 201
+    assert retry.headers[REPLAYED_HEADER] == 'true'
+    assert retry.get_json() == first.get_json()
+
+    # Same length, different file: not a retry of the first upload
+    different = upload(client, headers, b'%PDF-1 replaced')
+    assert different.status_code == 422
@@ -0,0 +1,22 @@
+import pytest  # Import pytest to parametrize the error handling mode
+
+from app import metrics  # Request metrics registry
+
+
+@pytest.mark.parametrize('propagate', [True, False])
+def test_unhandled_exceptions_are_counted_as_errors(app, client, auth_headers, propagate):
+    app.config['PROPAGATE_EXCEPTIONS'] = propagate
+    errors = metrics.request_seconds._series.get(('failing', 'GET', '500'), [0])[-1]  # Kept across apps
+
+    @app.route('/failing')
+    def failing():
+        raise RuntimeError('boom')
+
+    if propagate:
+        with pytest.raises(RuntimeError):
+            client.get('/failing')
+    else:
+        assert client.get('/failing').status_code == 500
+
+    body = client.get('/metrics', headers=auth_headers('admin:1')).get_data(as_text=True)
+    assert f'ors_request_duration_seconds_count{{endpoint="failing",method="GET",status="500"}} {errors + 1}' in body
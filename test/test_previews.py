@@ -0,0 +1,36 @@
+import shutil  # Import shutil to pretend pdftoppm is installed
+import subprocess  # Import subprocess to fake a failing pdftoppm
+import sys  # Import sys to hide PyMuPDF
+
+import pytest  # Import pytest to skip without Pillow
+
+Image = pytest.importorskip('PIL.Image')
+
+from app.previews import PreviewUnavailable, _render_preview  # noqa: E402
+
+
+def test_decompression_bomb_is_unavailable(tmp_path, monkeypatch):
+    # Images far past Pillow's pixel limit are refused like any unreadable image, not as a server error
+    source = tmp_path / 'large.png'
+    Image.new('RGB', (200, 200)).save(source)
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', 1000)
+    with pytest.raises(PreviewUnavailable):
+        _render_preview(str(source), 'png', 64, str(tmp_path / 'preview.jpg'))
+
+
+def test_unreadable_pdf_is_unavailable_and_cleaned_up(tmp_path, monkeypatch):
+    # pdftoppm exits non-zero on a fake PDF: the preview is unavailable and its temp page image is removed
+    source = tmp_path / 'fake.pdf'
+    source.write_bytes(b'not a pdf')
+    output = tmp_path / 'previews'
+    output.mkdir()
+    monkeypatch.setitem(sys.modules, 'fitz', None)  # Use the pdftoppm path even where PyMuPDF is installed
+    monkeypatch.setattr(shutil, 'which', lambda name: '/usr/bin/' + name)
+
+    def failing_run(command, **kwargs):
+        raise subprocess.CalledProcessError(1, command, stderr=b'Syntax Error: not a PDF')
+    monkeypatch.setattr(subprocess, 'run', failing_run)
+
+    with pytest.raises(PreviewUnavailable):
+        _render_preview(str(source), 'pdf', 64, str(output / 'preview.jpg'))
+    assert list(output.iterdir()) == []
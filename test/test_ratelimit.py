@@ -0,0 +1,30 @@
+import pytest  # Import pytest to override the test configuration
+
+
+@pytest.fixture
+def app_config():
+    # One proxy in front of the app, and a bucket holding a single login that (practically) never refills
+    return {
+        'TRUSTED_PROXY_HOPS': 1,
+        'RATE_LIMIT_RATE': 0.001,
+        'RATE_LIMIT_BURST': 10,
+        'RATE_LIMIT_COSTS': {'default': 1, 'hashing': 10},
+    }
+
+
+def login(client, forwarded_for):
+    # Login attempt relayed by the proxy (every request comes from its address) on behalf of `forwarded_for`
+    return client.post('/auth/login', json={"email": "nobody@example.com", "password": "x", "accountType": "student"},
+                       headers={'X-Forwarded-For': forwarded_for}, environ_base={'REMOTE_ADDR': '10.0.0.1'})
+
+
+def test_forwarded_clients_get_separate_buckets(client):
+    assert login(client, '203.0.113.1').status_code == 401
+    assert login(client, '203.0.113.1').status_code == 429
+    assert login(client, '203.0.113.2').status_code == 401
+
+
+def test_only_the_trusted_hop_is_used(client):
+    # A client prepending its own X-Forwarded-For entry still lands in the bucket of the address the proxy saw
+    assert login(client, '203.0.113.1').status_code == 401
+    assert login(client, '198.51.100.7, 203.0.113.1').status_code == 429
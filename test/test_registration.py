@@ -0,0 +1,21 @@
+def student(number, **overrides):
+    # Valid bulk registration row, with `overrides` applied
+    row = {"firstName": "New", "lastName": f"Student{number}", "email": f"new{number}@example.com",
+           "password": "password", "dob": "2001-02-03", "phoneNumber": f"+1666000000{number}", "program": "Law"}
+    row.update(overrides)
+    return row
+
+
+def test_wrongly_typed_fields_fail_their_row_only(client, auth_headers):
+    response = client.post('/register_students', headers=auth_headers('admin:1'), json=[
+        student(1),
+        student(2, email=["new2@example.com"]),
+        student(3, password=12345678),
+        student(4, program={"name": "Law"}),
+    ])
+    assert response.status_code == 207, response.get_data()
+    results = response.get_json()['results']
+    assert results[0]['status'] == 'created'
+    assert results[1]['error'] == "Fields must be strings: email."
+    assert results[2]['error'] == "Fields must be strings: password."
+    assert results[3]['error'] == "Fields must be strings: program."
@@ -0,0 +1,21 @@
+from app import db  # Database object
+from app.models import Admission  # Importing database models
+
+
+def test_unknown_current_status_is_a_per_row_error(app, client, auth_headers):
+    # An admission submitted with a status outside the review table must not fail the whole batch
+    with app.app_context():
+        pending = Admission(student_id=1, status='Pending')
+        submitted = Admission(student_id=2, status='Submitted')
+        db.session.add_all([pending, submitted])
+        db.session.commit()
+        ids = pending.admission_id, submitted.admission_id
+
+    response = client.post('/admissions/review', headers=auth_headers('admin:1'), json=[
+        {"admissionId": ids[0], "status": "Approved"},
+        {"admissionId": ids[1], "status": "Approved"},
+    ])
+    assert response.status_code == 207, response.get_data()
+    results = response.get_json()['results']
+    assert results[0]['error'] == "Cannot change status from Pending to Approved."
+    assert results[1]['status'] == 'updated'
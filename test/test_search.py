@@ -0,0 +1,25 @@
+import pytest  # Import pytest to parametrize the queries
+
+from app import db  # Database object
+from app.commands import explain, route_access_paths  # Query plan checks of the routes
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('fi', [1, 2]),  # Prefix of the first names
+    ('f 2', []),  # "2" starts no word
+    ('fi law', [1, 2]),  # Short and long terms together
+    ('first1', [1]),
+    ('la student2', [2]),
+])
+def test_short_terms_match_word_prefixes(client, auth_headers, query, expected):
+    response = client.get('/students/search', query_string={'q': query}, headers=auth_headers('admin:1'))
+    assert response.status_code == 200, response.get_data()
+    assert sorted(row['studentId'] for row in response.get_json()['data']) == expected
+
+
+def test_search_is_served_by_the_indexes(app):
+    with app.app_context(), db.engine.connect() as connection:
+        for route, statement in route_access_paths():
+            if route.startswith('students/search'):
+                lines, uses_index = explain(connection, statement)
+                assert uses_index, (route, lines)